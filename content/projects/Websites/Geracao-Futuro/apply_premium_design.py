@@ -3,10 +3,14 @@
 Script para aplicar design PREMIUM a todos os guias
 """
 
-from docx import Document
-import os
-import re
 import glob
+import html as html_lib
+
+from dom_transform import Page, has_class, transform_html
+from stage_ledger import run_stage
+
+STAGE_NAME = 'premium_design'
+STAGE_VERSION = 2
 
 # Template HTML Premium
 PREMIUM_TEMPLATE = """<!DOCTYPE html>
@@ -340,100 +344,114 @@ PREMIUM_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>"""
 
-def extract_content_and_toc(html_path):
-    """Extrai conteúdo e gera TOC de um guia existente"""
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+def extract_content_and_toc(page):
+    """Extrai conteúdo e gera TOC de um guia já analisado (acrescenta ids aos h2)"""
     # Extrai conteúdo da seção
-    match = re.search(r'<div class="glass-card.*?content-section">(.*?)</div>\s*<div class="mt-8', content, re.DOTALL)
-    if not match:
-        match = re.search(r'<div class="glass-card.*?>(.*?)</div>\s*</main>', content, re.DOTALL)
+    section = page.first(f"//div[{has_class('content-section')}]")
+    if section is None:
+        section = page.first(f"//div[{has_class('glass-card')}]")
     
-    if match:
-        section_content = match.group(1)
-    else:
+    if section is None:
         return "", ""
     
     # Gera TOC baseado em h2
     toc_items = []
-    h2_pattern = re.compile(r'<h2[^>]*>(.+?)</h2>', re.DOTALL)
     
-    for i, match in enumerate(h2_pattern.finditer(section_content)):
-        title = re.sub(r'<[^>]+>', '', match.group(1)).strip()
+    for i, h2 in enumerate(section.iter('h2')):
+        title = h2.text_content().strip()
         section_id = f"section-{i}"
         
         # Adiciona ID ao h2
-        section_content = section_content.replace(
-            match.group(0),
-            f'<h2 id="{section_id}">{match.group(1)}</h2>',
-            1
-        )
+        h2.set('id', section_id)
         
         # Adiciona ao TOC
-        icon = title.split()[0] if title.split()[0] in ['🎯', '📦', '🔧', '🚀', '📊', '🎬', '📝', '💡'] else '📄'
-        clean_title = ' '.join(title.split()[1:]) if icon in title else title
+        words = title.split()
+        icon = words[0] if words and words[0] in ['🎯', '📦', '🔧', '🚀', '📊', '🎬', '📝', '💡'] else '📄'
+        clean_title = ' '.join(words[1:]) if icon in title else title
         toc_items.append(
             f'<a href="#{section_id}" class="sidebar-link block py-2.5 px-4 rounded-lg text-sm text-slate-300 hover:text-white transition-all">'
-            f'{icon} {clean_title[:50]}'
+            f'{icon} {html_lib.escape(clean_title[:50], quote=False)}'
             f'</a>'
         )
     
-    toc_html = '\\n'.join(toc_items) if toc_items else '<p class="text-slate-400 text-sm">Sem índice</p>'
+    toc_html = '\n'.join(toc_items) if toc_items else '<p class="text-slate-400 text-sm">Sem índice</p>'
     
-    return section_content, toc_html
+    return page.inner_html(section), toc_html
 
-# Processa todos os guias
-guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
-print(f"🎨 Aplicando design PREMIUM a {len(guides)} guias...\\n")
+def extract_title(page, session_num):
+    """Extrai o título (h1) de um guia já analisado"""
+    h1 = page.first('//h1')
+    return h1.text_content().strip() if h1 is not None else f"Sessão {session_num}"
 
-for guide_path in guides:
-    try:
-        # Extrai info do caminho
-        parts = guide_path.split('/')
-        module_num = parts[1].replace('modulo', '')
-        session_num = parts[2].split('-')[0].replace('sessao', '')
-        
-        # Lê guia atual
-        with open(guide_path, 'r', encoding='utf-8') as f:
-            current_content = f.read()
-        
-        # Extrai título
-        title_match = re.search(r'<h1[^>]*>(.+?)</h1>', current_content, re.DOTALL)
-        title = re.sub(r'<[^>]+>', '', title_match.group(1)).strip() if title_match else f"Sessão {session_num}"
-        
-        # Extrai conteúdo e gera TOC
-        content, toc_html = extract_content_and_toc(guide_path)
-        
-        # Encontra nome do arquivo Word
-        word_match = re.search(r'href="\\.\\./(modulo\\d+/[^"]+\\.docx)"', current_content)
-        word_filename = word_match.group(1).split('/')[-1] if word_match else f"Sessão {session_num}.docx"
-        
-        # Gera novo HTML
-        new_html = PREMIUM_TEMPLATE.format(
-            title=title,
-            module_title=f"Módulo {module_num}",
-            module_num=module_num,
-            session_num=session_num,
-            content=content,
-            toc_html=toc_html,
-            word_filename=word_filename
-        )
-        
-        # Salva
-        with open(guide_path, 'w', encoding='utf-8') as f:
-            f.write(new_html)
-        
-        print(f"✨ {parts[1]}/sessao{session_num}: {title[:60]}")
-        
-    except Exception as e:
-        print(f"❌ Erro em {guide_path}: {e}")
+def apply_premium_page(page, guide_path):
+    """Aplica o template premium a um guia já analisado"""
+    # Extrai info do caminho
+    parts = guide_path.split('/')
+    module_num = parts[1].replace('modulo', '')
+    session_num = parts[2].split('-')[0].replace('sessao', '')
+    
+    # Extrai título
+    title = extract_title(page, session_num)
+    
+    # Encontra nome do arquivo Word (antes de extrair o conteúdo, que altera os h2)
+    word_link = page.first('//a[contains(@href, ".docx")]')
+    word_filename = word_link.get('href').split('/')[-1] if word_link is not None else f"Sessão {session_num}.docx"
+    
+    # Extrai conteúdo e gera TOC
+    content, toc_html = extract_content_and_toc(page)
+    
+    # Gera novo HTML
+    page.replace(PREMIUM_TEMPLATE.format(
+        title=html_lib.escape(title, quote=False),
+        module_title=f"Módulo {module_num}",
+        module_num=module_num,
+        session_num=session_num,
+        content=content,
+        toc_html=toc_html,
+        word_filename=word_filename
+    ))
+
+def apply_premium(current_content, guide_path):
+    """Aplica o template premium a um guia em HTML"""
+    return transform_html(current_content, lambda page: apply_premium_page(page, guide_path))
+
+def main():
+    # Processa todos os guias
+    guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
+    print(f"🎨 Aplicando design PREMIUM a {len(guides)} guias...\\n")
+    
+    for guide_path in guides:
+        try:
+            # Lê guia atual
+            with open(guide_path, 'r', encoding='utf-8') as f:
+                current_content = f.read()
+            
+            new_html, applied = run_stage(current_content, STAGE_NAME, STAGE_VERSION,
+                                          lambda html: apply_premium(html, guide_path))
+            if not applied:
+                print(f"⏭️  {guide_path}: já aplicado")
+                continue
+            
+            # Salva
+            with open(guide_path, 'w', encoding='utf-8') as f:
+                f.write(new_html)
+            
+            parts = guide_path.split('/')
+            session_num = parts[2].split('-')[0].replace('sessao', '')
+            title = extract_title(Page(current_content), session_num)
+            print(f"✨ {parts[1]}/sessao{session_num}: {title[:60]}")
+            
+        except Exception as e:
+            print(f"❌ Erro em {guide_path}: {e}")
+    
+    print(f"\\n🎉 Design premium aplicado com sucesso!")
+    print("\\n💎 Melhorias:")
+    print("   • Sidebar de navegação fixa")
+    print("   • Animações suaves")
+    print("   • Glassmorphism avançado")
+    print("   • Gradientes dinâmicos")
+    print("   • Scroll progress bar")
+    print("   • Hover effects premium")
 
-print(f"\\n🎉 Design premium aplicado com sucesso!")
-print("\\n💎 Melhorias:")
-print("   • Sidebar de navegação fixa")
-print("   • Animações suaves")
-print("   • Glassmorphism avançado")
-print("   • Gradientes dinâmicos")
-print("   • Scroll progress bar")
-print("   • Hover effects premium")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline dos guias
+- Gera (ou reutiliza) um curso sintético com synthetic_course.py
+- Mede em separado cada fase: leitura dos docx, construção da IR,
+  renderização do HTML, cada etapa de pós-processamento e o build
+  completo a frio (sem caches)
+- Para cada fase guarda o melhor tempo de --repeat execuções e o pico de
+  memória alocada (tracemalloc, numa execução à parte)
+- Acrescenta o resultado a .bench/results.json, com o commit atual, e
+  compara-o com a última medição do mesmo curso
+
+Uso:
+    python3 bench.py                               # curso do tamanho do real
+    python3 bench.py --modules 50 --sessions 6     # ~10x o curso real
+    python3 bench.py --workers 4 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import docx_cache
+from build_guides import SESSION, STAGES, build_guide, docx_guides, load_guide
+from docx_reader import read_paragraphs
+from keyword_classifier import classify
+from parallel_build import add_workers_argument, run_jobs
+from session_ir import build_session
+from synthetic_course import add_course_arguments, generate_course, load_course
+
+BENCH_DIR = '.bench'
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.json')
+
+def course_root(args):
+    """Pasta do curso sintético para estes parâmetros"""
+    return os.path.join(BENCH_DIR, f"curso-{args.modules}x{args.sessions}-s{args.scale:g}-r{args.seed}")
+
+def prepare_course(args):
+    """Reutiliza o curso se já existir com os mesmos parâmetros; senão gera-o"""
+    root = args.root or course_root(args)
+    params = {'modules': args.modules, 'sessions': args.sessions, 'scale': args.scale, 'seed': args.seed}
+    course = load_course(root)
+    if course is None or course['params'] != params or args.regenerate:
+        print(f"📚 A gerar o curso sintético em {root}...")
+        start = time.perf_counter()
+        shutil.rmtree(root, ignore_errors=True)
+        course = generate_course(root, **params)
+        print(f"   {len(course['sessions'])} sessões em {time.perf_counter() - start:.1f}s")
+    return root, course
+
+def clear_caches():
+    """Esquece tudo o que foi analisado: caches no disco e em memória"""
+    shutil.rmtree('.cache', ignore_errors=True)
+    docx_cache._memory.clear()
+    classify.cache_clear()
+
+def peak_memory(func):
+    """Pico de memória alocada (KB) durante uma execução de func(), medido com tracemalloc"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+def each(func, items, *args):
+    """Aplica func a cada item sem guardar os resultados (o pico de memória é o de um item)"""
+    def run():
+        for item in items:
+            func(item, *args)
+    return run
+
+def measure(func, repeat, setup=None):
+    """
+    Melhor tempo de func() em repeat execuções e pico de memória numa
+    execução extra (tracemalloc atrasa o código). Devolve (ms, pico em KB).
+    """
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    if setup:
+        setup()
+    return best * 1000, peak_memory(func)
+
+def git_commit():
+    """Commit atual (com '+' se houver alterações por gravar), ou None fora de um repositório"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--', '.'], cwd=here).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('+' if dirty else '')
+
+def run_benchmark(course, repeat, workers):
+    """Mede todas as fases sobre o curso da pasta atual e devolve o resultado"""
+    guides = docx_guides(course['sessions'], course['structures'])
+    sessions = [guide for guide in guides if guide['kind'] == SESSION]
+    docx_paths = [guide['docx'] for guide in guides]
+    stage_names = [name for name, _, _, _ in STAGES]
+    phases = {}
+
+    def record(name, ms, peak_kb, count):
+        phases[name] = {'ms': round(ms, 2), 'per_doc_ms': round(ms / count, 3), 'peak_kb': peak_kb}
+        print(f"   {name:<30}{ms:>9.1f}ms{ms / count:>9.2f}ms{peak_kb / 1024:>9.1f}MB")
+
+    print(f"\n⏱️  {len(guides)} documentos, melhor de {repeat}:")
+    print(f"   {'Fase':<30}{'Total':>11}{'Por doc':>11}{'Pico':>11}")
+
+    # Leitura dos docx (sem cache)
+    ms, peak = measure(each(read_paragraphs, docx_paths), repeat)
+    record('docx_parse', ms, peak, len(docx_paths))
+
+    # Construção da IR a partir dos documentos já lidos
+    clear_caches()
+    documents = [docx_cache.load_document(guide['docx']) for guide in sessions]
+    ms, peak = measure(each(build_session, documents), repeat)
+    record('ir_build', ms, peak, len(sessions))
+
+    # Renderização do HTML (IR e documentos já em cache)
+    for guide in guides:
+        load_guide(guide)
+    ms, peak = measure(each(load_guide, guides), repeat)
+    record('render', ms, peak, len(guides))
+
+    # Etapas de pós-processamento, guia a guia, com as caches quentes
+    # (o pico de memória é o do conjunto das etapas)
+    best_stages = None
+    for _ in range(repeat):
+        totals = defaultdict(float)
+        for guide in guides:
+            _, timings = build_guide(guide, stage_names)
+            for name, elapsed in timings.items():
+                totals[name] += elapsed * 1000
+        if best_stages is None or sum(totals.values()) < sum(best_stages.values()):
+            best_stages = totals
+    passes_peak = peak_memory(each(build_guide, guides, stage_names))
+    for name, ms in best_stages.items():
+        if name != 'load':
+            record(f"pass:{name}", ms, passes_peak, len(guides))
+
+    # Build completo a frio: caches vazias, pool de processos, escrita dos guias
+    def full_build():
+        for (guide, _), result, error in run_jobs(build_guide, [(guide, stage_names) for guide in guides], workers):
+            if error is not None:
+                raise error
+            with open(guide['path'], 'w', encoding='utf-8') as f:
+                f.write(result[0])
+
+    ms, peak = measure(full_build, repeat, setup=clear_caches)
+    record('end_to_end', ms, peak, len(guides))
+
+    paragraphs = sum(len(document['paragraphs']) for document in documents)
+    return {
+        'course': {
+            'documents': len(guides),
+            'sessions': len(sessions),
+            'paragraphs': paragraphs,
+            'docx_kb': sum(os.path.getsize(path) for path in docx_paths) // 1024,
+        },
+        'phases': phases,
+        'max_rss_kb': max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                          resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss),
+    }
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(previous, current):
+    """Mostra a variação de cada fase em relação à medição anterior do mesmo curso"""
+    print(f"\n📈 Comparação com {previous['commit'] or '?'} ({previous['date']}):")
+    for name, phase in current['phases'].items():
+        before = previous['phases'].get(name)
+        if not before or not before['ms']:
+            continue
+        change = (phase['ms'] - before['ms']) / before['ms'] * 100
+        flag = '⚠️ ' if change > 10 else '  '
+        print(f"   {flag}{name:<28}{before['ms']:>9.1f}ms → {phase['ms']:>9.1f}ms ({change:+.0f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline sobre um curso sintético")
+    add_course_arguments(parser)
+    parser.add_argument('--root', help="Pasta do curso (por omissão, .bench/curso-<parâmetros>)")
+    parser.add_argument('--regenerate', action='store_true', help="Gera o curso de novo, mesmo que já exista")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições de cada fase (fica a melhor)")
+    parser.add_argument('--results', default=RESULTS_PATH, help="Ficheiro JSON onde acumular os resultados")
+    add_workers_argument(parser)
+    args = parser.parse_args()
+
+    results_path = os.path.abspath(args.results)
+    root, course = prepare_course(args)
+    commit = git_commit()
+
+    # O pipeline trabalha com caminhos relativos (resources/moduloN/...)
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        result = run_benchmark(course, args.repeat, args.workers)
+    finally:
+        os.chdir(cwd)
+
+    run = {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'params': course['params'],
+        'repeat': args.repeat,
+        'workers': args.workers,
+        **result,
+    }
+
+    results = load_results(results_path)
+    previous = [r for r in results
+                if (r['params'], r['workers'], r['repeat']) == (run['params'], run['workers'], run['repeat'])]
+    if previous:
+        compare(previous[-1], run)
+
+    results.append(run)
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultado gravado em {args.results} ({len(results)} medições)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Pipeline único de build dos guias
+- Lê cada guia (ou o Word de origem) uma única vez
+- Analisa o HTML uma única vez para uma árvore (ver dom_transform.py) e
+  aplica-lhe todas as transformações, em etapas ordenadas
+- Serializa e escreve cada ficheiro uma única vez
+- Salta guias cujo Word, templates e etapas não mudaram (ver build_manifest.py)
+- Converte os guias em paralelo, num pool de processos (--workers)
+- Gera o catálogo do hub (módulos e sessões), URLS.txt e os README.txt das
+  sessões a partir do conteúdo (ver hub_catalog.py)
+- Na origem só escreve isso e os guias; as etapas seguintes trabalham numa
+  cópia das páginas em dist/, que é o que se publica (ver deploy.py)
+- Junta o CSS repetido nos guias numa folha partilhada (ver guide_styles.py)
+  e o JavaScript num runtime partilhado (ver guide_runtime.py)
+- Aloja no site, reduzidas aos caracteres usados, as fontes que as páginas
+  pediam ao Google Fonts (ver web_fonts.py)
+- Gera o índice de pesquisa offline dos guias e apresentações, por módulo,
+  que o hub carrega quando se pesquisa (ver search_index.py)
+- Escreve as dimensões das imagens e gera variantes WebP/AVIF para srcset
+  (ver responsive_images.py), e assinala capas duplicadas ou sem uso (ver cover_images.py)
+- Assinala handlers de scroll que leem o layout a cada evento (ver scroll_check.py)
+- Troca o Tailwind do CDN, no hub, nas apresentações e nos guias, por CSS estático
+  gerado pelo Tailwind do projeto, uma folha por grupo de páginas (ver tailwind_css.py)
+- Embute nos guias o CSS crítico e carrega o resto sem bloquear (ver critical_css.py)
+- Põe nas apresentações e guias dicas de prefetch da página seguinte do
+  curso e de preload do próprio script (ver prefetch_hints.py)
+- Minifica no fim o HTML final dos guias, do hub e das apresentações, sem
+  tocar em <script> e <pre> (ver html_minify.py)
+- Gera o manifesto de precache e o service worker para usar o hub, os
+  guias e as apresentações sem rede (ver offline_cache.py)
+- Pré-comprime (.gz, .br) todos os ficheiros publicados (ver precompress.py)
+- Mostra o tempo gasto por etapa no final
+
+Substitui a execução em cadeia de apply_premium_design.py, restructure_topics.py,
+reorganize_navigation.py, improve_navigation.py, improve_topic_structure.py,
+clean_visual.py e final_ux_improvements.py.
+"""
+
+import argparse
+import glob
+import os
+import time
+from collections import defaultdict
+
+import apply_premium_design
+import clean_visual
+import final_ux_improvements
+import improve_navigation
+import improve_topic_structure
+import reorganize_navigation
+import restructure_topics
+from build_manifest import (PIPELINE_VERSION, check_output, fingerprint, inputs_hash, load_manifest,
+                            record_output, save_manifest, text_hash)
+from cover_images import IMAGE_GLOBS, cover_report
+from cover_images import print_report as print_covers_report
+from create_structure_guides import MODULE_STRUCTURE_TEMPLATE, module_structures, render_structure
+from critical_css import inline_critical, template_report
+from critical_css import print_report as print_critical_report
+from deploy import ASSETS_DIR, in_deploy, source_path, sync_deploy
+from deploy import print_report as print_deploy_report
+from dom_transform import Page, run_page_stage
+from generate_all_guides import HTML_TEMPLATE, render_session, word_files
+from guide_runtime import extract_runtime
+from guide_runtime import print_report as print_runtime_report
+from guide_styles import GUIDE_GLOBS, extract_shared_styles, find_guides, inline_shared
+from guide_styles import print_report as print_styles_report
+from html_minify import minify_files
+from html_minify import print_report as print_minify_report
+from hub_catalog import (CATALOG_SOURCE, HUB_PATH, PROJECT_DATA, URLS_PATH, compile_catalog,
+                         publish_catalog)
+from hub_catalog import print_report as print_catalog_report
+from offline_cache import SERVICE_WORKER_PATH, SHELL_GLOBS, build_offline_cache
+from offline_cache import print_report as print_offline_report
+from parallel_build import add_workers_argument, run_jobs
+from precompress import precompress
+from precompress import print_report as print_precompress_report
+from prefetch_hints import add_hints
+from prefetch_hints import print_report as print_hints_report
+from responsive_images import print_report as print_images_report
+from responsive_images import responsive_images
+from scroll_check import check_pages, find_pages
+from scroll_check import print_report as print_scroll_report
+from search_index import build_search_index
+from search_index import print_report as print_search_report
+from tailwind_css import PAGE_GLOBS, build_stylesheets, convert_pages, print_report, tailwind_version
+from web_fonts import print_report as print_fonts_report
+from web_fonts import FONT_DIR, self_host_fonts
+
+SESSION = 'sessao'
+STRUCTURE = 'estrutura'
+
+# Etapas pela ordem em que os scripts antigos eram executados:
+# (nome, versão, transformação, tipos de guia a que se aplica)
+STAGES = [
+    (module.STAGE_NAME, module.STAGE_VERSION, transform, kinds)
+    for module, transform, kinds in [
+        (apply_premium_design, lambda page, guide: apply_premium_design.apply_premium_page(page, guide['path']), (SESSION,)),
+        (restructure_topics, lambda page, guide: restructure_topics.restructure_page(page), (SESSION,)),
+        (reorganize_navigation, lambda page, guide: reorganize_navigation.reorganize_page(page), (SESSION,)),
+        (improve_navigation, lambda page, guide: improve_navigation.improve_navigation_page(page), (SESSION,)),
+        (improve_topic_structure, lambda page, guide: improve_topic_structure.improve_topic_structure_page(page), (SESSION,)),
+        (clean_visual, lambda page, guide: clean_visual.clean_visual_page(page), (SESSION,)),
+        (final_ux_improvements, lambda page, guide: final_ux_improvements.apply_final_ux_page(page), (SESSION, STRUCTURE)),
+    ]
+]
+
+# Tudo o que, além do Word, determina o HTML final
+TEMPLATE_HASH = text_hash(
+    HTML_TEMPLATE, MODULE_STRUCTURE_TEMPLATE, apply_premium_design.PREMIUM_TEMPLATE,
+    improve_navigation.IMPROVED_NAV_CSS, improve_topic_structure.IMPROVEMENTS_CSS,
+    clean_visual.VISUAL_IMPROVEMENTS_CSS, final_ux_improvements.FINAL_UX_IMPROVEMENTS,
+)
+
+BUNDLE_GLOBS = ['modulo*/sessao*/assets/*']
+
+# Chave do manifesto com os hashes dos ficheiros lidos pelas etapas globais
+FILE_HASHES = 'files'
+
+# Ficheiros que cada etapa global lê (a de hub_catalog na origem, as outras
+# na cópia publicada). Uma etapa só corre se estes ficheiros, os seus
+# argumentos ou o código do pipeline mudaram desde o fim do último build
+STEP_INPUTS = {
+    'hub_catalog': ['resources/modulo*/*.docx', PROJECT_DATA, CATALOG_SOURCE, URLS_PATH, 'modulo*/sessao*/README.txt'],
+    'guide_styles': GUIDE_GLOBS + [f'{ASSETS_DIR}/guides.*.css'],
+    'guide_runtime': GUIDE_GLOBS + [f'{ASSETS_DIR}/guide-runtime.*.js'],
+    'search_index': GUIDE_GLOBS + [f'{ASSETS_DIR}/search*.json'],
+    'publish_catalog': [HUB_PATH, f'{ASSETS_DIR}/catalog.*.json'],
+    'web_fonts': PAGE_GLOBS + BUNDLE_GLOBS + [os.path.join(FONT_DIR, '**', '*'), f'{ASSETS_DIR}/fonts*'],
+    'responsive_images': PAGE_GLOBS + IMAGE_GLOBS + [f'{ASSETS_DIR}/catalog.*.json', f'{ASSETS_DIR}/images/*'],
+    'cover_images': PAGE_GLOBS + IMAGE_GLOBS + [f'{ASSETS_DIR}/catalog.*.json', f'{ASSETS_DIR}/images/*'],
+    'scroll_check': PAGE_GLOBS + BUNDLE_GLOBS,
+    'tailwind_css': PAGE_GLOBS + [source_path(pattern) for pattern in PAGE_GLOBS + BUNDLE_GLOBS]
+                    + [f'{ASSETS_DIR}/tailwind-*.css'],
+    'critical_css': GUIDE_GLOBS + [f'{ASSETS_DIR}/*.css'],
+    'prefetch_hints': PAGE_GLOBS + BUNDLE_GLOBS + [f'{ASSETS_DIR}/*.js'],
+    'html_minify': PAGE_GLOBS,
+    'offline_cache': PAGE_GLOBS + BUNDLE_GLOBS + SHELL_GLOBS + [SERVICE_WORKER_PATH],
+}
+
+class GlobalSteps:
+    """
+    Corre as etapas globais do build (as que trabalham sobre todas as
+    páginas) e salta as que têm as entradas (STEP_INPUTS, argumentos e
+    código) como no fim do último build: o relatório de uma etapa saltada é
+    o que ela deu da última vez, guardado no manifesto. Os hashes dos
+    ficheiros ficam também no manifesto (FILE_HASHES, caminhos relativos à
+    origem), para não voltar a ler as capas e os Word a cada build.
+
+    Quando só um guia muda, as etapas mais pesadas correm, mas com a sua
+    memória (memo) só tratam o que mudou: o índice de pesquisa refaz o
+    shard de um módulo, o CSS crítico e a minificação um guia.
+    """
+
+    def __init__(self, manifest, force=False):
+        self.manifest = manifest
+        self.force = force
+        self.root = os.getcwd()
+        self.hashes = {os.path.join(self.root, path): entry
+                       for path, entry in manifest.get(FILE_HASHES, {}).items()}
+        self.code = inputs_hash(['*.py'], PIPELINE_VERSION, cache=self.hashes)
+        self.pending = {}
+        self.skipped = []
+
+    def inputs(self, name, values):
+        return inputs_hash(STEP_INPUTS[name], self.code, *values, cache=self.hashes)
+
+    def run(self, name, function, *args, values=None):
+        """Corre function(*args), a não ser que nada tenha mudado; values substitui args no hash"""
+        values = args if values is None else values
+        key = f"step:{name}"
+        previous = self.manifest.get(key)
+        self.pending[name] = values
+        if not self.force and previous and previous['inputs'] == self.inputs(name, values):
+            self.skipped.append(name)
+            return previous['report']
+        report = function(*args)
+        self.manifest[key] = {'inputs': None, 'report': report}
+        return report
+
+    def memo(self, name, patterns=()):
+        """
+        Memória da etapa name entre builds, que a etapa lê e atualiza: por
+        página ou por módulo, o hash do que leu e a entrada do relatório que
+        deu. Começa vazia com force, ou se o código ou os ficheiros de
+        patterns (o que a etapa lê além das páginas) mudaram.
+        """
+        key = f"pages:{name}"
+        shared = inputs_hash(patterns, self.code, cache=self.hashes)
+        entry = self.manifest.get(key)
+        if self.force or not entry or entry['shared'] != shared:
+            entry = self.manifest[key] = {'shared': shared, 'pages': {}}
+        return entry['pages']
+
+    def record(self):
+        """Regista as entradas das etapas corridas até aqui, como ficaram no fim"""
+        for name, values in self.pending.items():
+            self.manifest[f"step:{name}"]['inputs'] = self.inputs(name, values)
+        self.pending = {}
+        self.manifest[FILE_HASHES] = {os.path.relpath(path, self.root).replace(os.sep, '/'): entry
+                                      for path, entry in sorted(self.hashes.items()) if os.path.exists(path)}
+
+def docx_guides(sessions, structures):
+    """
+    Guias a gerar a partir dos Word: sessions são (módulo, word, sessão) e
+    structures são (módulo, word)
+    """
+    guides = []
+    for module_num, word_filename, session_num in sessions:
+        guides.append({
+            'kind': SESSION,
+            'path': f"resources/modulo{module_num}/sessao{session_num}-guia.html",
+            'docx': f"resources/modulo{module_num}/{word_filename}",
+            'module_num': module_num,
+            'session_num': session_num,
+            'word_filename': word_filename,
+        })
+    for module_num, word_filename in structures:
+        guides.append({
+            'kind': STRUCTURE,
+            'path': f"resources/modulo{module_num}/estrutura-guia.html",
+            'docx': f"resources/modulo{module_num}/{word_filename}",
+            'module_num': module_num,
+            'word_filename': word_filename,
+        })
+    return guides
+
+def collect_guides(source):
+    """Lista os guias a construir, a partir dos Word ou dos HTML existentes"""
+    if source == 'docx':
+        sessions = [(module_num, word_filename, session_num)
+                    for module_num, module_sessions in word_files.items()
+                    for word_filename, session_num in module_sessions]
+        return docx_guides(sessions, module_structures)
+
+    guides = []
+    for path in sorted(glob.glob('resources/modulo*/sessao*-guia.html')):
+        guides.append({'kind': SESSION, 'path': path})
+    for path in sorted(glob.glob('resources/modulo*/estrutura-guia.html')):
+        guides.append({'kind': STRUCTURE, 'path': path})
+    return guides
+
+def load_guide(guide):
+    """Carrega o HTML inicial de um guia (renderizado do Word ou lido do disco)"""
+    if 'docx' not in guide or not os.path.exists(guide['docx']):
+        with open(guide['path'], 'r', encoding='utf-8') as f:
+            return f.read()
+
+    if guide['kind'] == SESSION:
+        _, html = render_session(guide['module_num'], guide['word_filename'], guide['session_num'])
+        return html
+    return render_structure(guide['module_num'], guide['word_filename'])
+
+def tailwind_pages(force=False):
+    """Folhas do Tailwind e conversão das páginas: (relatório, páginas convertidas)"""
+    stylesheets = build_stylesheets(force)
+    return stylesheets, convert_pages(stylesheets)
+
+def select_stages(names):
+    """Filtra as etapas pedidas na linha de comando, mantendo a ordem do pipeline"""
+    if not names:
+        return STAGES
+
+    wanted = set(names.split(','))
+    unknown = wanted - {name for name, _, _, _ in STAGES}
+    if unknown:
+        raise SystemExit(f"❌ Etapas desconhecidas: {', '.join(sorted(unknown))}")
+    return [stage for stage in STAGES if stage[0] in wanted]
+
+def guide_stages(guide, stage_names):
+    """Etapas pedidas que se aplicam a este tipo de guia"""
+    return [stage for stage in STAGES if stage[0] in stage_names and guide['kind'] in stage[3]]
+
+def build_guide(guide, stage_names):
+    """
+    Carrega um guia, analisa-o uma vez e aplica-lhe as etapas indicadas sobre
+    a árvore. Etapas já registadas no HTML nessa versão são saltadas (ver
+    stage_ledger.py).
+    Corre dentro dos workers: recebe nomes de etapas (pickláveis) e
+    devolve o HTML final e o tempo gasto em cada fase.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    html = load_guide(guide)
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page = Page(html)
+    # As etapas trabalham sobre o CSS embutido: desfaz a extração de um build anterior
+    inline_shared(page, guide['path'])
+    timings['parse'] = time.perf_counter() - start
+
+    for name, version, transform, _ in guide_stages(guide, stage_names):
+        start = time.perf_counter()
+        if run_page_stage(page, name, version, lambda tree: transform(tree, guide)):
+            timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    html = page.serialize()
+    timings['serialize'] = time.perf_counter() - start
+
+    return html, timings
+
+def verify_guide(guide, stage_names):
+    """
+    Constrói um guia aplicando cada etapa duas vezes seguidas e, no fim, o
+    pipeline inteiro de novo. Devolve (etapas cuja repetição mudou o HTML,
+    etapas que só são idempotentes graças ao registo).
+    """
+    page = Page(load_guide(guide))
+    inline_shared(page, guide['path'])
+    failures = []
+    ledger_only = []
+    stages = guide_stages(guide, stage_names)
+
+    for name, version, transform, _ in stages:
+        run_page_stage(page, name, version, lambda tree: transform(tree, guide))
+        html = page.serialize()
+        run_page_stage(page, name, version, lambda tree: transform(tree, guide))
+        if page.serialize() != html:
+            failures.append(name)
+        # A transformação em si, sem o registo a protegê-la
+        unprotected = Page(html)
+        transform(unprotected, guide)
+        if unprotected.serialize() != html:
+            ledger_only.append(name)
+
+    # O HTML final, lido de novo, passa pelo pipeline sem mudar
+    html = page.serialize()
+    rebuilt = Page(html)
+    for name, version, transform, _ in stages:
+        run_page_stage(rebuilt, name, version, lambda tree: transform(tree, guide))
+    if rebuilt.serialize() != html:
+        failures.append('pipeline')
+
+    return failures, ledger_only
+
+def print_timings(timings, guide_count, wall_time, workers):
+    """Mostra o tempo total e médio de cada etapa"""
+    print(f"\n⏱️  Tempo por etapa ({guide_count} guias, {workers} processos):")
+    print(f"   {'Etapa':<26}{'Total':>10}{'Por guia':>12}")
+    total = 0.0
+    for name, elapsed in timings.items():
+        total += elapsed
+        per_guide = elapsed / guide_count if guide_count else 0.0
+        print(f"   {name:<26}{elapsed * 1000:>8.1f}ms{per_guide * 1000:>10.2f}ms")
+    print(f"   {'TOTAL (CPU)':<26}{total * 1000:>8.1f}ms")
+    print(f"   {'TOTAL (parede)':<26}{wall_time * 1000:>8.1f}ms")
+
+def verify(guides, stage_names, workers):
+    """Verifica que nenhuma etapa altera um guia quando repetida"""
+    guides = [guide for guide in guides
+              if ('docx' in guide and os.path.exists(guide['docx'])) or os.path.exists(guide['path'])]
+    print(f"🔁 A verificar a idempotência de {len(guides)} guias...\n")
+
+    failed = 0
+    ledger_only = defaultdict(int)
+    for (guide, _), result, error in run_jobs(verify_guide, [(guide, stage_names) for guide in guides], workers):
+        if error is not None:
+            print(f"  ❌ Erro em {guide['path']}: {error}")
+            failed += 1
+            continue
+        failures, unprotected = result
+        for name in unprotected:
+            ledger_only[name] += 1
+        if failures:
+            print(f"  ❌ {guide['path']}: {', '.join(failures)}")
+            failed += 1
+
+    for name, count in ledger_only.items():
+        print(f"  ⚠️  {name} só é idempotente graças ao registo ({count} guias)")
+
+    if failed:
+        raise SystemExit(f"\n❌ {failed} guias mudam quando as etapas são repetidas")
+    print(f"🎉 Todas as etapas são idempotentes nos {len(guides)} guias")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build dos guias numa única passagem")
+    parser.add_argument('--source', choices=['docx', 'html'], default='docx',
+                        help="docx: gera a partir dos Word; html: reprocessa os guias existentes")
+    parser.add_argument('--stages', help="Lista de etapas separadas por vírgula (por omissão, todas)")
+    parser.add_argument('--list-stages', action='store_true', help="Lista as etapas e sai")
+    parser.add_argument('--force', action='store_true', help="Reconstrói todos os guias, mesmo sem alterações")
+    parser.add_argument('--explain', action='store_true', help="Explica porque cada guia foi ou não reconstruído")
+    parser.add_argument('--verify-idempotent', action='store_true',
+                        help="Falha se repetir alguma etapa mudar o HTML (não escreve nada)")
+    add_workers_argument(parser)
+    args = parser.parse_args()
+
+    if args.list_stages:
+        for name, version, _, kinds in STAGES:
+            print(f"  • {name} v{version} ({', '.join(kinds)})")
+        return
+
+    build_start = time.perf_counter()
+    stages = select_stages(args.stages)
+    stage_names = [name for name, _, _, _ in stages]
+    guides = collect_guides(args.source)
+
+    if args.verify_idempotent:
+        verify(guides, stage_names, args.workers)
+        return
+    timings = defaultdict(float)
+    manifest = load_manifest()
+
+    print(f"🏗️  Build de {len(guides)} guias em {len(stages)} etapas (origem: {args.source})...\n")
+
+    skipped = 0
+    missing = 0
+    errors = 0
+
+    # Decide primeiro o que precisa de ser reconstruído
+    jobs = []
+    pending = []
+    for guide in guides:
+        has_docx = 'docx' in guide and os.path.exists(guide['docx'])
+        if 'docx' in guide and not has_docx:
+            if not os.path.exists(guide['path']):
+                # Um Word em falta não impede o resto do site de ser construído
+                print(f"  ⚠️  Origem não encontrada, guia ignorado: {guide['docx']}")
+                missing += 1
+                continue
+            print(f"  ⚠️  Word não encontrado, a reprocessar {guide['path']}")
+
+        # Só guias gerados a partir do Word entram no build incremental
+        current = None
+        reason = "reprocessamento do HTML"
+        if has_docx:
+            start = time.perf_counter()
+            applied = [f"{name}={version}" for name, version, _, kinds in stages if guide['kind'] in kinds]
+            current = fingerprint('build_guides', guide['docx'], TEMPLATE_HASH, PIPELINE_VERSION, stages=applied)
+            needed, reason = check_output(manifest, guide['path'], current)
+            timings['manifest'] += time.perf_counter() - start
+            if not needed and not args.force:
+                if args.explain:
+                    print(f"  ⏭️  {guide['path']}: {reason}")
+                skipped += 1
+                continue
+            if not needed:
+                reason = "forçado"
+
+        jobs.append((guide, stage_names))
+        pending.append((current, reason))
+
+    # Constrói em paralelo e escreve pela ordem original
+    built = 0
+    results = run_jobs(build_guide, jobs, args.workers)
+    for ((guide, _), result, error), (current, reason) in zip(results, pending):
+        if error is not None:
+            print(f"  ❌ Erro em {guide['path']}: {error}")
+            errors += 1
+            continue
+
+        html, guide_timings = result
+        for name, elapsed in guide_timings.items():
+            timings[name] += elapsed
+
+        start = time.perf_counter()
+        with open(guide['path'], 'w', encoding='utf-8') as f:
+            f.write(html)
+        if current is not None:
+            record_output(manifest, guide['path'], current)
+        timings['write'] += time.perf_counter() - start
+
+        parts = guide['path'].split('/')
+        print(f"  ✅ {parts[1]}/{parts[2]}" + (f" ({reason})" if args.explain else ""))
+        built += 1
+
+    # O catálogo, o URLS.txt e os README.txt são da origem (versionados)
+    start = time.perf_counter()
+    steps = GlobalSteps(manifest, args.force)
+    catalog = steps.run('hub_catalog', compile_catalog,
+                        values=[sorted(glob.glob('modulo*/sessao*/index.html')), sorted(glob.glob('covers/*'))])
+    steps.record()
+    timings['hub_catalog'] += time.perf_counter() - start
+
+    # Daqui em diante tudo trabalha na cópia publicada: a origem fica como está
+    start = time.perf_counter()
+    deployed = sync_deploy(manifest, args.force, steps.hashes)
+    timings['deploy'] += time.perf_counter() - start
+
+    with in_deploy():
+        # O CSS e o JavaScript partilhados dependem de todos os guias, não só dos refeitos
+        start = time.perf_counter()
+        _, shared_styles = steps.run('guide_styles', extract_shared_styles, find_guides())
+        timings['guide_styles'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, runtime = steps.run('guide_runtime', extract_runtime, find_guides())
+        timings['guide_runtime'] += time.perf_counter() - start
+
+        # O índice lê o texto final dos guias; o catálogo publicado aponta para ele
+        start = time.perf_counter()
+        guides = find_guides()
+        search = steps.run('search_index', build_search_index, guides, catalog['catalog'], steps.memo('search_index'),
+                           values=[guides, catalog['catalog']])
+        timings['search_index'] += time.perf_counter() - start
+
+        # O catálogo vem antes das etapas que reescrevem o hub: as capas saem dele
+        start = time.perf_counter()
+        published = steps.run('publish_catalog', publish_catalog, catalog['catalog'], search['path'])
+        timings['hub_catalog'] += time.perf_counter() - start
+
+        # As fontes são reduzidas aos caracteres de todas as páginas, já no texto final
+        start = time.perf_counter()
+        fonts = steps.run('web_fonts', self_host_fonts)
+        timings['web_fonts'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        images = steps.run('responsive_images', responsive_images)
+        timings['responsive_images'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        covers = steps.run('cover_images', cover_report, images['images'])
+        timings['cover_images'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        pages = find_pages()
+        scroll_warnings = steps.run('scroll_check', check_pages, pages)
+        timings['scroll_check'] += time.perf_counter() - start
+
+        # As páginas que ainda usam o CDN (o hub, as apresentações, os guias)
+        # passam à folha estática; cada grupo de páginas tem as suas folhas
+        start = time.perf_counter()
+        stylesheets, converted = steps.run('tailwind_css', lambda: tailwind_pages(args.force),
+                                           values=[tailwind_version()])
+        timings['tailwind_css'] += time.perf_counter() - start
+
+        # O CSS crítico sai das folhas finais (Tailwind e partilhada)
+        start = time.perf_counter()
+        guides = find_guides()
+        memo = steps.memo('critical_css', [f'{ASSETS_DIR}/*.css'])
+        _, critical = steps.run('critical_css', inline_critical, guides, memo, values=[guides])
+        timings['critical_css'] += time.perf_counter() - start
+
+        # As dicas apontam para os bundles e o runtime finais
+        start = time.perf_counter()
+        hints = steps.run('prefetch_hints', add_hints, published['catalog'])
+        timings['prefetch_hints'] += time.perf_counter() - start
+
+        # Por último, depois de todas as etapas que reescrevem as páginas: guias,
+        # hub e apresentações
+        start = time.perf_counter()
+        pages = find_pages()
+        minified = steps.run('html_minify', minify_files, pages, steps.memo('html_minify'), values=[pages])
+        timings['html_minify'] += time.perf_counter() - start
+
+        # O precache lista os ficheiros publicados já na versão final
+        start = time.perf_counter()
+        offline = steps.run('offline_cache', build_offline_cache, published['catalog'])
+        timings['offline_cache'] += time.perf_counter() - start
+
+        # Só no fim, quando nenhum ficheiro publicado vai mudar; tem o seu
+        # próprio registo, ficheiro a ficheiro
+        start = time.perf_counter()
+        precompressed = precompress(args.workers)
+        timings['precompress'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        steps.record()
+        timings['manifest'] += time.perf_counter() - start
+
+    save_manifest(manifest)
+
+    workers = min(args.workers, len(jobs)) if jobs else 1
+    print(f"\n🎉 {built} guias construídos, {skipped} sem alterações, {errors} erros"
+          + (f", {missing} sem origem" if missing else ''))
+    if steps.skipped:
+        print(f"⏭️  {len(steps.skipped)} etapas globais sem alterações: {', '.join(steps.skipped)}")
+    print_timings(timings, built, time.perf_counter() - build_start, workers)
+    print_deploy_report(deployed)
+    print_catalog_report(catalog, published)
+    # Os relatórios leem os ficheiros publicados (tamanhos, variantes, folhas)
+    with in_deploy():
+        print_styles_report(shared_styles)
+        print_runtime_report(runtime)
+        print_search_report(search)
+        print_fonts_report(fonts)
+        print_images_report(images)
+        print_covers_report(covers)
+        print_scroll_report(scroll_warnings, len(pages))
+        print_report(stylesheets, converted=converted)
+        print_critical_report(critical, template_report())
+        print_hints_report(hints)
+        print_minify_report(minified)
+        print_offline_report(offline)
+        print_precompress_report(precompressed)
+
+if __name__ == '__main__':
+    main()
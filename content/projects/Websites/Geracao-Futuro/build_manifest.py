@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Manifesto de build incremental
+- Guarda, para cada ficheiro gerado, o hash do Word de origem, do template
+  e a versão do pipeline que o produziu
+- Permite saltar sessões que não mudaram desde o último build
+- Explica porque cada ficheiro foi (ou não) reconstruído
+- Guarda também, para cada etapa global do build, o hash dos ficheiros que
+  ela lê (inputs_hash), para a saltar quando estão como no último build
+"""
+
+import glob
+import hashlib
+import json
+import os
+import time
+
+MANIFEST_PATH = '.build-manifest.json'
+
+# Versão da lógica de conversão Word → HTML; incrementar sempre que
+# process_word_to_html ou as etapas do pipeline mudarem de comportamento
+PIPELINE_VERSION = 3
+
+def file_hash(path):
+    """Hash SHA-256 do conteúdo de um ficheiro"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def text_hash(*texts):
+    """Hash SHA-256 de um ou mais textos (templates, CSS, etc.)"""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+# Um ficheiro escrito há menos do que isto pode voltar a ser escrito com o
+# mesmo mtime (a resolução do relógio do sistema de ficheiros é grosseira)
+RACY_SECONDS = 2
+
+def cached_hash(path, cache):
+    """
+    file_hash com cache, {caminho absoluto: [mtime, tamanho, hash]}: só
+    reaproveita o hash se o mtime e o tamanho não mudaram, e não guarda o
+    dos ficheiros escritos há menos de RACY_SECONDS
+    """
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    entry = cache.get(key)
+    if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+        return entry[2]
+    digest = file_hash(path)
+    if time.time_ns() - stat.st_mtime_ns > RACY_SECONDS * 10 ** 9:
+        cache[key] = [stat.st_mtime_ns, stat.st_size, digest]
+    else:
+        cache.pop(key, None)
+    return digest
+
+def inputs_hash(patterns, *values, cache=None):
+    """
+    Hash das entradas de uma etapa global: o caminho e o conteúdo de cada
+    ficheiro que casa com os padrões (glob, com **) e os valores indicados
+    (em JSON); cache é a de cached_hash
+    """
+    cache = {} if cache is None else cache
+    paths = sorted({path for pattern in patterns for path in glob.glob(pattern, recursive=True)
+                    if os.path.isfile(path)})
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path}\0{cached_hash(path, cache)}\0".encode('utf-8'))
+    for value in values:
+        digest.update(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Carrega o manifesto do último build (vazio se não existir)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Grava o manifesto, ordenado para diffs estáveis"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+def fingerprint(generator, source_path, template_hash, pipeline_version, **extra):
+    """Impressão digital das entradas que determinam um ficheiro gerado"""
+    entry = {
+        'generator': generator,
+        'source': file_hash(source_path),
+        'template': template_hash,
+        'pipeline': pipeline_version,
+    }
+    entry.update(extra)
+    return entry
+
+# Campos comparados, pela ordem em que são explicados
+FIELD_REASONS = [
+    ('generator', "gerado por outro script"),
+    ('source', "Word de origem alterado"),
+    ('template', "template alterado"),
+    ('pipeline', "versão do pipeline alterada"),
+]
+
+def check_output(manifest, output_path, current):
+    """Decide se um ficheiro precisa de ser reconstruído e porquê"""
+    previous = manifest.get(output_path)
+    if previous is None:
+        return True, "sem registo no manifesto"
+    if not os.path.exists(output_path):
+        return True, "ficheiro de saída em falta"
+
+    for field, reason in FIELD_REASONS:
+        if previous.get(field) != current.get(field):
+            return True, reason
+    known = {field for field, _ in FIELD_REASONS} | {'output'}
+    for field in sorted((set(previous) | set(current)) - known):
+        if previous.get(field) != current.get(field):
+            return True, f"{field} alterado"
+
+    if previous.get('output') != file_hash(output_path):
+        return True, "ficheiro de saída modificado fora do build"
+
+    return False, "sem alterações"
+
+def record_output(manifest, output_path, current):
+    """Regista no manifesto um ficheiro acabado de escrever"""
+    entry = dict(current)
+    entry['output'] = file_hash(output_path)
+    manifest[output_path] = entry
@@ -10,29 +10,61 @@ Limpa e melhora visual do conteúdo:
 import glob
 import re
 
-def clean_content(html):
-    """Limpa conteúdo poluído"""
+from dom_transform import transform_html
+from stage_ledger import run_stage
+
+STAGE_NAME = 'clean_visual'
+STAGE_VERSION = 3
+
+HIGHLIGHT_EMOJIS = ['🎯', '📝', '🚀', '💡', '📦', '🔧', '⚠️', '💭']
+HIGHLIGHT_RE = re.compile(r'^(' + '|'.join(HIGHLIGHT_EMOJIS) + r')\s*(.+)$', re.DOTALL)
+DUPLICATE_EMOJI_RE = re.compile(r'^(🎯|📝|🚀|💡|📦|🔧){2,}')
+
+BRACKET_CODE_RE = re.compile(r'\[[\w\d\-#]+\]|\[[^\]]{0,50}\]')
+SPACES_RE = re.compile(r'\s{2,}')
+DOTS_RE = re.compile(r'\.{2,}')
+DUPLICATE_ACTIVITY_RE = re.compile(r'(Atividade Assíncrona.*?)Atividade Assíncrona', re.IGNORECASE)
+
+def clean_text(text):
+    """Limpa um texto da página"""
     
     # Remove códigos entre colchetes do tipo [L#-L#], [xxx-xxx], etc
-    html = re.sub(r'\[[\w\d\-#]+\]', '', html)
-    html = re.sub(r'\[[^\]]{0,50}\]', '', html)
-    
-    # Remove emojis duplicados no início de parágrafos
-    html = re.sub(r'(<p>)(🎯|📝|🚀|💡|📦|🔧){2,}', r'\1\2', html)
+    if '[' in text:
+        text = BRACKET_CODE_RE.sub('', text)
     
     # Remove múltiplos espaços
-    html = re.sub(r'\s{2,}', ' ', html)
+    text = SPACES_RE.sub(' ', text)
     
     # Remove pontos múltiplos
-    html = re.sub(r'\.{2,}', '.', html)
-    
-    # Limpa parágrafos vazios ou muito curtos (menos de 3 caracteres)
-    html = re.sub(r'<p>\s{0,3}</p>', '', html)
+    if '..' in text:
+        text = DOTS_RE.sub('.', text)
     
     # Remove texto "Atividade Assíncrona" duplicado
-    html = re.sub(r'(Atividade Assíncrona.*?)Atividade Assíncrona', r'\1', html, flags=re.IGNORECASE)
+    text = DUPLICATE_ACTIVITY_RE.sub(r'\1', text)
     
-    return html
+    return text
+
+def is_plain_paragraph(el):
+    """Parágrafo sem atributos nem elementos filhos"""
+    return el.tag == 'p' and not el.attrib and len(el) == 0
+
+def clean_content(page):
+    """Limpa conteúdo poluído (só texto visível; scripts, CSS e <pre> ficam intactos)"""
+    for el, attr in list(page.text_nodes()):
+        setattr(el, attr, clean_text(getattr(el, attr)))
+    
+    for p in page.select('//p'):
+        if not is_plain_paragraph(p):
+            continue
+        text = p.text or ''
+        
+        # Limpa parágrafos vazios ou muito curtos (menos de 3 caracteres)
+        if len(text) <= 3 and not text.strip():
+            page.remove(p)
+            continue
+        
+        # Remove emojis duplicados no início de parágrafos
+        p.text = DUPLICATE_EMOJI_RE.sub(lambda match: match.group(1), text)
 
 def improve_paragraph_formatting(html):
     """Melhora formatação de parágrafos longos"""
@@ -54,17 +86,18 @@ def improve_paragraph_formatting(html):
     
     return html
 
-def add_visual_spacing(html):
+def add_visual_spacing(page):
     """Adiciona espaçamento visual melhor"""
     
-    # Adiciona classe para parágrafos importantes (que começam com emoji ou negrito)
-    html = re.sub(
-        r'<p>(🎯|📝|🚀|💡|📦|🔧|⚠️|💭)([^<]+)</p>',
-        r'<p class="highlight-text"><strong>\1 \2</strong></p>',
-        html
-    )
-    
-    return html
+    # Adiciona classe para parágrafos importantes (que começam com emoji)
+    for p in page.select('//p'):
+        if not is_plain_paragraph(p):
+            continue
+        match = HIGHLIGHT_RE.match(p.text or '')
+        if match:
+            p.set('class', 'highlight-text')
+            p.text = None
+            p.append(page.new('strong', f"{match.group(1)} {match.group(2)}"))
 
 # CSS para melhorias visuais
 VISUAL_IMPROVEMENTS_CSS = """
@@ -104,45 +137,52 @@ VISUAL_IMPROVEMENTS_CSS = """
         }
 """
 
-guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
-print(f"🧹 Limpando e melhorando visual de {len(guides)} guias...\n")
+def clean_visual_page(page):
+    """Aplica todas as limpezas visuais a um guia já analisado"""
+    # Aplica limpezas
+    clean_content(page)
+    add_visual_spacing(page)
+    
+    # Adiciona CSS se não existir
+    if 'highlight-text' not in page.css():
+        page.insert_css(VISUAL_IMPROVEMENTS_CSS, '/* Dividers */')
 
-cleaned = 0
-for guide_path in guides:
-    try:
-        with open(guide_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original = content
-        
-        # Aplica limpezas
-        content = clean_content(content)
-        content = improve_paragraph_formatting(content)
-        content = add_visual_spacing(content)
-        
-        # Adiciona CSS se não existir
-        if 'highlight-text' not in content:
-            content = content.replace(
-                '/* Dividers */',
-                VISUAL_IMPROVEMENTS_CSS + '\n        /* Dividers */'
-            )
-        
-        # Só salva se houve mudanças
-        if content != original:
-            with open(guide_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+def clean_visual(content):
+    """Aplica todas as limpezas visuais a um guia"""
+    return transform_html(content, clean_visual_page)
+
+def main():
+    guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
+    print(f"🧹 Limpando e melhorando visual de {len(guides)} guias...\n")
+    
+    cleaned = 0
+    for guide_path in guides:
+        try:
+            with open(guide_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
-            cleaned += 1
-            parts = guide_path.split('/')
-            print(f"  ✅ {parts[1]}/{parts[2]}")
+            original = content
+            content, _ = run_stage(content, STAGE_NAME, STAGE_VERSION, clean_visual)
+            
+            # Só salva se houve mudanças
+            if content != original:
+                with open(guide_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                
+                cleaned += 1
+                parts = guide_path.split('/')
+                print(f"  ✅ {parts[1]}/{parts[2]}")
+        
+        except Exception as e:
+            print(f"  ❌ Erro: {e}")
     
-    except Exception as e:
-        print(f"  ❌ Erro: {e}")
+    print(f"\n🎉 {cleaned} guias limpos e melhorados!")
+    print("\n✨ Melhorias:")
+    print("   • Códigos [xxx] removidos")
+    print("   • Texto poluído limpo")
+    print("   • Parágrafos formatados")
+    print("   • Espaçamento melhorado")
+    print("   • Visual mais limpo e profissional")
 
-print(f"\n🎉 {cleaned} guias limpos e melhorados!")
-print("\n✨ Melhorias:")
-print("   • Códigos [xxx] removidos")
-print("   • Texto poluído limpo")
-print("   • Parágrafos formatados")
-print("   • Espaçamento melhorado")
-print("   • Visual mais limpo e profissional")
+if __name__ == '__main__':
+    main()
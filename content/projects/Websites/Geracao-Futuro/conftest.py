@@ -0,0 +1,60 @@
+"""
+Fixtures partilhadas dos testes (python3 -m pytest, nesta pasta)
+- O build reescreve a origem (guias, catalog.json, index.html), por isso
+  corre sempre numa cópia do projeto, numa pasta temporária, sem as saídas
+  nem o estado local do build (dist/, .cache/, manifesto)
+- project: uma cópia nova, por teste
+- built_project: uma cópia com um build completo, partilhada pelos testes
+  que só a leem
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+LOCAL_STATE = shutil.ignore_patterns('dist', '.cache', '.bench', '__pycache__', '.pytest_cache',
+                                     '.build-manifest.json')
+
+def copy_project(target):
+    shutil.copytree(HERE, target, ignore=LOCAL_STATE)
+    return target
+
+def run_build(root, *args):
+    """Corre build_guides.py na cópia e devolve o que escreveu (o teste falha se o build falhar)"""
+    result = subprocess.run([sys.executable, 'build_guides.py', *args], cwd=root,
+                            capture_output=True, text=True, encoding='utf-8')
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+def snapshot(root):
+    """{caminho: hash} de todos os ficheiros da cópia, exceto o estado local do build"""
+    files = {}
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [name for name in dirs if name not in ('.cache', '__pycache__', '.pytest_cache')]
+        for name in names:
+            if name == '.build-manifest.json':
+                continue
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, root)] = hashlib.sha256(f.read()).hexdigest()
+    return files
+
+@pytest.fixture
+def build():
+    return run_build
+
+@pytest.fixture
+def project(tmp_path):
+    return copy_project(str(tmp_path / 'project'))
+
+@pytest.fixture(scope='session')
+def built_project(tmp_path_factory):
+    root = copy_project(str(tmp_path_factory.mktemp('built') / 'project'))
+    run_build(root)
+    return root
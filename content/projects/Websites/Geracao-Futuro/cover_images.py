@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Capas publicadas: duplicados, imagens não usadas e poupança no deploy
+- covers/ tem, além das img_module_N.png que o hub usa, cópias como
+  cover_module_1_ai_brain.png e cover_module_1_ai_brain_1767053632553.png,
+  e todas iam no deploy
+- Agrupa as imagens de covers/ em duplicados:
+  - idênticas: o mesmo sha256
+  - mesmos píxeis: iguais depois de tirar os metadados (segmentos APPn e
+    COM do JPEG, chunks auxiliares do PNG), por exemplo a mesma imagem
+    exportada duas vezes com outra data
+  - quase iguais: com o Pillow, diferença de hash perceptual (dHash) de no
+    máximo NEAR_DISTANCE bits em 64
+- Referidas são as capas do catálogo do hub e as <img> das páginas; só
+  essas ficam no deploy. Corre na cópia publicada (ver deploy.py), que não
+  leva a capa.* nem o data.json do portfólio
+- As variantes por tamanho de ecrã (320/640/960 px, para os cartões de
+  18-20rem em ecrãs 1x a 3x) são as de responsive_images.py
+- Mostra o tamanho do deploy antes e depois e o que o hub descarrega por
+  visita; --prune apaga as imagens não referidas, na origem e na cópia
+
+Uso:
+    python3 cover_images.py            # só o relatório
+    python3 cover_images.py --prune
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import struct
+
+from deploy import in_deploy, source_path
+from hub_catalog import HUB_PATH, hub_covers
+from responsive_images import (IMG_TAG_RE, attribute, file_digest, image_size, local_image, pillow,
+                               responsive_images)
+from tailwind_css import find_pages
+
+IMAGE_GLOBS = ['covers/*']
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.avif')
+
+# Bits diferentes (em 64) até os quais duas imagens contam como a mesma
+NEAR_DISTANCE = 4
+
+# Chunks do PNG que definem os píxeis; os outros são metadados
+PNG_PIXEL_CHUNKS = (b'IHDR', b'PLTE', b'tRNS', b'IDAT', b'IEND')
+
+def find_images():
+    return [path.replace(os.sep, '/') for pattern in IMAGE_GLOBS for path in sorted(glob.glob(pattern))
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)]
+
+def referenced_images(page_paths=None):
+    """Imagens locais usadas: {caminho: [onde]}"""
+    references = {}
+    for page_path in page_paths or find_pages():
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        sources = [attribute(tag, 'src') for tag in IMG_TAG_RE.findall(html)]
+        if os.path.normpath(page_path) == os.path.normpath(HUB_PATH):
+            sources += hub_covers(page_path)
+        for src in sources:
+            path = local_image(src, page_path)
+            if path is not None:
+                references.setdefault(path, []).append(page_path)
+    return references
+
+def pixel_digest(path):
+    """sha256 da imagem sem metadados, ou None se o formato não for conhecido"""
+    kind = (image_size(path) or (None,))[0]
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256()
+    if kind == 'png':
+        index = 8
+        while index + 8 <= len(data):
+            length, chunk = struct.unpack('>I4s', data[index:index + 8])
+            end = index + 12 + length
+            if chunk in PNG_PIXEL_CHUNKS:
+                digest.update(data[index:end])
+            index = end
+        return digest.hexdigest()
+    if kind == 'jpeg':
+        index = 2
+        while index + 4 <= len(data) and data[index] == 0xff:
+            marker = data[index + 1]
+            end = index + 2 + struct.unpack('>H', data[index + 2:index + 4])[0]
+            if marker == 0xda:
+                # Início dos dados comprimidos: daqui até ao fim são píxeis
+                digest.update(data[index:])
+                return digest.hexdigest()
+            # APP0..APP15 e COM são metadados; o APP14 (Adobe) muda as cores
+            if not (0xe0 <= marker <= 0xef and marker != 0xee) and marker != 0xfe:
+                digest.update(data[index:end])
+            index = end
+        return digest.hexdigest()
+    return None
+
+def difference_hash(Image, path):
+    """dHash de 64 bits: cada bit diz se um píxel é mais claro que o vizinho"""
+    with Image.open(path) as image:
+        pixels = list(image.convert('L').resize((9, 8), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for column in range(8):
+            bits = bits << 1 | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return bits
+
+def duplicate_groups(paths):
+    """
+    Grupos de imagens repetidas: [(motivo, [caminhos])], com cada imagem
+    num só grupo e o motivo mais forte que a junta às outras.
+    """
+    groups = {}
+    for reason, key in [('idênticas', file_digest), ('mesmos píxeis', pixel_digest)]:
+        by_key = {}
+        for path in paths:
+            value = key(path)
+            if value is not None:
+                by_key.setdefault(value, []).append(path)
+        for members in by_key.values():
+            merge_group(groups, reason, members)
+
+    Image = pillow()
+    if Image is not None:
+        hashes = {}
+        for path in paths:
+            try:
+                hashes[path] = difference_hash(Image, path)
+            except OSError:
+                continue
+        for first in hashes:
+            for second in hashes:
+                if first < second and bin(hashes[first] ^ hashes[second]).count('1') <= NEAR_DISTANCE:
+                    merge_group(groups, 'quase iguais', [first, second])
+
+    unique = {id(group): group for group in groups.values()}
+    return sorted(((reason, sorted(members)) for reason, members in unique.values()), key=lambda group: group[1])
+
+def merge_group(groups, reason, members):
+    """Junta members num só grupo (groups: caminho -> [motivo, membros]); o primeiro motivo fica"""
+    if len(members) < 2:
+        return
+    merged = None
+    for path in members:
+        group = groups.get(path)
+        if group is None or group is merged:
+            continue
+        if merged is None:
+            merged = group
+        else:
+            merged[1].extend(member for member in group[1] if member not in merged[1])
+    if merged is None:
+        merged = [reason, []]
+    merged[1].extend(path for path in members if path not in merged[1])
+    for path in merged[1]:
+        groups[path] = merged
+
+def cover_report(images=None):
+    """
+    Analisa as capas. images é o relatório de responsive_images (caminho ->
+    dimensões e variantes); devolve {'images', 'bytes', 'referenced',
+    'groups', 'unused', 'variants'}.
+    """
+    paths = find_images()
+    referenced = referenced_images()
+    unused = [path for path in paths if path not in referenced]
+    variants = {}
+    for path, info in (images or {}).items():
+        if info and path in paths:
+            variants[path] = [candidate.split(' ') for source in info['sources']
+                              for candidate in source['srcset'].split(', ')]
+    return {'images': paths, 'bytes': {path: os.path.getsize(path) for path in paths},
+            'referenced': referenced, 'groups': duplicate_groups(paths), 'unused': unused, 'variants': variants}
+
+def prune(report):
+    """Apaga as imagens não referidas, na origem e na cópia; devolve os caminhos apagados"""
+    for path in report['unused']:
+        for target in (source_path(path), path):
+            if os.path.exists(target):
+                os.remove(target)
+    return report['unused']
+
+def hub_download(report):
+    """
+    Bytes das capas que o hub descarrega: (originais, com variantes). Conta
+    a variante de 640 px (cartão de 20rem num ecrã 2x) no formato mais leve.
+    """
+    original = optimized = 0
+    for path, sources in report['referenced'].items():
+        if HUB_PATH not in sources:
+            continue
+        size = report['bytes'].get(path) or os.path.getsize(path)
+        original += size
+        candidates = [(int(width[:-1]), os.path.getsize(variant)) for variant, width in report['variants'].get(path, [])
+                      if os.path.exists(variant)]
+        fitting = [candidate for candidate in candidates if candidate[0] <= 640] or candidates
+        if fitting:
+            width = max(candidate[0] for candidate in fitting)
+            size = min(candidate_size for candidate_width, candidate_size in fitting if candidate_width == width)
+        optimized += size
+    return original, optimized
+
+def megabytes(size):
+    return f"{size / 1024 / 1024:.1f}MB"
+
+def print_report(report, pruned=None):
+    sizes = report['bytes']
+    unused = report['unused']
+    total = sum(sizes.values())
+    unused_bytes = sum(sizes[path] for path in unused)
+    print(f"\n🗂️  Capas: {len(sizes)} imagens, {len(sizes) - len(unused)} referidas, {len(unused)} sem uso")
+    for reason, members in report['groups']:
+        kept = [path for path in members if path in report['referenced']]
+        others = [path for path in members if path not in kept]
+        print(f"   {reason}: {', '.join(kept) or '(nenhuma referida)'} ← {', '.join(others) or '(todas referidas)'}")
+    grouped = {path for _, members in report['groups'] for path in members}
+    for path in unused:
+        if path not in grouped:
+            print(f"   sem uso: {path}")
+
+    variant_bytes = sum(os.path.getsize(variant) for sources in report['variants'].values()
+                        for variant, _ in sources if os.path.exists(variant))
+    saved = unused_bytes / total * 100 if total else 0
+    print(f"   Deploy: {megabytes(total)} → {megabytes(total - unused_bytes)} só com as referidas "
+          f"(−{megabytes(unused_bytes)}, {saved:.0f}%)"
+          + (f", mais {megabytes(variant_bytes)} de variantes" if variant_bytes else ''))
+    original, optimized = hub_download(report)
+    if optimized < original:
+        print(f"   Hub, por visita: {megabytes(original)} de capas → {megabytes(optimized)} com as variantes")
+    elif original:
+        print(f"   Hub, por visita: {megabytes(original)} de capas (sem variantes, ver responsive_images.py)")
+    if pruned:
+        print(f"   🧹 {len(pruned)} imagens sem uso apagadas")
+    elif unused:
+        print("   💡 python3 cover_images.py --prune apaga as imagens sem uso")
+
+def main():
+    parser = argparse.ArgumentParser(description="Encontra capas duplicadas ou sem uso e mostra a poupança no deploy")
+    parser.add_argument('--prune', action='store_true', help="Apaga as imagens que nenhuma página usa")
+    args = parser.parse_args()
+
+    with in_deploy():
+        report = cover_report(responsive_images()['images'])
+        print_report(report, prune(report) if args.prune else None)
+
+if __name__ == '__main__':
+    main()
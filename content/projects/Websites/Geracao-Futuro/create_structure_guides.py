@@ -4,10 +4,14 @@ Cria guias HTML premium para as Estruturas de cada Módulo
 Similar aos guias de sessão, mas para visão geral do módulo
 """
 
-from docx import Document
+import argparse
 import os
 import re
 
+from docx_cache import load_document
+from hub_catalog import module_documents, numbered
+from parallel_build import add_workers_argument, run_jobs
+
 # Template para estrutura de módulo
 MODULE_STRUCTURE_TEMPLATE = """<!DOCTYPE html>
 <html lang="pt">
@@ -170,17 +174,16 @@ MODULE_STRUCTURE_TEMPLATE = """<!DOCTYPE html>
 def extract_structure_content(docx_path):
     """Extrai conteúdo do arquivo de estrutura"""
     try:
-        doc = Document(docx_path)
         html_parts = []
         
-        for para in doc.paragraphs:
-            text = para.text.strip()
+        for para in load_document(docx_path)['paragraphs']:
+            text = para['text'].strip()
             if not text:
                 continue
             
             # Detecta headings
-            if para.style.name.startswith('Heading') or (para.runs and any(run.bold for run in para.runs if len(run.text) > 10)):
-                level = 'h2' if 'Heading 1' in para.style.name or 'Módulo' in text else 'h3'
+            if para['style'].startswith('Heading') or (para['runs'] and any(bold for run_text, bold in para['runs'] if len(run_text) > 10)):
+                level = 'h2' if 'Heading 1' in para['style'] or 'Módulo' in text else 'h3'
                 html_parts.append(f'<{level}>{text}</{level}>')
             elif text.startswith('•') or text.startswith('-'):
                 html_parts.append(f'<li>{text[1:].strip()}</li>')
@@ -195,53 +198,72 @@ def extract_structure_content(docx_path):
     except Exception as e:
         return f"<p>Erro ao processar conteúdo: {e}</p>"
 
-# Mapeia estruturas de módulo
-module_structures = [
-    (1, "Módulo 1 - Estrutura.docx"),
-    (2, "Módulo 2 - Estrutura.docx"),
-    (3, "Módulo 3 - Estrutura.docx"),
-    (4, "Módulo 4 - Estrutura.docx"),
-    (5, "Módulo 5 - Estrutura.docx"),
-]
+def find_structures():
+    """Word da estrutura de cada módulo, com o nome que tem em resources/: [(módulo, ficheiro)]"""
+    structures = []
+    for module_num, _ in numbered('resources/modulo*', 'modulo'):
+        _, structure = module_documents(module_num)
+        if structure:
+            structures.append((module_num, os.path.basename(structure)))
+    return structures
 
-print("🏗️  Criando guias de estrutura para os módulos...\\n")
+# Mapeia estruturas de módulo
+module_structures = find_structures()
 
-created = 0
-for module_num, word_filename in module_structures:
+def render_structure(module_num, word_filename):
+    """Gera o HTML do guia de estrutura de um módulo"""
     docx_path = f"resources/modulo{module_num}/{word_filename}"
-    output_path = f"resources/modulo{module_num}/estrutura-guia.html"
     
-    if not os.path.exists(docx_path):
-        print(f"  ⚠️  Módulo {module_num}: Arquivo não encontrado")
-        continue
+    # Extrai conteúdo
+    content = extract_structure_content(docx_path)
     
-    try:
-        # Extrai conteúdo
-        content = extract_structure_content(docx_path)
+    # Define título
+    title = f"Módulo {module_num} - Estrutura"
+    module_badge = f"Módulo {module_num}"
+    
+    # Gera HTML
+    return MODULE_STRUCTURE_TEMPLATE.format(
+        title=title,
+        module_badge=module_badge,
+        content=content,
+        word_filename=word_filename
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Cria os guias de estrutura de cada módulo")
+    add_workers_argument(parser)
+    args = parser.parse_args()
+    
+    print("🏗️  Criando guias de estrutura para os módulos...\\n")
+    
+    jobs = []
+    for module_num, word_filename in module_structures:
+        docx_path = f"resources/modulo{module_num}/{word_filename}"
         
-        # Define título
-        title = f"Módulo {module_num} - Estrutura"
-        module_badge = f"Módulo {module_num}"
+        if not os.path.exists(docx_path):
+            print(f"  ⚠️  Módulo {module_num}: Arquivo não encontrado")
+            continue
         
-        # Gera HTML
-        html = MODULE_STRUCTURE_TEMPLATE.format(
-            title=title,
-            module_badge=module_badge,
-            content=content,
-            word_filename=word_filename
-        )
+        jobs.append((module_num, word_filename))
+    
+    created = 0
+    for (module_num, word_filename), html, error in run_jobs(render_structure, jobs, args.workers):
+        if error is not None:
+            print(f"  ❌ Módulo {module_num}: Erro - {error}")
+            continue
         
         # Salva
+        output_path = f"resources/modulo{module_num}/estrutura-guia.html"
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html)
         
         print(f"  ✅ Módulo {module_num}: estrutura-guia.html criado")
         created += 1
-        
-    except Exception as e:
-        print(f"  ❌ Módulo {module_num}: Erro - {e}")
+    
+    print(f"\\n🎉 {created} guias de estrutura criados!")
+    print("\\n📍 Localizações:")
+    for i in range(1, 6):
+        print(f"   • resources/modulo{i}/estrutura-guia.html")
 
-print(f"\\n🎉 {created} guias de estrutura criados!")
-print("\\n📍 Localizações:")
-for i in range(1, 6):
-    print(f"   • resources/modulo{i}/estrutura-guia.html")
+if __name__ == '__main__':
+    main()
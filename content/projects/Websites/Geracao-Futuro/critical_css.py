@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+CSS crítico dos guias
+- O primeiro desenho de um guia esperava pelas folhas de estilo ligadas
+  (a do Tailwind e a folha partilhada dos guias), mesmo só precisando de uma
+  pequena parte delas para o que aparece no ecrã
+- Para cada guia, escolhe nessas folhas as regras que se aplicam ao que está
+  acima da dobra: o cabeçalho (header-premium / premium-header), a barra de
+  progresso e o fundo fixo, a sidebar e o bloco do título (o primeiro <h1> e
+  os seus vizinhos), mais os elementos que os contêm
+- Essas regras vão para um <style> no <head>; as folhas completas passam a
+  carregar sem bloquear (media="print" até ao onload, com <noscript> para
+  quem não tem JavaScript). A ordem da cascata não muda: o <style> crítico
+  fica antes das folhas e as regras próprias do guia depois
+- A seleção é por classe, id e elemento do último seletor simples de cada
+  regra; na dúvida (seletores só com atributos ou pseudo-classes), a regra
+  entra
+- A operação é reversível: restore_blocking() é chamada por
+  guide_styles.inline_shared() antes de as etapas do pipeline correrem
+- Mostra os bytes críticos por template (premium, ultra-premium e estrutura)
+  e por guia
+
+Uso:
+    python3 critical_css.py
+"""
+
+import importlib
+import os
+import re
+import string
+from collections import defaultdict
+from functools import lru_cache
+
+from build_manifest import text_hash
+from deploy import in_deploy
+from dom_transform import Page, has_class
+from guide_styles import find_guides, split_statements
+from html_minify import minify_css
+from tailwind_css import stylesheet_path
+
+CRITICAL_ID = 'critical-css'
+FALLBACK_ID = 'critical-css-fallback'
+ASYNC_MEDIA = 'print'
+ASYNC_ONLOAD = "this.media='all'"
+
+# Folhas que podem carregar sem bloquear: as do Tailwind e a partilhada dos guias
+ASYNC_HREF_RE = re.compile(r'(?:^|/)(?:tailwind-[a-z]+(?:-[0-9a-f]{8})?|guides)\.[0-9a-f]{8}\.css$')
+
+# Zonas acima da dobra (XPath); destas entra toda a subárvore
+FOLD_XPATHS = [
+    f"//*[{has_class('header-premium')} or {has_class('premium-header')}]",
+    f"//*[{has_class('scroll-progress')}]",
+    f"//body/*[{has_class('fixed')} or {has_class('animated-bg')}]",
+    "//aside",
+    "(//h1)[1]",
+    "(//h1)[1]/preceding-sibling::*[1]",
+    "(//h1)[1]/following-sibling::*[1]",
+]
+
+COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+CSS_ESCAPE_RE = re.compile(r'\\([0-9a-fA-F]{1,6}\s?|.)')
+CLASS_RE = re.compile(r'\.((?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w-])+)')
+ID_RE = re.compile(r'#((?:\\.|[\w-])+)')
+TAG_RE = re.compile(r'^[a-zA-Z][\w-]*')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;}]+)')
+KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+# Templates dos guias, para o relatório
+TEMPLATES = [
+    ('premium', 'apply_premium_design', 'PREMIUM_TEMPLATE'),
+    ('ultra-premium', 'ultra_premium_template', 'ULTRA_PREMIUM_TEMPLATE'),
+    ('estrutura', 'create_structure_guides', 'MODULE_STRUCTURE_TEMPLATE'),
+]
+
+def unescape(name):
+    def replace(match):
+        escaped = match.group(1)
+        if re.fullmatch(r'[0-9a-fA-F]{1,6}\s?', escaped):
+            return chr(int(escaped.strip(), 16))
+        return escaped
+    return CSS_ESCAPE_RE.sub(replace, name)
+
+def split_top_level(text, separator):
+    """Divide por um separador fora de (), [] e strings"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == '\\':
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char == '\\':
+            index += 1
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+        index += 1
+    parts.append(text[start:])
+    return parts
+
+def subject(selector):
+    """
+    Requisitos do último seletor simples (o elemento a que a regra se
+    aplica): (elemento, classes, ids). None se não houver nada que o
+    restrinja (*, :root, [atributos], ...).
+    """
+    compounds = [part for part in COMBINATOR_RE.split(selector.strip()) if part]
+    if not compounds:
+        return None
+    compound = compounds[-1]
+    # Tira pseudo-classes com argumentos, ex. :not(.a), e os atributos
+    compound = re.sub(r'\[[^\]]*\]', '', compound)
+    compound = re.sub(r'::?[\w-]+\([^)]*\)', '', compound)
+    tag = TAG_RE.match(compound)
+    classes = {unescape(name) for name in CLASS_RE.findall(compound)}
+    ids = {unescape(name) for name in ID_RE.findall(compound)}
+    if not (tag or classes or ids):
+        return None
+    return (tag.group().lower() if tag else None, frozenset(classes), frozenset(ids))
+
+def fold_elements(page):
+    """(elementos, classes, ids) acima da dobra: as zonas de FOLD_XPATHS e os seus antepassados"""
+    tags, classes, ids = {'html', 'body'}, set(), set()
+
+    def add(el):
+        if not isinstance(el.tag, str):
+            return
+        tags.add(el.tag.lower())
+        classes.update(el.get('class', '').split())
+        if el.get('id'):
+            ids.add(el.get('id'))
+
+    for xpath in FOLD_XPATHS:
+        for region in page.select(xpath):
+            for el in region.iter():
+                add(el)
+            for el in region.iterancestors():
+                add(el)
+    return tags, classes, ids
+
+@lru_cache(maxsize=None)
+def requirements(prelude):
+    """Requisitos (ver subject) de cada seletor de uma regra; None se algum não tiver restrições"""
+    subjects = tuple(subject(selector) for selector in split_top_level(prelude, ','))
+    return None if None in subjects else subjects
+
+def rule_applies(prelude, fold):
+    """A regra tem algum seletor cujo último seletor simples pode estar acima da dobra"""
+    tags, classes, ids = fold
+    subjects = requirements(prelude)
+    if subjects is None:
+        return True
+    return any((tag is None or tag in tags) and needed_classes <= classes and needed_ids <= ids
+               for tag, needed_classes, needed_ids in subjects)
+
+def critical_statements(statements, fold):
+    """Regras de uma lista de instruções CSS que se aplicam acima da dobra, pela ordem original"""
+    kept = []
+    for statement in statements:
+        brace = statement.find('{')
+        if brace < 0:
+            continue
+        prelude = statement[:brace].strip()
+        if prelude.startswith('@'):
+            if re.match(r'@(?:media|supports)\b', prelude):
+                inner = critical_statements(split_statements(statement[brace + 1:statement.rfind('}')]), fold)
+                if inner:
+                    kept.append(f"{prelude}{{{''.join(inner)}}}")
+            elif KEYFRAMES_RE.match(prelude):
+                kept.append(statement)
+            continue
+        if rule_applies(prelude, fold):
+            kept.append(statement)
+    return kept
+
+def used_keyframes(statements):
+    names = set()
+    for statement in statements:
+        for value in ANIMATION_RE.findall(statement):
+            names.update(re.findall(r'[\w-]+', value))
+    return names
+
+def stylesheet_statements(css):
+    """Instruções de uma folha, minificadas (ver guide_styles.split_statements)"""
+    return [statement for statement in (minify_css(statement) for statement in split_statements(css)) if statement]
+
+def critical_css(sheets, fold):
+    """
+    CSS crítico de várias folhas (listas de instruções), minificado; as
+    @keyframes só entram se forem usadas
+    """
+    kept = critical_statements([statement for statements in sheets for statement in statements], fold)
+    keyframes = used_keyframes(kept)
+    return ''.join(statement for statement in kept
+                   if not KEYFRAMES_RE.match(statement) or KEYFRAMES_RE.match(statement).group(1) in keyframes)
+
+def async_links(page):
+    """<link> das folhas que podem carregar sem bloquear"""
+    return [link for link in page.select('//head/link[@rel="stylesheet"][@href]')
+            if ASYNC_HREF_RE.search(link.get('href'))]
+
+def restore_blocking(page):
+    """Desfaz inline_critical(): tira o <style> crítico e o <noscript> e volta a bloquear nas folhas"""
+    # Os dois foram inseridos com um tail próprio: saem com ele
+    for el in page.select(f'//head/style[@id="{CRITICAL_ID}"] | //head/noscript[@id="{FALLBACK_ID}"]'):
+        el.getparent().remove(el)
+    for link in page.select(f'//head/link[@rel="stylesheet"][@media="{ASYNC_MEDIA}"][@onload]'):
+        del link.attrib['media']
+        del link.attrib['onload']
+
+def read_stylesheet(href, page_path, cache):
+    """Instruções de uma folha local (None se não existir); cada folha é lida uma vez"""
+    path = os.path.normpath(os.path.join(os.path.dirname(page_path), href))
+    if path not in cache:
+        cache[path] = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                css = f.read()
+            cache[path] = (stylesheet_statements(css), len(css.encode('utf-8')))
+    return cache[path]
+
+def inline_critical_page(page, page_path, cache):
+    """
+    Põe o CSS crítico no guia e faz as folhas carregarem sem bloquear.
+    Devolve (bytes críticos, bytes das folhas que bloqueavam).
+    """
+    restore_blocking(page)
+    links = [link for link in async_links(page) if read_stylesheet(link.get('href'), page_path, cache) is not None]
+    if not links:
+        return 0, 0
+    sheets = [read_stylesheet(link.get('href'), page_path, cache) for link in links]
+    css = critical_css([statements for statements, _ in sheets], fold_elements(page))
+
+    first = links[0]
+    style = page.new('style', css, first.tail, id=CRITICAL_ID)
+    first.addprevious(style)
+    fallback = page.new('noscript', None, links[-1].tail, id=FALLBACK_ID)
+    for link in links:
+        fallback.append(page.new('link', rel='stylesheet', href=link.get('href')))
+        link.set('media', ASYNC_MEDIA)
+        link.set('onload', ASYNC_ONLOAD)
+    links[-1].addnext(fallback)
+    return len(css.encode('utf-8')), sum(size for _, size in sheets)
+
+def template_name(page):
+    """Template de que o guia veio, pelas marcas do cabeçalho"""
+    if page.first(f"//*[{has_class('header-premium')}]") is not None:
+        return 'premium'
+    if page.first(f"//*[{has_class('premium-header')}]") is not None:
+        return 'ultra-premium' if page.first('//aside') is not None else 'estrutura'
+    return 'outro'
+
+def inline_critical(guide_paths, memo=None):
+    """
+    Aplica inline_critical_page a todos os guias. Devolve (guias alterados,
+    relatório: uma entrada por guia). memo ({caminho: [hash, entrada]}, ver
+    build_guides.py) guarda os guias que a etapa deixou como estavam, que
+    da próxima vez, se chegarem iguais, não precisam de ser lidos como HTML.
+    """
+    memo = {} if memo is None else memo
+    unchanged = {}
+    cache = {}
+    changed = []
+    report = []
+    for path in guide_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        digest = text_hash(source)
+        known = memo.get(path)
+        if known and known[0] == digest:
+            report.append(known[1])
+            unchanged[path] = known
+            continue
+        page = Page(source)
+        critical, blocking = inline_critical_page(page, path, cache)
+        html = page.serialize()
+        entry = {'page': path, 'template': template_name(page), 'critical_bytes': critical,
+                 'blocking_bytes': blocking}
+        if html != source:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            changed.append(path)
+        else:
+            unchanged[path] = [digest, entry]
+        report.append(entry)
+    memo.clear()
+    memo.update(unchanged)
+    return changed, report
+
+def render_template(template):
+    """HTML de um template com os campos vazios"""
+    return string.Formatter().vformat(template, (), defaultdict(str))
+
+def template_report():
+    """
+    CSS crítico de cada template, só com o seu CSS embutido e a folha do
+    Tailwind dos guias: [{'template', 'critical_bytes', 'css_bytes'}]
+    """
+    path = stylesheet_path()
+    tailwind = ''
+    if path is not None:
+        with open(path, 'r', encoding='utf-8') as f:
+            tailwind = f.read()
+    report = []
+    for name, module_name, attribute in TEMPLATES:
+        page = Page(render_template(getattr(importlib.import_module(module_name), attribute)))
+        sheets = [tailwind] + [style.text or '' for style in page.select('//head/style')]
+        css = critical_css([stylesheet_statements(sheet) for sheet in sheets], fold_elements(page))
+        report.append({'template': name, 'critical_bytes': len(css.encode('utf-8')),
+                       'css_bytes': sum(len(sheet.encode('utf-8')) for sheet in sheets)})
+    return report
+
+def print_report(report, templates=None):
+    print("\n🩸 CSS crítico (acima da dobra, embutido; o resto carrega sem bloquear):")
+    if templates:
+        print(f"   {'Template':<16}{'Crítico':>10}{'CSS total':>12}")
+        for entry in templates:
+            print(f"   {entry['template']:<16}{entry['critical_bytes'] / 1024:>8.1f}KB{entry['css_bytes'] / 1024:>10.1f}KB")
+    groups = {}
+    for entry in report:
+        if entry['blocking_bytes']:
+            groups.setdefault(entry['template'], []).append(entry)
+    if groups:
+        print(f"   {'Guias':<16}{'Crítico':>10}{'Bloqueava':>12}")
+    for name, entries in sorted(groups.items()):
+        critical = sum(entry['critical_bytes'] for entry in entries) / len(entries)
+        blocking = sum(entry['blocking_bytes'] for entry in entries) / len(entries)
+        print(f"   {f'{name} ({len(entries)})':<16}{critical / 1024:>8.1f}KB{blocking / 1024:>10.1f}KB  (média por guia)")
+
+def main():
+    with in_deploy():
+        guides = find_guides()
+        print(f"🔄 A embutir o CSS crítico de {len(guides)} guias...\n")
+        changed, report = inline_critical(guides)
+        for path in changed:
+            parts = path.split('/')
+            print(f"  ✅ {parts[1]}/{parts[2]}")
+        print_report(report, template_report())
+
+if __name__ == '__main__':
+    main()
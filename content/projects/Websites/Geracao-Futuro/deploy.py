@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cópia publicada do site
+- O repositório é a origem e serve-se tal como está: o hub (index.html)
+  lê o catalog.json, os guias e o hub usam o Tailwind do CDN e as
+  apresentações o seu bundle Vite
+- O build só escreve na origem o que é gerado a partir dos Word (guias,
+  catalog.json, URLS.txt, README.txt); as etapas de publicação (CSS e
+  runtime partilhados, fontes, imagens, Tailwind estático, CSS crítico,
+  dicas de prefetch, minificação, service worker, pré-compressão)
+  reescrevem uma cópia das páginas em dist/, que é o que se publica
+- Só copia os ficheiros novos ou alterados desde a última cópia (o hash de
+  cada um fica no manifesto do build, ver build_manifest.py) e apaga de
+  dist/ os que saíram da origem
+- As etapas trabalham com caminhos relativos (resources/moduloN/...): os
+  scripts de publicação correm dentro de dist/ (in_deploy)
+- ASSETS_DIR: ficheiros gerados, com o hash do conteúdo no nome (folhas de
+  estilo, runtime dos guias, catálogo, índice de pesquisa, fontes e
+  variantes das imagens); todas as etapas que escrevem ou leem estes
+  ficheiros usam esta pasta
+"""
+
+import glob
+import os
+import shutil
+from contextlib import contextmanager
+
+from build_manifest import cached_hash
+
+DEPLOY_DIR = 'dist'
+ASSETS_DIR = 'assets'
+DEPLOY_GENERATOR = 'deploy'
+
+# Ficheiros da origem que vão para o site publicado
+SOURCE_GLOBS = [
+    'index.html',
+    'catalog.json',
+    'modulo*/sessao*/index.html',
+    'modulo*/sessao*/assets/*',
+    'resources/modulo*/*.html',
+    'resources/modulo*/*.docx',
+    'covers/*',
+]
+
+def source_files():
+    """Ficheiros da origem a publicar, pela ordem de SOURCE_GLOBS"""
+    files = []
+    for pattern in SOURCE_GLOBS:
+        for path in sorted(glob.glob(pattern)):
+            if os.path.isfile(path):
+                files.append(path.replace(os.sep, '/'))
+    return files
+
+def deploy_path(path):
+    """Caminho, desde a origem, da cópia publicada de um ficheiro"""
+    return f"{DEPLOY_DIR}/{path}"
+
+def source_path(path):
+    """Caminho de um ficheiro da origem visto de dentro de dist/ (ex.: fonts/)"""
+    return os.path.join(os.path.relpath(os.curdir, DEPLOY_DIR), path)
+
+def sync_deploy(manifest, force=False, hashes=None):
+    """
+    Copia para dist/ os ficheiros da origem novos ou alterados (todos, com
+    force) e apaga os que saíram da origem; regista cada cópia no manifesto.
+    hashes é a cache de build_manifest.cached_hash. Devolve {'copied',
+    'removed'}, com caminhos relativos à origem.
+    """
+    hashes = {} if hashes is None else hashes
+    sources = source_files()
+    copied = []
+    for path in sources:
+        target = deploy_path(path)
+        digest = cached_hash(path, hashes)
+        previous = manifest.get(target)
+        if not force and previous and previous.get('source') == digest and os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+        manifest[target] = {'generator': DEPLOY_GENERATOR, 'source': digest}
+        copied.append(path)
+
+    published = {deploy_path(path) for path in sources}
+    removed = []
+    for target, entry in list(manifest.items()):
+        if entry.get('generator') == DEPLOY_GENERATOR and target not in published:
+            if os.path.exists(target):
+                os.remove(target)
+            del manifest[target]
+            removed.append(target[len(DEPLOY_DIR) + 1:])
+    return {'copied': copied, 'removed': removed}
+
+@contextmanager
+def in_deploy():
+    """Corre o bloco dentro de dist/ (os caminhos das etapas são relativos)"""
+    if not os.path.isdir(DEPLOY_DIR):
+        raise SystemExit(f"❌ {DEPLOY_DIR}/ não existe: corra primeiro python3 build_guides.py")
+    cwd = os.getcwd()
+    os.chdir(DEPLOY_DIR)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+def print_report(report):
+    print(f"\n🚚 Cópia publicada em {DEPLOY_DIR}/: {len(report['copied'])} ficheiros copiados da origem"
+          + (f", {len(report['removed'])} apagados" if report['removed'] else ''))
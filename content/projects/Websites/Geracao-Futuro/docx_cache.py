@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Camada de documentos Word já analisados
+- Cada docx é aberto e analisado uma única vez (com o leitor em streaming de
+  docx_reader.py): título, parágrafos, estilos e formatação das runs saem
+  todos da mesma passagem
+- O resultado fica em cache no disco (.cache/docx/<hash>.json), indexado pelo
+  hash do ficheiro, e é partilhado por todos os scripts
+- Um docx que não mudou nunca volta a ser analisado
+"""
+
+import json
+import os
+
+from build_manifest import file_hash
+from docx_reader import read_paragraphs
+
+CACHE_DIR = os.path.join('.cache', 'docx')
+
+# Versão do formato dos registos em cache; incrementar sempre que
+# parse_docx passar a extrair algo diferente
+CACHE_VERSION = 1
+
+# Documentos já carregados neste processo, por hash
+_memory = {}
+
+def find_session_title(paragraphs, limit=10):
+    """Procura o título da sessão nos primeiros parágrafos (None se não houver)"""
+    for para in paragraphs[:limit]:
+        if "Sessão" in para['text']:
+            return para['text'].strip().replace("📘", "").replace("Atividade Assíncrona", "").strip()
+    return None
+
+def parse_docx(docx_path):
+    """
+    Analisa um docx numa única passagem e devolve um registo simples:
+    {'title': ..., 'paragraphs': [{'text', 'style', 'runs': [[texto, negrito], ...]}]}
+    """
+    paragraphs = read_paragraphs(docx_path)
+    return {
+        'version': CACHE_VERSION,
+        'title': find_session_title(paragraphs),
+        'paragraphs': paragraphs,
+    }
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    """Caminho do registo em cache para um hash de docx"""
+    return os.path.join(cache_dir, f"{digest}.json")
+
+def read_cache(path, version):
+    """Lê um registo em cache (None se não existir, estiver corrompido ou for de outra versão)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != version:
+        return None
+    return data
+
+def write_cache(path, data):
+    """Grava um registo em cache, de forma atómica (vários workers podem escrever o mesmo)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_document(docx_path, digest=None):
+    """Devolve o documento analisado, a partir da cache sempre que possível"""
+    digest = digest or file_hash(docx_path)
+    if digest in _memory:
+        return _memory[digest]
+
+    path = cache_path(digest)
+    document = read_cache(path, CACHE_VERSION)
+    if document is None:
+        document = parse_docx(docx_path)
+        write_cache(path, document)
+
+    _memory[digest] = document
+    return document
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Leitor rápido de documentos Word
+- Abre o docx como zip e lê word/document.xml em streaming (iterparse)
+- Resolve os estilos (styles.xml) uma única vez por documento
+- Devolve registos simples por parágrafo, sem criar os objetos do python-docx
+- Reproduz exatamente o que o python-docx devolve em doc.paragraphs:
+  para.text (incluindo hiperligações), para.style.name e, para cada run,
+  run.text e run.bold
+
+Uso:
+    python3 docx_reader.py --verify   # compara com o python-docx em todos os docx de resources/
+    python3 docx_reader.py --bench    # mede o tempo dos dois leitores
+"""
+
+import argparse
+import glob
+import posixpath
+import time
+import zipfile
+
+from lxml import etree
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+OFFICE_DOCUMENT_REL = 'officeDocument'
+STYLES_REL = 'styles'
+
+# Nomes internos que o Word mostra com outro nome (BabelFish do python-docx)
+UI_STYLE_NAMES = {
+    'caption': 'Caption',
+    'footer': 'Footer',
+    'header': 'Header',
+    **{f'heading {n}': f'Heading {n}' for n in range(1, 10)},
+}
+
+# Texto equivalente dos elementos de uma run, como em run.text
+RUN_TEXT = {
+    W + 'tab': '\t',
+    W + 'ptab': '\t',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-',
+}
+
+def _on_off(value):
+    """Valor de um atributo ST_OnOff (ausente = verdadeiro)"""
+    return value is None or value in ('1', 'true', 'on')
+
+def _relationship_target(zf, rels_path, rel_type, base_dir):
+    """Caminho no zip do primeiro alvo de um tipo de relação, ou None"""
+    if rels_path not in zf.namelist():
+        return None
+    root = etree.fromstring(zf.read(rels_path))
+    for rel in root.iter(REL + 'Relationship'):
+        if rel.get('Type', '').rsplit('/', 1)[-1] == rel_type and rel.get('TargetMode') != 'External':
+            target = rel.get('Target')
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(base_dir, target))
+    return None
+
+def _part_paths(zf):
+    """Localiza o documento principal e a parte de estilos"""
+    document_path = _relationship_target(zf, '_rels/.rels', OFFICE_DOCUMENT_REL, '') or 'word/document.xml'
+    base_dir, name = posixpath.split(document_path)
+    rels_path = posixpath.join(base_dir, '_rels', f'{name}.rels')
+    styles_path = _relationship_target(zf, rels_path, STYLES_REL, base_dir)
+    return document_path, styles_path
+
+def read_styles(zf, styles_path):
+    """
+    Devolve (nomes por id, nome do estilo de parágrafo por omissão)
+    considerando apenas estilos de parágrafo, como para.style
+    """
+    # Sem styles.xml o python-docx usa o seu template, cujo estilo por omissão é "Normal"
+    if styles_path is None or styles_path not in zf.namelist():
+        return {}, 'Normal'
+
+    root = etree.fromstring(zf.read(styles_path))
+    names = {}
+    default_name = None
+    for style in root.iterchildren(W + 'style'):
+        style_id = style.get(W + 'styleId')
+        name_elm = style.find(W + 'name')
+        name = name_elm.get(W + 'val') if name_elm is not None else None
+        name = UI_STYLE_NAMES.get(name, name)
+        is_paragraph = style.get(W + 'type') == 'paragraph'
+        # O python-docx usa o primeiro estilo com cada id
+        if style_id not in names:
+            names[style_id] = (is_paragraph, name)
+        # ...e o último estilo por omissão do tipo
+        if is_paragraph and style.get(W + 'default') is not None and _on_off(style.get(W + 'default')):
+            default_name = name
+
+    paragraph_names = {style_id: name for style_id, (is_paragraph, name) in names.items() if is_paragraph}
+    return paragraph_names, default_name
+
+def _run_text(run):
+    """Texto de uma run, como run.text"""
+    parts = []
+    for child in run.iterchildren():
+        tag = child.tag
+        if tag == W + 't':
+            parts.append(child.text or '')
+        elif tag == W + 'br':
+            br_type = child.get(W + 'type')
+            parts.append('\n' if br_type in (None, 'textWrapping') else '')
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return ''.join(parts)
+
+def _run_bold(run):
+    """Negrito definido diretamente na run, como run.bold (True, False ou None)"""
+    rpr = run.find(W + 'rPr')
+    if rpr is None:
+        return None
+    bold = rpr.find(W + 'b')
+    if bold is None:
+        return None
+    return _on_off(bold.get(W + 'val'))
+
+def _paragraph_record(p, style_names, default_style):
+    """Converte um <w:p> num registo {'text', 'style', 'runs'}"""
+    style_id = None
+    ppr = p.find(W + 'pPr')
+    if ppr is not None:
+        pstyle = ppr.find(W + 'pStyle')
+        if pstyle is not None:
+            style_id = pstyle.get(W + 'val')
+
+    text = []
+    runs = []
+    for child in p.iterchildren(W + 'r', W + 'hyperlink'):
+        if child.tag == W + 'r':
+            run_text = _run_text(child)
+            text.append(run_text)
+            runs.append([run_text, _run_bold(child)])
+        else:
+            # Hiperligações contam para o texto mas não para para.runs
+            text.extend(_run_text(r) for r in child.iterchildren(W + 'r'))
+
+    return {
+        'text': ''.join(text),
+        'style': style_names.get(style_id, default_style) if style_id else default_style,
+        'runs': runs,
+    }
+
+def iter_paragraphs(docx_path):
+    """Percorre em streaming os parágrafos do corpo do documento (doc.paragraphs)"""
+    with zipfile.ZipFile(docx_path) as zf:
+        document_path, styles_path = _part_paths(zf)
+        style_names, default_style = read_styles(zf, styles_path)
+
+        with zf.open(document_path) as f:
+            body = None
+            for event, elem in etree.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if body is None and elem.tag == W + 'body':
+                        body = elem
+                    continue
+                # Só interessam os filhos diretos do corpo; o resto é libertado logo
+                if elem.getparent() is not body or body is None:
+                    continue
+                if elem.tag == W + 'p':
+                    yield _paragraph_record(elem, style_names, default_style)
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del body[0]
+
+def read_paragraphs(docx_path):
+    """Lista de registos de parágrafo de um docx"""
+    return list(iter_paragraphs(docx_path))
+
+def read_paragraphs_python_docx(docx_path):
+    """Mesmos registos, obtidos pelo python-docx (referência para --verify e --bench)"""
+    from docx import Document
+
+    return [
+        {
+            'text': para.text,
+            'style': para.style.name,
+            'runs': [[run.text, run.bold] for run in para.runs],
+        }
+        for para in Document(docx_path).paragraphs
+    ]
+
+def verify(paths):
+    """Confirma que os dois leitores dão exatamente o mesmo resultado"""
+    failures = 0
+    for path in paths:
+        expected = read_paragraphs_python_docx(path)
+        actual = read_paragraphs(path)
+        if actual == expected:
+            print(f"  ✅ {path} ({len(actual)} parágrafos)")
+            continue
+
+        failures += 1
+        print(f"  ❌ {path}: {len(actual)} parágrafos, esperados {len(expected)}")
+        for index, (a, e) in enumerate(zip(actual, expected)):
+            if a != e:
+                print(f"     parágrafo {index}:\n       python-docx: {e!r}\n       leitor:      {a!r}")
+                break
+
+    print(f"\n{'🎉' if not failures else '❌'} {len(paths) - failures}/{len(paths)} documentos idênticos")
+    return failures == 0
+
+def bench(paths, repeat):
+    """Mede o tempo de leitura de todos os docx com cada leitor"""
+    print(f"⏱️  Leitura de {len(paths)} documentos, {repeat} repetições:")
+    results = {}
+    for label, reader in (('python-docx', read_paragraphs_python_docx), ('docx_reader', read_paragraphs)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for path in paths:
+                reader(path)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = best
+        print(f"   {label:<14}{best * 1000:>9.1f}ms{best / len(paths) * 1000:>9.2f}ms/doc")
+    print(f"   {'ganho':<14}{results['python-docx'] / results['docx_reader']:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Leitor rápido de docx: verificação e benchmark")
+    parser.add_argument('--verify', action='store_true', help="Compara com o python-docx em todos os docx")
+    parser.add_argument('--bench', action='store_true', help="Compara o tempo dos dois leitores")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições do benchmark (fica a melhor)")
+    parser.add_argument('paths', nargs='*', help="Documentos a usar (por omissão, resources/**/*.docx)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob('resources/**/*.docx', recursive=True))
+    if not args.verify and not args.bench:
+        parser.error("indique --verify e/ou --bench")
+
+    ok = True
+    if args.verify:
+        ok = verify(paths)
+    if args.bench:
+        print()
+        bench(paths, args.repeat)
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Motor de transformações sobre a árvore dos guias
+- Cada guia é analisado uma única vez para uma árvore (lxml.html)
+- Todas as etapas trabalham sobre essa árvore, com seletores (XPath) e
+  operações de alteração comuns, em vez de regex DOTALL sobre o documento
+- A árvore é serializada uma única vez, no fim, com o registo de etapas
+  (ver stage_ledger.py)
+"""
+
+import html as html_lib
+
+from lxml import html as lxml_html
+
+from stage_ledger import LEDGER_RE, applied_stages, stamp
+
+DOCTYPE = '<!DOCTYPE html>'
+
+# Elementos cujo conteúdo não é texto da página
+RAW_TEXT_TAGS = ('script', 'style')
+
+# Elementos em que os espaços do texto contam
+PREFORMATTED_TAGS = ('pre', 'textarea')
+
+def has_class(class_name):
+    """Condição XPath para elementos com uma classe"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+class Page:
+    """Guia analisado: árvore do documento e registo das etapas aplicadas"""
+
+    __slots__ = ('root', 'stages')
+
+    def __init__(self, source):
+        self.stages = applied_stages(source)
+        self.root = lxml_html.document_fromstring(LEDGER_RE.sub('', source, count=1))
+
+    def replace(self, source):
+        """Substitui o documento inteiro (etapas que regeneram a página a partir de um template)"""
+        self.stages.update(applied_stages(source))
+        self.root = lxml_html.document_fromstring(LEDGER_RE.sub('', source, count=1))
+
+    def serialize(self):
+        """HTML final, com DOCTYPE e registo de etapas"""
+        html = lxml_html.tostring(self.root, encoding='unicode', method='html', doctype=DOCTYPE)
+        return stamp(html, self.stages) if self.stages else html
+
+    # Seleção
+
+    def select(self, xpath, context=None):
+        """Todos os elementos que correspondem a uma expressão XPath"""
+        return (self.root if context is None else context).xpath(xpath)
+
+    def first(self, xpath, context=None):
+        """Primeiro elemento que corresponde a uma expressão XPath (ou None)"""
+        found = self.select(xpath, context)
+        return found[0] if found else None
+
+    def by_class(self, class_name, tag='*', context=None):
+        """Elementos com uma classe, pela ordem do documento"""
+        return self.select(f".//{tag}[{has_class(class_name)}]", context)
+
+    def text_nodes(self):
+        """
+        Percorre os textos visíveis da página como (elemento, atributo), onde
+        atributo é 'text' ou 'tail'; o conteúdo de <script> e <style> fica de
+        fora, tal como o de <pre> e <textarea>, onde os espaços contam
+        """
+        preformatted = {el for pre in self.root.iter(*PREFORMATTED_TAGS) for el in pre.iter()}
+        for el in self.root.iter():
+            in_pre = el.getparent() in preformatted if preformatted else False
+            if not isinstance(el.tag, str):
+                # Comentários: só o texto a seguir conta
+                if el.tail and not in_pre:
+                    yield el, 'tail'
+                continue
+            if el.text and el.tag not in RAW_TEXT_TAGS and el not in preformatted:
+                yield el, 'text'
+            if el.tail and not in_pre:
+                yield el, 'tail'
+
+    # Alteração
+
+    @staticmethod
+    def new(tag, text=None, tail=None, **attrs):
+        """Cria um elemento com texto (escapado automaticamente) e atributos"""
+        el = lxml_html.Element(tag, **{name.rstrip('_'): value for name, value in attrs.items()})
+        el.text = text
+        el.tail = tail
+        return el
+
+    @staticmethod
+    def fragment(markup):
+        """Analisa um fragmento de HTML: devolve (texto inicial, elementos)"""
+        container = lxml_html.fragment_fromstring(markup, create_parent='div')
+        return container.text or '', list(container)
+
+    @staticmethod
+    def inner_html(el):
+        """HTML do conteúdo de um elemento"""
+        parts = [html_lib.escape(el.text or '', quote=False)]
+        parts.extend(lxml_html.tostring(child, encoding='unicode', method='html') for child in el)
+        return ''.join(parts)
+
+    def set_inner_html(self, el, markup):
+        """Substitui o conteúdo de um elemento por um fragmento de HTML"""
+        text, nodes = self.fragment(markup)
+        for child in list(el):
+            el.remove(child)
+        el.text = text
+        el.extend(nodes)
+
+    def insert_before(self, el, markup_or_element):
+        """Insere HTML (ou um elemento) imediatamente antes de um elemento"""
+        text, nodes = self._nodes(markup_or_element)
+        previous = el.getprevious()
+        parent = el.getparent()
+        if text:
+            if previous is not None:
+                previous.tail = (previous.tail or '') + text
+            else:
+                parent.text = (parent.text or '') + text
+        index = parent.index(el)
+        for offset, node in enumerate(nodes):
+            parent.insert(index + offset, node)
+
+    def insert_after(self, el, markup_or_element):
+        """Insere HTML (ou um elemento) imediatamente depois de um elemento, antes do seu texto final"""
+        text, nodes = self._nodes(markup_or_element)
+        parent = el.getparent()
+        tail = el.tail or ''
+        el.tail = text or None
+        index = parent.index(el)
+        for offset, node in enumerate(nodes, 1):
+            parent.insert(index + offset, node)
+        if nodes:
+            nodes[-1].tail = (nodes[-1].tail or '') + tail or None
+        else:
+            el.tail = text + tail or None
+
+    def replace_with(self, el, markup_or_element):
+        """Substitui um elemento por HTML (ou por outro elemento), mantendo o texto seguinte"""
+        self.insert_before(el, markup_or_element)
+        self.remove(el)
+
+    @staticmethod
+    def remove(el):
+        """Remove um elemento e o seu conteúdo, mantendo o texto que vem a seguir"""
+        el.drop_tree()
+
+    @staticmethod
+    def add_class(el, class_name):
+        """Acrescenta uma classe a um elemento, se ainda não a tiver"""
+        classes = el.get('class', '').split()
+        if class_name not in classes:
+            el.set('class', ' '.join(classes + [class_name]))
+
+    def _nodes(self, markup_or_element):
+        if isinstance(markup_or_element, str):
+            return self.fragment(markup_or_element)
+        return '', [markup_or_element]
+
+    # CSS
+
+    def styles(self):
+        """Elementos <style> da página"""
+        return self.select('//style')
+
+    def css(self):
+        """Todo o CSS embutido na página"""
+        return '\n'.join(style.text or '' for style in self.styles())
+
+    def insert_css(self, css, marker):
+        """
+        Insere CSS antes de um comentário de referência (/* Dividers */), em
+        todos os <style> que o tenham. O comentário fica na forma /*! … */,
+        que a minificação do CSS mantém (ver html_minify.py): uma página já
+        minificada continua a aceitar a inserção
+        """
+        kept = marker.replace('/*', '/*!', 1)
+        for style in self.styles():
+            text = style.text
+            if text and (marker in text or kept in text):
+                style.text = text.replace(kept, marker).replace(marker, css + '\n        ' + kept)
+
+def run_page_stage(page, name, version, transform):
+    """
+    Aplica uma etapa à árvore se ainda não estiver registada nesta versão e
+    regista-a. Devolve True se a etapa foi aplicada.
+    """
+    if page.stages.get(name) == version:
+        return False
+    transform(page)
+    page.stages[name] = version
+    return True
+
+def transform_html(source, transform):
+    """Aplica uma transformação de árvore a um HTML (uso pelos scripts isolados)"""
+    page = Page(source)
+    transform(page)
+    return page.serialize()
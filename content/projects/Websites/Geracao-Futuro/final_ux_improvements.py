@@ -9,7 +9,12 @@ Melhorias finais de UI/UX para todos os guias:
 """
 
 import glob
-import re
+
+from dom_transform import transform_html
+from stage_ledger import run_stage
+
+STAGE_NAME = 'final_ux'
+STAGE_VERSION = 2
 
 # CSS de melhorias finais UI/UX
 FINAL_UX_IMPROVEMENTS = """
@@ -155,63 +160,74 @@ FINAL_UX_IMPROVEMENTS = """
         }
 """
 
-# Script principal
-guides = glob.glob('resources/modulo*/sessao*-guia.html') + glob.glob('resources/modulo*/estrutura-guia.html')
-print(f"🎨 Aplicando melhorias finais de UI/UX em {len(guides)} guias...\n")
+def apply_final_ux_page(page):
+    """Aplica as melhorias finais de UI/UX a um guia já analisado"""
+    # Adiciona CSS de melhorias se não existir
+    if 'MELHORIAS FINAIS UI/UX' not in page.css():
+        # Insere no fim de cada <style>
+        for style in page.styles():
+            style.text = (style.text or '') + FINAL_UX_IMPROVEMENTS + '\n    '
+    
+    # Melhora acessibilidade de imagens (se houver)
+    for img in page.select('//img[not(@loading)]'):
+        img.set('loading', 'lazy')
+    
+    # Espaçamento consistente em listas
+    for list_el in page.select('//ul | //ol'):
+        page.add_class(list_el, 'space-y-3')
+    
+    # Melhora parágrafos vazios
+    for p in page.select('//p[not(@*) and not(*)]'):
+        if not (p.text or '').strip():
+            page.remove(p)
+    
+    # Adiciona ARIA labels aos botões principais
+    back_link = page.first('//a[contains(., "Voltar ao Hub")]')
+    if back_link is not None and back_link.get('aria-label') is None:
+        back_link.set('aria-label', 'Voltar para o hub principal')
+
+def apply_final_ux(content):
+    """Aplica as melhorias finais de UI/UX a um guia"""
+    return transform_html(content, apply_final_ux_page)
 
-improved = 0
-for guide_path in guides:
-    try:
-        with open(guide_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original = content
-        
-        # Adiciona CSS de melhorias se não existir
-        if 'MELHORIAS FINAIS UI/UX' not in content:
-            # Insere antes do fechamento de </style>
-            content = content.replace('</style>', f'{FINAL_UX_IMPROVEMENTS}\n    </style>')
-        
-        # Melhora acessibilidade de imagens (se houver)
-        content = re.sub(r'<img([^>]*)>', r'<img\1 loading="lazy">', content)
-        
-        # Adiciona lang em listas quando apropriado
-        content = re.sub(r'<ul([^>]*)>', r'<ul\1 class="space-y-3">', content)
-        content = re.sub(r'<ol([^>]*)>', r'<ol\1 class="space-y-3">', content)
-        
-        # Melhora parágrafos vazios
-        content = re.sub(r'<p>\s*</p>', '', content)
-        
-        # Adiciona ARIA labels aos botões principais
-        if 'Voltar ao Hub' in content and 'aria-label' not in content.split('Voltar ao Hub')[0][-100:]:
-            content = re.sub(
-                r'(<a[^>]*>.*?Voltar ao Hub)',
-                r'<a aria-label="Voltar para o hub principal"\1',
-                content,
-                count=1
-            )
-        
-        if content != original:
-            with open(guide_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+def main():
+    # Script principal
+    guides = glob.glob('resources/modulo*/sessao*-guia.html') + glob.glob('resources/modulo*/estrutura-guia.html')
+    print(f"🎨 Aplicando melhorias finais de UI/UX em {len(guides)} guias...\n")
+    
+    improved = 0
+    for guide_path in guides:
+        try:
+            with open(guide_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            original = content
+            content, _ = run_stage(content, STAGE_NAME, STAGE_VERSION, apply_final_ux)
             
-            improved += 1
-            parts = guide_path.split('/')
-            print(f"  ✅ {parts[1]}/{parts[2]}")
+            if content != original:
+                with open(guide_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                
+                improved += 1
+                parts = guide_path.split('/')
+                print(f"  ✅ {parts[1]}/{parts[2]}")
+        
+        except Exception as e:
+            print(f"  ❌ Erro: {e}")
     
-    except Exception as e:
-        print(f"  ❌ Erro: {e}")
+    print(f"\n🎉 {improved} guias melhorados!")
+    print("\n✨ Melhorias aplicadas:")
+    print("   • Scrollbar customizada")
+    print("   • Focus states para acessibilidade")
+    print("   • Contraste de texto melhorado")
+    print("   • Links com hover effects")
+    print("   • Espaçamento consistente")
+    print("   • Listas mais legíveis")
+    print("   • Responsividade mobile otimizada")
+    print("   • Transições suaves")
+    print("   • Print styles")
+    print("   • Loading lazy de imagens")
+    print("   • ARIA labels")
 
-print(f"\n🎉 {improved} guias melhorados!")
-print("\n✨ Melhorias aplicadas:")
-print("   • Scrollbar customizada")
-print("   • Focus states para acessibilidade")
-print("   • Contraste de texto melhorado")
-print("   • Links com hover effects")
-print("   • Espaçamento consistente")
-print("   • Listas mais legíveis")
-print("   • Responsividade mobile otimizada")
-print("   • Transições suaves")
-print("   • Print styles")
-print("   • Loading lazy de imagens")
-print("   • ARIA labels")
+if __name__ == '__main__':
+    main()
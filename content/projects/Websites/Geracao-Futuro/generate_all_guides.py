@@ -3,9 +3,14 @@
 Script COMPLETO para gerar todos os guias HTML a partir dos arquivos Word
 """
 
-from docx import Document
+import argparse
 import os
-import re
+
+from build_manifest import (PIPELINE_VERSION, check_output, fingerprint, load_manifest,
+                            record_output, save_manifest, text_hash)
+from keyword_classifier import classify
+from parallel_build import add_workers_argument, run_jobs
+from session_ir import LIST_KINDS, ORDERED_ITEM, SUBHEADING, list_item_text, load_session
 
 # Template HTML base
 HTML_TEMPLATE = """<!DOCTYPE html>
@@ -85,65 +90,53 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>"""
 
-def process_word_to_html(docx_path):
-    """Extrai conteúdo do Word e converte para HTML"""
-    doc = Document(docx_path)
+def render_content(session):
+    """Converte a IR de uma sessão em HTML"""
     html_parts = []
     current_list = None
     
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text or text == "":
-            continue
-        
-        # Detecta títulos (negrito ou Heading)
-        is_heading = para.style.name.startswith('Heading') or (para.runs and any(run.bold and len(run.text.strip()) > 5 for run in para.runs))
-        
-        if is_heading:
-            # Fecha lista se aberta
-            if current_list:
-                html_parts.append(f"</{current_list}>")
-                current_list = None
-            
-            # Adiciona ícone baseado no conteúdo
-            icon = "📝"
-            if any(kw in text.lower() for kw in ['objetivo', 'competência']): icon = "🎯"
-            elif any(kw in text.lower() for kw in ['material', 'recurso']): icon = "📦"
-            elif any(kw in text.lower() for kw in ['preparação', 'antes']): icon = "🔧"
-            elif any(kw in text.lower() for kw in ['atividade', 'exercício', 'dinâmica']): icon = "🚀"
-            elif any(kw in text.lower() for kw in ['avaliação']): icon = "📊"
-            
-            level = 'h2' if 'Sessão' not in text else 'h3'
-            html_parts.append(f"<{level}>{icon} {text}</{level}>")
+    def close_list():
+        nonlocal current_list
+        if current_list:
+            html_parts.append(f"</{current_list}>")
+            current_list = None
+    
+    for section in session.sections:
+        if section.title is not None:
+            close_list()
+            html_parts.append(f"<h2>{section.icon} {section.title}</h2>")
         
-        # Detecta listas
-        elif text.startswith('•') or text.startswith('-') or re.match(r'^\d+[\.)]\s', text):
-            list_type = 'ol' if re.match(r'^\d+[\.)]\s', text) else 'ul'
+        for kind, text in section.blocks():
+            if kind == SUBHEADING:
+                close_list()
+                html_parts.append(f"<h3>{classify(text).heading_icon} {text}</h3>")
             
-            if current_list != list_type:
-                if current_list:
-                    html_parts.append(f"</{current_list}>")
-                html_parts.append(f"<{list_type} class='list-disc'>")
-                current_list = list_type
+            # Listas
+            elif kind in LIST_KINDS:
+                list_type = 'ol' if kind == ORDERED_ITEM else 'ul'
+                
+                if current_list != list_type:
+                    if current_list:
+                        html_parts.append(f"</{current_list}>")
+                    html_parts.append(f"<{list_type} class='list-disc'>")
+                    current_list = list_type
+                
+                html_parts.append(f"<li>{list_item_text(text)}</li>")
             
-            clean_text = re.sub(r'^[•\-\d+\.)]\s*', '', text)
-            html_parts.append(f"<li>{clean_text}</li>")
-        
-        else:
-            # Fecha lista se aberta
-            if current_list:
-                html_parts.append(f"</{current_list}>")
-                current_list = None
-            
-            # Parágrafo normal
-            html_parts.append(f"<p>{text}</p>")
+            else:
+                close_list()
+                # Parágrafo normal
+                html_parts.append(f"<p>{text}</p>")
     
     # Fecha lista final se necessário
-    if current_list:
-        html_parts.append(f"</{current_list}>")
+    close_list()
     
     return "\n".join(html_parts)
 
+def process_word_to_html(docx_path):
+    """Extrai conteúdo do Word e converte para HTML"""
+    return render_content(load_session(docx_path))
+
 # Mapeia arquivos Word para módulos/sessões
 word_files = {
     1: [
@@ -186,56 +179,100 @@ word_files = {
     ]
 }
 
-# Processa todos os arquivos
-total_created = 0
-total_errors = 0
+def render_session(module_num, word_filename, session_num):
+    """Gera o HTML completo de uma sessão a partir do Word"""
+    docx_path = f"resources/modulo{module_num}/{word_filename}"
+    
+    # Extrai conteúdo e título da IR
+    session = load_session(docx_path)
+    content_html = render_content(session)
+    session_title = session.title or f"Sessão {session_num}"
+    
+    # Gera HTML final
+    html = HTML_TEMPLATE.format(
+        session_title=session_title,
+        module_title=f"Módulo {module_num}",
+        module_num=module_num,
+        session_num=session_num,
+        content=content_html,
+        word_filename=word_filename
+    )
+    
+    return session_title, html
 
-for module_num, sessions in word_files.items():
-    print(f"\n📚 Processando Módulo {module_num}...")
+def main():
+    parser = argparse.ArgumentParser(description="Gera os guias HTML a partir dos arquivos Word")
+    parser.add_argument('--force', action='store_true', help="Reconstrói todos os guias, mesmo sem alterações")
+    parser.add_argument('--explain', action='store_true', help="Explica porque cada guia foi ou não reconstruído")
+    add_workers_argument(parser)
+    args = parser.parse_args()
     
-    for word_filename, session_num in sessions:
-        docx_path = f"resources/modulo{module_num}/{word_filename}"
-        output_path = f"resources/modulo{module_num}/sessao{session_num}-guia.html"
-        
-        if not os.path.exists(docx_path):
-            print(f"  ⚠️  Arquivo não encontrado: {word_filename}")
-            total_errors += 1
-            continue
-        
-        try:
-            # Extrai conteúdo
-            content_html = process_word_to_html(docx_path)
-            
-            # Extrai título
-            doc = Document(docx_path)
-            session_title = f"Sessão {session_num}"
-            for para in doc.paragraphs[:10]:
-                if "Sessão" in para.text:
-                    session_title = para.text.strip().replace("📘", "").replace("Atividade Assíncrona", "").strip()
-                    break
-            
-            # Gera HTML final
-            html = HTML_TEMPLATE.format(
-                session_title=session_title,
-                module_title=f"Módulo {module_num}",
-                module_num=module_num,
-                session_num=session_num,
-                content=content_html,
-                word_filename=word_filename
-            )
+    manifest = load_manifest()
+    template_hash = text_hash(HTML_TEMPLATE)
+    
+    # Processa todos os arquivos
+    total_created = 0
+    total_skipped = 0
+    total_errors = 0
+    
+    # Decide primeiro o que precisa de ser reconstruído
+    jobs = []
+    pending = {}
+    for module_num, sessions in word_files.items():
+        for word_filename, session_num in sessions:
+            docx_path = f"resources/modulo{module_num}/{word_filename}"
+            output_path = f"resources/modulo{module_num}/sessao{session_num}-guia.html"
             
-            # Salva arquivo
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            if not os.path.exists(docx_path):
+                print(f"  ⚠️  Arquivo não encontrado: {word_filename}")
+                total_errors += 1
+                continue
             
-            print(f"  ✅ {session_title}")
-            total_created += 1
+            # Só reconstrói se o Word, o template ou o pipeline mudaram
+            current = fingerprint('generate_all_guides', docx_path, template_hash, PIPELINE_VERSION)
+            needed, reason = check_output(manifest, output_path, current)
+            if not needed and not args.force:
+                if args.explain:
+                    print(f"  ⏭️  {output_path}: {reason}")
+                total_skipped += 1
+                continue
             
-        except Exception as e:
-            print(f"  ❌ Erro em {word_filename}: {e}")
+            job = (module_num, word_filename, session_num)
+            jobs.append(job)
+            pending[job] = (output_path, current, reason if needed else 'forçado')
+    
+    # Converte em paralelo; os resultados chegam pela ordem dos jobs
+    current_module = None
+    for job, result, error in run_jobs(render_session, jobs, args.workers):
+        module_num, word_filename, session_num = job
+        output_path, current, reason = pending[job]
+        
+        if module_num != current_module:
+            print(f"\n📚 Processando Módulo {module_num}...")
+            current_module = module_num
+        
+        if error is not None:
+            print(f"  ❌ Erro em {word_filename}: {error}")
             total_errors += 1
+            continue
+        
+        session_title, html = result
+        
+        # Salva arquivo
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        record_output(manifest, output_path, current)
+        
+        print(f"  ✅ {session_title}" + (f" ({reason})" if args.explain else ""))
+        total_created += 1
+    
+    save_manifest(manifest)
+    
+    print(f"\n\n🎉 Concluído!")
+    print(f"   ✅ {total_created} guias criados com sucesso")
+    print(f"   ⏭️  {total_skipped} guias sem alterações")
+    print(f"   ❌ {total_errors} erros")
+    print(f"\n💡 Acesse http://localhost:3000 e teste os guias!")
 
-print(f"\n\n🎉 Concluído!")
-print(f"   ✅ {total_created} guias criados com sucesso")
-print(f"   ❌ {total_errors} erros")
-print(f"\n💡 Acesse http://localhost:3000 e teste os guias!")
+if __name__ == '__main__':
+    main()
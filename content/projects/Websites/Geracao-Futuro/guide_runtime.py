@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Script partilhado dos guias
+- Cada guia trazia embutido o mesmo JavaScript (barra de progresso da
+  leitura, destaque da secção ativa na navegação e, no template
+  ultra-premium, revelação dos blocos ao fazer scroll)
+- Esse código passa a viver num único ficheiro, assets/guide-runtime.<hash>.js,
+  carregado com defer e que pode ficar em cache para sempre
+- O scroll tem um único listener passivo, agrupado por frame
+  (requestAnimationFrame), que não lê o layout: a secção ativa sai da
+  posição dos títulos, medida só quando o tamanho da página muda, e a
+  revelação dos blocos usa IntersectionObserver (ver scroll_check.py)
+- Cada guia fica só com uma ilha de dados (JSON) com a lista das suas
+  secções e o <script src> do runtime
+- Mostra quantos bytes cada página poupa
+
+Uso:
+    python3 guide_runtime.py
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+from deploy import ASSETS_DIR, in_deploy
+from dom_transform import Page
+from guide_styles import find_guides
+
+# Comentário com que começam os scripts embutidos dos templates
+# (apply_premium_design.py, ultra_premium_template.py, improve_navigation.py)
+INLINE_MARKER = '// Scroll Progress'
+
+SECTIONS_ID = 'guide-sections'
+RUNTIME_HREF_RE = re.compile(r'(?:^|/)guide-runtime\.[0-9a-f]{8}\.js$')
+
+RUNTIME_JS = """// Gerado por guide_runtime.py; não editar
+(() => {
+    const island = document.getElementById('guide-sections');
+    const sections = (island ? JSON.parse(island.textContent) : [])
+        .map(id => document.getElementById(id))
+        .filter(Boolean);
+    const navLinks = Array.from(document.querySelectorAll('.sidebar-link, .nav-item'), el => {
+        const link = el.matches('a') ? el : el.querySelector('a');
+        return { el, href: link && link.getAttribute('href') };
+    });
+    const byId = id => document.getElementById(id);
+    const bars = ['scrollProgress', 'scrollIndicator', 'progressBar'].map(byId).filter(Boolean);
+    const readProg = byId('readProgress');
+    const progText = byId('progressText');
+    const progPercent = byId('progressPercent');
+
+    // Distância de scroll total e posição de cada secção: lidas só quando o
+    // tamanho da página muda, nunca dentro do handler de scroll
+    let maxScroll = 0;
+    let offsets = [];
+    const measure = () => {
+        maxScroll = document.documentElement.scrollHeight - window.innerHeight;
+        offsets = sections.map(section => section.getBoundingClientRect().top + window.scrollY);
+        schedule();
+    };
+
+    // Barra de progresso (topo da página e sidebar); no iOS, o scroll elástico
+    // deixa o scrollY negativo ou além do fim
+    const updateProgress = () => {
+        const scrolled = maxScroll > 0 ? Math.max(0, Math.min(100, (window.scrollY / maxScroll) * 100)) : 0;
+        const percent = scrolled.toFixed(0) + '%';
+        bars.forEach(bar => { bar.style.width = scrolled + '%'; });
+        if (readProg) readProg.style.width = percent;
+        if (progText) progText.textContent = percent + ' lido';
+        if (progPercent) progPercent.textContent = percent;
+    };
+
+    // Secção ativa: a última cujo título já passou a linha 100px abaixo do
+    // topo, pela posição e não por eventos de entrada/saída, para não falhar
+    // títulos que atravessam a linha num só salto (âncoras, teclado)
+    let active = null;
+    const setActive = () => {
+        const line = window.scrollY + 100;
+        let current = '';
+        for (let i = 0; i < offsets.length && offsets[i] <= line; i++) current = sections[i].id;
+        if (current === active) return;
+        active = current;
+        navLinks.forEach(({ el, href }) => el.classList.toggle('active', href === '#' + current));
+    };
+
+    // No máximo uma vez por frame
+    let frame = 0;
+    const update = () => {
+        frame = 0;
+        updateProgress();
+        setActive();
+    };
+    const schedule = () => {
+        if (!frame) frame = requestAnimationFrame(update);
+    };
+
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', measure, { passive: true });
+    if ('ResizeObserver' in window) {
+        new ResizeObserver(measure).observe(document.body);
+    } else {
+        measure();
+    }
+
+    const reveals = document.querySelectorAll('.reveal');
+    if (!('IntersectionObserver' in window)) {
+        reveals.forEach(el => el.classList.add('active'));
+        return;
+    }
+
+    // Blocos que aparecem ao entrar no ecrã (150px acima do fundo)
+    const revealObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add('active');
+                revealObserver.unobserve(entry.target);
+            }
+        });
+    }, { rootMargin: '0px 0px -150px 0px' });
+    reveals.forEach(el => revealObserver.observe(el));
+})();
+"""
+
+def runtime_name():
+    return f"guide-runtime.{hashlib.sha256(RUNTIME_JS.encode('utf-8')).hexdigest()[:8]}.js"
+
+def write_runtime():
+    """Escreve o runtime em assets/ (se ainda não existir) e apaga versões antigas"""
+    name = runtime_name()
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    path = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(RUNTIME_JS)
+    for old in glob.glob(os.path.join(ASSETS_DIR, 'guide-runtime.*.js')):
+        if os.path.basename(old) != name:
+            os.remove(old)
+    return path
+
+def section_ids(page):
+    return [h2.get('id') for h2 in page.select('//h2[@id]')]
+
+def use_shared_runtime(page, page_path):
+    """
+    Troca os scripts embutidos do template pela ilha de dados das secções e
+    pelo runtime partilhado. Em guias já convertidos, atualiza a ilha e o
+    caminho do runtime.
+    """
+    href = os.path.relpath(os.path.join(ASSETS_DIR, runtime_name()),
+                           os.path.dirname(page_path)).replace(os.sep, '/')
+    sections = json.dumps(section_ids(page), ensure_ascii=False, separators=(',', ':'))
+
+    inline = [script for script in page.select('//body//script[not(@src)]')
+              if script.text and INLINE_MARKER in script.text]
+    runtime = [script for script in page.select('//script[@src]') if RUNTIME_HREF_RE.search(script.get('src'))]
+    island = page.first(f'//script[@id="{SECTIONS_ID}"]')
+
+    if runtime:
+        runtime[0].set('src', href)
+        if island is not None:
+            island.text = sections
+        for script in inline:
+            page.remove(script)
+        return
+    if not inline:
+        return
+
+    first = inline[0]
+    island = page.new('script', sections, first.tail, type='application/json', id=SECTIONS_ID)
+    tag = page.new('script', None, None, defer='defer', src=href)
+    page.insert_before(first, island)
+    page.insert_before(first, tag)
+    for script in inline:
+        page.remove(script)
+
+def extract_runtime(guide_paths):
+    """
+    Aplica use_shared_runtime a todos os guias e escreve o runtime.
+    Devolve (guias alterados, relatório).
+    """
+    path = write_runtime()
+    changed = []
+    saved = []
+    for guide_path in guide_paths:
+        with open(guide_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        page = Page(source)
+        use_shared_runtime(page, guide_path)
+        html = page.serialize()
+        if html != source:
+            with open(guide_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            changed.append(guide_path)
+            saved.append(len(source.encode('utf-8')) - len(html.encode('utf-8')))
+
+    return changed, {
+        'runtime': path.replace(os.sep, '/'),
+        'bytes': os.path.getsize(path),
+        'pages': len(changed),
+        'saved_bytes': saved,
+    }
+
+def print_report(report):
+    print(f"\n📜 Runtime partilhado dos guias: {report['runtime']} ({report['bytes'] / 1024:.1f} KB, com defer)")
+    saved = report['saved_bytes']
+    if saved:
+        print(f"   {report['pages']} guias convertidos: {sum(saved) / len(saved):.0f} bytes a menos por página "
+              f"(de {min(saved)} a {max(saved)}), {sum(saved) / 1024:.1f} KB no total")
+    else:
+        print("   Nenhum guia com scripts embutidos por converter")
+
+def main():
+    with in_deploy():
+        guides = find_guides()
+        print(f"🔄 A passar {len(guides)} guias para o runtime partilhado...\n")
+        changed, report = extract_runtime(guides)
+        for path in changed:
+            parts = path.split('/')
+            print(f"  ✅ {parts[1]}/{parts[2]}")
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+CSS partilhado dos guias numa folha de estilos com impressão digital
+- Cada guia trazia embutidas centenas de linhas de CSS iguais em todos os
+  guias (template premium, navegação, melhorias visuais e de UX)
+- Divide o CSS dos <style> do <head> em regras e junta as que aparecem em
+  mais do que um guia numa folha assets/guides.<hash>.css, que pode ficar
+  em cache para sempre (o nome muda quando o conteúdo muda)
+- Cada guia fica com um <link> e, num <style>, só as regras que são suas
+- Guias com CSS partilhado diferente (guias de sessão e de estrutura) têm
+  folhas diferentes; folhas que nenhum guia usa são apagadas
+- As regras são minificadas (ver html_minify.py)
+- A operação é reversível: inline_shared() volta a pôr o CSS no guia antes
+  de as etapas do pipeline o alterarem (ver build_guides.py)
+
+Uso:
+    python3 guide_styles.py
+"""
+
+import glob
+import hashlib
+import os
+import re
+
+from deploy import ASSETS_DIR, in_deploy
+from dom_transform import Page
+from html_minify import minify_css
+
+GUIDE_GLOBS = ['resources/modulo*/sessao*-guia.html', 'resources/modulo*/estrutura-guia.html']
+
+SHARED_HREF_RE = re.compile(r'(?:^|/)guides\.[0-9a-f]{8}\.css$')
+
+# O que conta para dividir as regras: comentários e strings (até ao fim, se
+# não fecharem), que se saltam, e as chavetas e os ';'
+STATEMENT_TOKEN_RE = re.compile(
+    r'/\*.*?(?:\*/|\Z)'
+    r'|"(?:[^"\\]|\\.?)*(?:"|\Z)|\'(?:[^\'\\]|\\.?)*(?:\'|\Z)'
+    r'|[{};]',
+    re.S,
+)
+
+def split_statements(css):
+    """
+    Divide CSS nas suas regras de topo (seletor { ... }, @media { ... },
+    @import ...;). Os comentários ficam agarrados à regra seguinte.
+    """
+    statements = []
+    start = 0
+    depth = 0
+    for match in STATEMENT_TOKEN_RE.finditer(css):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                statements.append(css[start:match.end()].strip())
+                start = match.end()
+        elif token == ';' and depth == 0:
+            statements.append(css[start:match.end()].strip())
+            start = match.end()
+
+    rest = css[start:].strip()
+    if rest:
+        statements.append(rest)
+    return [statement for statement in statements if statement]
+
+def head_styles(page):
+    return page.select('//head/style')
+
+def shared_links(page):
+    return [link for link in page.select('//head/link[@rel="stylesheet"][@href]')
+            if SHARED_HREF_RE.search(link.get('href'))]
+
+def inline_shared(page, page_path):
+    """
+    Volta a pôr no guia o CSS da folha partilhada que ele referencia, junto
+    com o <style> das regras próprias que vier logo a seguir. Antes, desfaz
+    o CSS crítico (ver critical_css.py).
+    """
+    # Importado aqui: critical_css usa split_statements deste módulo
+    from critical_css import restore_blocking
+
+    restore_blocking(page)
+    for link in shared_links(page):
+        path = os.path.normpath(os.path.join(os.path.dirname(page_path), link.get('href')))
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            css = f.read()
+
+        # Os tails são mudados à mão para o HTML voltar a ser exatamente o de antes da extração
+        style = page.new('style', css, link.tail)
+        following = link.getnext()
+        if following is not None and following.tag == 'style':
+            style.text = css + '\n' + (following.text or '')
+            style.tail = following.tail
+            following.getparent().remove(following)
+        link.getparent().replace(link, style)
+
+def guide_statements(page):
+    """
+    Regras de todos os <style> do <head>, pela ordem em que aparecem, já
+    minificadas: a mesma regra é igual em todos os guias, venha ela de um
+    template acabado de aplicar ou de um guia já minificado
+    """
+    statements = []
+    for style in head_styles(page):
+        statements.extend(minify_css(statement) for statement in split_statements(style.text or ''))
+    return [statement for statement in statements if statement]
+
+def stylesheet_name(css):
+    return f"guides.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]}.css"
+
+def link_shared(page, page_path, name, own_statements):
+    """Troca os <style> do <head> pelo <link> da folha partilhada e um <style> com as regras próprias"""
+    styles = head_styles(page)
+    first = styles[0]
+    href = os.path.relpath(os.path.join(ASSETS_DIR, name),
+                           os.path.dirname(page_path)).replace(os.sep, '/')
+    for style in styles[1:]:
+        page.remove(style)
+
+    link = page.new('link', rel='stylesheet', href=href)
+    tail = first.tail
+    first.getparent().replace(first, link)
+    link.tail = tail
+    if own_statements:
+        own = page.new('style', '\n' + '\n'.join(own_statements) + '\n', tail)
+        link.addnext(own)
+
+def extract_shared_styles(guide_paths):
+    """
+    Move para folhas partilhadas o CSS comum dos guias indicados.
+
+    Uma regra é partilhada se aparecer em mais do que um guia. Cada guia
+    passa para a folha as suas regras até à primeira que é só sua; dessa em
+    diante ficam todas no guia, para a ordem da cascata não mudar.
+    Devolve (guias alterados, relatório por folha).
+    """
+    # Importado aqui: critical_css usa split_statements deste módulo
+    from critical_css import restore_blocking
+
+    pages = {}
+    for path in guide_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        page = Page(source)
+        # O guia sem o CSS crítico: se a extração der o mesmo, o guia fica
+        # como estava, com o CSS crítico, que continua certo
+        restore_blocking(page)
+        unblocked = page.serialize()
+        inline_shared(page, path)
+        pages[path] = (source, unblocked, page, guide_statements(page))
+
+    counts = {}
+    for _, _, _, statements in pages.values():
+        for statement in set(statements):
+            counts[statement] = counts.get(statement, 0) + 1
+
+    groups = {}
+    changed = []
+    for path, (source, unblocked, page, statements) in pages.items():
+        shared = 0
+        while shared < len(statements) and counts[statements[shared]] > 1:
+            shared += 1
+        if shared:
+            css = '\n'.join(statements[:shared]) + '\n'
+            name = stylesheet_name(css)
+            group = groups.setdefault(name, {'css': css, 'guides': 0, 'inline_bytes': 0})
+            group['guides'] += 1
+            group['inline_bytes'] += len(css.encode('utf-8'))
+            link_shared(page, path, name, statements[shared:])
+
+        html = page.serialize()
+        if html != source and html != unblocked:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            changed.append(path)
+
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    report = []
+    for name, group in sorted(groups.items()):
+        path = os.path.join(ASSETS_DIR, name)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(group['css'])
+        report.append({
+            'stylesheet': f"{ASSETS_DIR}/{name}",
+            'guides': group['guides'],
+            'bytes': len(group['css'].encode('utf-8')),
+            'inline_bytes': group['inline_bytes'],
+        })
+
+    for path in glob.glob(os.path.join(ASSETS_DIR, 'guides.*.css')):
+        if os.path.basename(path) not in groups:
+            os.remove(path)
+    return changed, report
+
+def find_guides():
+    return [path for pattern in GUIDE_GLOBS for path in sorted(glob.glob(pattern))]
+
+def print_report(report):
+    print(f"\n🧵 CSS partilhado dos guias:")
+    for entry in report:
+        print(f"   {entry['stylesheet']:<30}{entry['guides']:>4} guias{entry['bytes'] / 1024:>8.1f} KB "
+              f"(antes {entry['inline_bytes'] / 1024:.1f} KB repetidos nos guias)")
+    before = sum(entry['inline_bytes'] for entry in report)
+    after = sum(entry['bytes'] for entry in report)
+    if before:
+        print(f"   Total: {after / 1024:.1f} KB descarregados uma vez, em vez de {before / 1024:.1f} KB")
+
+def main():
+    with in_deploy():
+        guides = find_guides()
+        print(f"🔄 A extrair o CSS partilhado de {len(guides)} guias...\n")
+        changed, report = extract_shared_styles(guides)
+        for path in changed:
+            parts = path.split('/')
+            print(f"  ✅ {parts[1]}/{parts[2]}")
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
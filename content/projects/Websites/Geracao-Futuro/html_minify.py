@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Minificação segura do HTML gerado
+- Reduz a um só carácter cada sequência de espaços no texto da página
+  (um espaço, ou uma quebra de linha se a sequência tinha alguma): o
+  browser mostra o mesmo, mesmo entre elementos inline
+- Não toca no conteúdo de <pre> e <textarea>, nem no dos <script>, onde a
+  indentação pode estar dentro de strings (template literals)
+- Minifica o CSS dos <style>: comentários, espaços e ';' finais, sem mexer
+  em strings nem nos espaços que têm significado (calc, seletores). Os
+  comentários /*! … */ ficam: são as referências de Page.insert_css (ver
+  dom_transform.py)
+- Remove comentários HTML, exceto o registo de etapas (ver stage_ledger.py)
+  e comentários condicionais
+- Corre no fim do build dos guias, depois de todas as etapas que
+  reescrevem as páginas, sobre a cópia publicada dos guias, do hub e das
+  apresentações (ver deploy.py), e mostra uma tabela antes/depois
+
+Uso:
+    python3 html_minify.py                      # todos os guias, em dist/
+    python3 html_minify.py pagina.html ...
+"""
+
+import argparse
+import glob
+import re
+from functools import lru_cache
+
+from build_manifest import text_hash
+from deploy import in_deploy
+
+GUIDE_GLOBS = ['resources/modulo*/sessao*-guia.html', 'resources/modulo*/estrutura-guia.html']
+
+# Blocos do HTML, pela ordem em que são reconhecidos
+TOKEN_RE = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    r'|(?P<raw><(?P<raw_tag>script|style|pre|textarea)\b[^>]*>.*?</(?P=raw_tag)\s*>)'
+    r'|(?P<tag><[A-Za-z/!][^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>)'
+    r'|(?P<text>[^<]+|<)',
+    re.S | re.I,
+)
+KEEP_COMMENT_RE = re.compile(r'<!-- build-stages: |<!--\[if|<!\[endif', re.I)
+WHITESPACE_RE = re.compile(r'\s+')
+STYLE_BLOCK_RE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.S | re.I)
+
+# CSS: strings e comentários, depois os espaços que podem sair
+CSS_TOKEN_RE = re.compile(r'(?P<string>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|(?P<comment>/\*.*?\*/)|(?P<other>[^"\'/]+|/)', re.S)
+CSS_SPACE_AROUND_RE = re.compile(r'\s*([{};,])\s*')
+CSS_SPACE_AFTER_COLON_RE = re.compile(r':\s+')
+CSS_LAST_SEMICOLON_RE = re.compile(r';}')
+# Propriedades personalizadas vazias (--tw-pan-x: ;) mantêm um espaço, que browsers antigos exigem
+CSS_EMPTY_CUSTOM_PROPERTY_RE = re.compile(r'(--[\w-]+):(?=[;}])')
+
+def collapse_whitespace(text):
+    """Cada sequência de espaços passa a um só carácter, mantendo as quebras de linha"""
+    return WHITESPACE_RE.sub(lambda match: '\n' if '\n' in match.group() else ' ', text)
+
+@lru_cache(maxsize=None)
+def minify_css(css):
+    """
+    Minifica CSS sem alterar o seu significado (as strings ficam como
+    estão). Com cache: as mesmas regras repetem-se em todos os guias
+    """
+    out = []
+    code = ''
+    for match in CSS_TOKEN_RE.finditer(css):
+        if match.lastgroup == 'string' or match.group().startswith('/*!'):
+            out.extend([minify_css_code(code), match.group()])
+            code = ''
+        elif match.lastgroup == 'other':
+            code += match.group()
+    out.append(minify_css_code(code))
+    return ''.join(out).strip()
+
+def minify_css_code(code):
+    """Espaços e ';' a mais num troço de CSS sem strings nem comentários"""
+    code = WHITESPACE_RE.sub(' ', code)
+    code = CSS_SPACE_AROUND_RE.sub(r'\1', code)
+    # Só depois dos ':' das declarações; antes podem ser seletores (a :hover)
+    code = CSS_SPACE_AFTER_COLON_RE.sub(':', code)
+    code = CSS_LAST_SEMICOLON_RE.sub('}', code)
+    return CSS_EMPTY_CUSTOM_PROPERTY_RE.sub(r'\1: ', code)
+
+def minify_style_block(match):
+    return match.group(1) + minify_css(match.group(2)) + match.group(3)
+
+def minify_html(html):
+    """HTML minificado (ver a descrição do módulo)"""
+    out = []
+    # Texto à espera de ser escrito: os espaços dos dois lados de um
+    # comentário removido juntam-se numa só sequência
+    text = ''
+    for match in TOKEN_RE.finditer(html):
+        kind = match.lastgroup
+        token = match.group()
+        if kind == 'text':
+            text += token
+            continue
+        if kind == 'comment' and not KEEP_COMMENT_RE.match(token):
+            continue
+        if kind == 'raw' and match.group('raw_tag').lower() == 'style':
+            token = STYLE_BLOCK_RE.sub(minify_style_block, token)
+        out.extend([collapse_whitespace(text), token])
+        text = ''
+    out.append(collapse_whitespace(text))
+    return ''.join(out)
+
+def minify_files(paths, memo=None):
+    """
+    Minifica os ficheiros indicados; devolve [(caminho, bytes antes, bytes
+    depois)]. memo ({caminho: [hash, bytes]}, ver build_guides.py) guarda
+    os que já estavam minificados, que da próxima vez, se chegarem iguais,
+    não voltam a passar pelo minificador.
+    """
+    memo = {} if memo is None else memo
+    unchanged = {}
+    rows = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        digest = text_hash(html)
+        known = memo.get(path)
+        if known and known[0] == digest:
+            rows.append((path, known[1], known[1]))
+            unchanged[path] = known
+            continue
+        minified = minify_html(html)
+        if minified != html:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(minified)
+        else:
+            unchanged[path] = [digest, len(html.encode('utf-8'))]
+        rows.append((path, len(html.encode('utf-8')), len(minified.encode('utf-8'))))
+    memo.clear()
+    memo.update(unchanged)
+    return rows
+
+def print_report(rows):
+    """Tabela antes/depois, só com os ficheiros que mudaram, e o total"""
+    changed = [row for row in rows if row[1] != row[2]]
+    before = sum(row[1] for row in rows)
+    after = sum(row[2] for row in rows)
+    print(f"\n🗜️  Minificação do HTML ({len(changed)} de {len(rows)} ficheiros alterados):")
+    if changed:
+        print(f"   {'Ficheiro':<42}{'Antes':>10}{'Depois':>10}{'Poupança':>10}")
+        for path, size_before, size_after in changed:
+            saved = (size_before - size_after) / size_before * 100 if size_before else 0
+            print(f"   {path:<42}{size_before / 1024:>8.1f}KB{size_after / 1024:>8.1f}KB{saved:>9.1f}%")
+    saved = (before - after) / before * 100 if before else 0
+    print(f"   {'TOTAL':<42}{before / 1024:>8.1f}KB{after / 1024:>8.1f}KB{saved:>9.1f}%")
+
+def find_guides():
+    return [path for pattern in GUIDE_GLOBS for path in sorted(glob.glob(pattern))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Minifica HTML gerado (guias, por omissão)")
+    parser.add_argument('paths', nargs='*', help="Ficheiros a minificar (por omissão, todos os guias)")
+    args = parser.parse_args()
+
+    if args.paths:
+        print_report(minify_files(args.paths))
+        return
+    with in_deploy():
+        print_report(minify_files(find_guides()))
+
+if __name__ == '__main__':
+    main()
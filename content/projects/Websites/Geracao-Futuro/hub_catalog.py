@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Catálogo do hub gerado a partir do conteúdo
+- O hub tinha os módulos e sessões num array JavaScript mantido à mão (e
+  uma segunda cópia comentada), com títulos que se afastavam dos do Word
+- Percorre uma única vez modulo*/sessao*/ (as apresentações que existem),
+  resources/modulo*/ (Word de cada sessão e de estrutura) e o título de
+  cada Word (ver session_ir.py, com cache)
+- Grava o catálogo, com a lista plana das sessões (o allSessionsFlat que
+  o hub montava no init()) já calculada e, em cada módulo, a posição das
+  suas sessões nessa lista, em dois ficheiros:
+  - catalog.json, versionado ao lado do hub: o index.html do repositório
+    aponta para ele e funciona sem build
+  - assets/catalog.<hash>.json, compacto e com o índice de pesquisa, na
+    cópia publicada (ver deploy.py), para onde o build aponta o <link
+    rel="preload" id="hub-catalog"> do hub publicado
+- O hub carrega o catálogo com fetch e mostra um erro se não o conseguir
+- Regenera URLS.txt e o README.txt de cada sessão com os mesmos dados
+- Junta a cada sessão, a partir da IR do Word, o número de palavras, o
+  tempo de leitura, as atividades com duração e o índice por grupos da
+  barra lateral dos guias, para o hub os mostrar sem descarregar o guia
+- Indica em "search" o ficheiro de entrada do índice de pesquisa (ver
+  search_index.py), que o hub só descarrega quando se pesquisa
+
+Uso:
+    python3 hub_catalog.py
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+from deploy import ASSETS_DIR, DEPLOY_DIR, in_deploy
+from session_ir import load_session
+
+HUB_PATH = 'index.html'
+CATALOG_SOURCE = 'catalog.json'
+PROJECT_DATA = 'data.json'
+URLS_PATH = 'URLS.txt'
+DEFAULT_BASE_URL = 'https://act.unicenter.io/apresentacoesGF/'
+
+# Palavras por minuto para o tempo de leitura do guia
+READING_WPM = 200
+MAX_ACTIVITIES = 12
+
+COVER_PATTERN = 'covers/img_module_{module}.png'
+SESSION_DOCX_RE = re.compile(r'^(?:M\d+ - )?Sessão (\d+)\.docx$')
+# O Word do módulo: "Módulo N - Estrutura.docx", mas também com o nome do
+# módulo ("Módulo 5 - Criatividade com IA.docx", às vezes com espaço não separável)
+STRUCTURE_DOCX_RE = re.compile(r'^Módulo\s*\d+\s*-.*\.docx$')
+SEARCH_ENTRY_RE = re.compile(r'search\.[0-9a-f]{8}\.json$')
+CATALOG_LINK_RE = re.compile(r'(<link rel="preload" href=")([^"]*catalog(?:\.[0-9a-f]{8})?\.json)("[^>]*\bid="hub-catalog"[^>]*>)')
+
+# Títulos do Word: "🧠 Sessão 2 — Algoritmos" passa a "Sessão 2: Algoritmos"
+TITLE_PREFIX_RE = re.compile(r'^\W+')
+TITLE_SESSION_RE = re.compile(r'^Sessão\s*(\d+)\s*[–—:-]\s*')
+
+def session_title(title, session_num):
+    """Título de uma sessão no formato do hub"""
+    if not title:
+        return f"Sessão {session_num}"
+    title = ' '.join(title.split())
+    title = TITLE_PREFIX_RE.sub('', title)
+    return TITLE_SESSION_RE.sub(lambda match: f"Sessão {match.group(1)}: ", title, count=1) or f"Sessão {session_num}"
+
+def numbered(pattern, prefix):
+    """Diretórios prefixoN que existem, por ordem numérica: [(N, caminho)]"""
+    found = []
+    for path in glob.glob(pattern):
+        match = re.fullmatch(rf'{prefix}(\d+)', os.path.basename(path))
+        if match and os.path.isdir(path):
+            found.append((int(match.group(1)), path.replace(os.sep, '/')))
+    return sorted(found)
+
+def session_metadata(ir):
+    """Resumo de uma sessão para o hub: {'words', 'readingMinutes', 'activities', 'outline'}"""
+    words = ir.word_count()
+    return {
+        'words': words,
+        'readingMinutes': max(1, round(words / READING_WPM)),
+        'activities': [list(activity) for activity in ir.durations()[:MAX_ACTIVITIES]],
+        'outline': [list(group) for group in ir.outline()],
+    }
+
+def module_documents(module_num):
+    """Word do módulo: ({sessão: caminho}, caminho da estrutura ou None)"""
+    sessions = {}
+    structure = None
+    for path in sorted(glob.glob(f"resources/modulo{module_num}/*.docx")):
+        name = os.path.basename(path)
+        match = SESSION_DOCX_RE.match(name)
+        if match:
+            sessions[int(match.group(1))] = path.replace(os.sep, '/')
+        elif STRUCTURE_DOCX_RE.search(name):
+            structure = path.replace(os.sep, '/')
+    return sessions, structure
+
+def collect_catalog():
+    """
+    Módulos e sessões publicados: {'modules', 'sessions'}. As sessões estão
+    numa só lista, pela ordem do hub; cada módulo indica a primeira e o
+    número das suas.
+    """
+    modules = []
+    sessions = []
+    for module_num, module_dir in numbered('modulo*', 'modulo'):
+        documents, structure = module_documents(module_num)
+        cover = COVER_PATTERN.format(module=module_num)
+        module = {'number': module_num, 'title': f"Módulo {module_num}", 'first': len(sessions), 'count': 0}
+        if structure:
+            module['structure'] = structure
+        for session_num, session_dir in numbered(f"{module_dir}/sessao*", 'sessao'):
+            if not os.path.exists(f"{session_dir}/index.html"):
+                continue
+            resource = documents.get(session_num)
+            ir = load_session(resource) if resource else None
+            session = {
+                'number': session_num,
+                'title': session_title(ir.title if ir else None, session_num),
+                'url': f"{session_dir}/",
+                'moduleId': module_num,
+                'moduleTitle': module['title'],
+                'uniqueId': f"m{module_num}-s{session_num}",
+            }
+            if os.path.exists(cover):
+                session['cover'] = cover
+            if resource:
+                session['resource'] = resource
+                session.update(session_metadata(ir))
+            sessions.append(session)
+            module['count'] += 1
+        if module['count']:
+            modules.append(module)
+    return {'modules': modules, 'sessions': sessions}
+
+def search_entry():
+    """Ficheiro de entrada do índice de pesquisa já gerado, ou None"""
+    for path in sorted(glob.glob(os.path.join(ASSETS_DIR, 'search.*.json'))):
+        if SEARCH_ENTRY_RE.match(os.path.basename(path)):
+            return path.replace(os.sep, '/')
+    return None
+
+def write_catalog(catalog):
+    """Grava o catálogo com nome pelo conteúdo e apaga os antigos; devolve o caminho"""
+    data = json.dumps(catalog, ensure_ascii=False, separators=(',', ':'))
+    name = f"catalog.{hashlib.sha256(data.encode('utf-8')).hexdigest()[:8]}.json"
+    path = os.path.join(ASSETS_DIR, name).replace(os.sep, '/')
+    if not os.path.exists(path):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+    for old in glob.glob(os.path.join(ASSETS_DIR, 'catalog.*.json')):
+        if os.path.basename(old) != name:
+            os.remove(old)
+    return path
+
+def load_catalog(hub_path=HUB_PATH):
+    """Catálogo para onde o hub aponta (catalog.json ou a cópia com hash), ou um novo, se não existir"""
+    if os.path.exists(hub_path):
+        with open(hub_path, 'r', encoding='utf-8') as f:
+            match = CATALOG_LINK_RE.search(f.read())
+        path = match and os.path.join(os.path.dirname(hub_path), match.group(2))
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return collect_catalog()
+
+def hub_covers(hub_path=HUB_PATH):
+    """Capas que o hub mostra, pela ordem do catálogo"""
+    covers = [session['cover'] for session in load_catalog(hub_path)['sessions'] if 'cover' in session]
+    return list(dict.fromkeys(covers))
+
+def link_catalog(html, href):
+    return CATALOG_LINK_RE.sub(lambda match: match.group(1) + href + match.group(3), html, count=1)
+
+def base_url():
+    """URL público das apresentações (embedUrl do data.json)"""
+    if os.path.exists(PROJECT_DATA):
+        with open(PROJECT_DATA, 'r', encoding='utf-8') as f:
+            url = json.load(f).get('embedUrl')
+        if url:
+            return url if url.endswith('/') else url + '/'
+    return DEFAULT_BASE_URL
+
+def urls_text(catalog, base):
+    rule = '═' * 55
+    lines = [rule, '  URLS DAS APRESENTAÇÕES - Geração Futuro', rule, '', f"Base URL: {base}", '']
+    for module in catalog['modules']:
+        lines.append(f"MÓDULO {module['number']}:")
+        for session in catalog['sessions'][module['first']:module['first'] + module['count']]:
+            lines.append(f"  Sessão {session['number']}: {base}{session['url']}index.html")
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+def readme_text(session, base):
+    return f"Módulo {session['moduleId']} - Sessão {session['number']}\nURL: {base}{session['url']}index.html\n"
+
+def write_text(path, text):
+    """Escreve o ficheiro só se mudou; devolve True se mudou"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+def hub_relative(path):
+    return os.path.relpath(path, os.path.dirname(HUB_PATH) or '.').replace(os.sep, '/')
+
+def catalog_source_text(catalog):
+    """catalog.json: o mesmo catálogo, indentado para diffs legíveis"""
+    return json.dumps(catalog, ensure_ascii=False, indent=2) + '\n'
+
+def compile_catalog():
+    """
+    Gera o catálogo e regenera, na origem, catalog.json, URLS.txt e os
+    README.txt. Devolve o relatório: {'catalog', 'written'}.
+    """
+    catalog = collect_catalog()
+    base = base_url()
+    written = [target for target, text in [(CATALOG_SOURCE, catalog_source_text(catalog)),
+                                           (URLS_PATH, urls_text(catalog, base))]
+               + [(f"{session['url']}README.txt", readme_text(session, base)) for session in catalog['sessions']]
+               if write_text(target, text)]
+    return {'catalog': catalog, 'written': written}
+
+def publish_catalog(catalog=None, search_path=None):
+    """
+    Grava a cópia com hash do catálogo, com o índice de pesquisa, e liga-lhe
+    o hub; corre na cópia publicada. search_path é o ficheiro de entrada do
+    índice (por omissão, o que já estiver em assets/). Devolve o relatório:
+    {'catalog', 'path', 'bytes', 'linked'}.
+    """
+    catalog = dict(catalog or load_catalog())
+    search_path = search_path or search_entry()
+    if search_path:
+        catalog['search'] = hub_relative(search_path)
+    path = write_catalog(catalog)
+
+    linked = False
+    if os.path.exists(HUB_PATH):
+        with open(HUB_PATH, 'r', encoding='utf-8') as f:
+            html = f.read()
+        linked = CATALOG_LINK_RE.search(html) is not None
+        write_text(HUB_PATH, link_catalog(html, hub_relative(path)))
+    return {'catalog': catalog, 'path': path, 'bytes': os.path.getsize(path), 'linked': linked}
+
+def print_report(report, published=None):
+    catalog = report['catalog']
+    print(f"\n🗺️  Catálogo do hub: {len(catalog['modules'])} módulos, {len(catalog['sessions'])} sessões"
+          + (f" → {published['path']} ({published['bytes'] / 1024:.1f} KB)" if published else ''))
+    if report['written']:
+        print(f"   📝 Atualizados: {', '.join(report['written'])}")
+    if published is None:
+        return
+    if 'search' not in published['catalog']:
+        print("   ⚠️  Sem índice de pesquisa (python3 search_index.py): a caixa de pesquisa do hub não funciona")
+    if not published['linked']:
+        print(f"   ⚠️  {HUB_PATH} não tem <link rel=\"preload\" id=\"hub-catalog\">: o hub não carrega o catálogo")
+
+def main():
+    report = compile_catalog()
+    published = None
+    if os.path.isdir(DEPLOY_DIR):
+        with in_deploy():
+            published = publish_catalog(report['catalog'])
+    print_report(report, published)
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,16 @@
 Script MELHORADO para gerar guias HTML com visual aprimorado
 """
 
-from docx import Document
+import argparse
 import os
 import re
 
+from build_manifest import (PIPELINE_VERSION, check_output, fingerprint, load_manifest,
+                            record_output, save_manifest, text_hash)
+from keyword_classifier import classify
+from parallel_build import add_workers_argument, run_jobs
+from session_ir import load_session
+
 HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="pt">
 <head>
@@ -112,23 +118,18 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 
 def process_word_improved(docx_path):
     """Processa Word com melhor estruturação"""
-    doc = Document(docx_path)
     sections = []
     current_section = None
     toc_items = []
     
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            continue
-        
+    for text in load_session(docx_path).texts():
         # Detecta seções principais (h2)
         if any(keyword in text for keyword in ['Guião do Formador', 'Objetivos', 'Estrutura Detalhada', 'CONTEÚDO DOS SLIDES', 'FICHA DE ATIVIDADE', 'Teasing', 'Enriquecimento', 'Recursos adicionais']):
             if current_section:
                 sections.append(current_section)
             
             section_id = text.lower().replace(' ', '-').replace(':', '')[:30]
-            icon = get_icon(text)
+            icon = classify(text).guide_icon
             current_section = {
                 'id': section_id,
                 'title': text,
@@ -178,19 +179,6 @@ def process_word_improved(docx_path):
     
     return '\n'.join(html_parts), toc_html
 
-def get_icon(text):
-    """Retorna ícone baseado no conteúdo"""
-    text_lower = text.lower()
-    if 'objetivo' in text_lower: return '🎯'
-    if 'material' in text_lower or 'recurso' in text_lower: return '📦'
-    if 'preparação' in text_lower or 'guião' in text_lower: return '🔧'
-    if 'atividade' in text_lower or 'exercício' in text_lower or 'ficha' in text_lower: return '🚀'
-    if 'avaliação' in text_lower: return '📊'
-    if 'slide' in text_lower: return '🎬'
-    if 'teasing' in text_lower: return '🎮'
-    if 'enriquecimento' in text_lower: return '🌟'
-    return '📝'
-
 # Processa TODOS os módulos
 word_files = {
     1: [("Sessão 1.docx", 1), ("Sessão 2.docx", 2), ("Sessão 3.docx", 3)],
@@ -200,50 +188,96 @@ word_files = {
     5: [("M5 - Sessão 1.docx", 1), ("M5 - Sessão 2.docx", 2), ("M5 - Sessão 3.docx", 3), ("M5 - Sessão 4.docx", 4), ("M5 - Sessão 6.docx", 6)]
 }
 
-total = 0
-for module_num, sessions in word_files.items():
-    print(f"\n🎨 Melhorando Módulo {module_num}...")
+def render_session(module_num, word_filename, session_num):
+    """Gera o HTML melhorado de uma sessão a partir do Word"""
+    docx_path = f"resources/modulo{module_num}/{word_filename}"
     
-    for word_filename, session_num in sessions:
-        docx_path = f"resources/modulo{module_num}/{word_filename}"
-        output_path = f"resources/modulo{module_num}/sessao{session_num}-guia.html"
-        
-        if not os.path.exists(docx_path):
-            continue
-        
-        try:
-            content_html, toc_html = process_word_improved(docx_path)
-            
-            doc = Document(docx_path)
-            session_title = f"Sessão {session_num}"
-            for para in doc.paragraphs[:10]:
-                if "Sessão" in para.text:
-                    session_title = para.text.strip().replace("📘", "").replace("Atividade Assíncrona", "").strip()
-                    break
-            
-            html = HTML_TEMPLATE.format(
-                session_title=session_title,
-                module_title=f"Módulo {module_num}",
-                module_num=module_num,
-                session_num=session_num,
-                content=content_html,
-                toc_html=toc_html,
-                word_filename=word_filename
-            )
+    content_html, toc_html = process_word_improved(docx_path)
+    
+    session_title = load_session(docx_path).title or f"Sessão {session_num}"
+    
+    html = HTML_TEMPLATE.format(
+        session_title=session_title,
+        module_title=f"Módulo {module_num}",
+        module_num=module_num,
+        session_num=session_num,
+        content=content_html,
+        toc_html=toc_html,
+        word_filename=word_filename
+    )
+    
+    return session_title, html
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os guias HTML melhorados a partir dos arquivos Word")
+    parser.add_argument('--force', action='store_true', help="Reconstrói todos os guias, mesmo sem alterações")
+    parser.add_argument('--explain', action='store_true', help="Explica porque cada guia foi ou não reconstruído")
+    add_workers_argument(parser)
+    args = parser.parse_args()
+    
+    manifest = load_manifest()
+    template_hash = text_hash(HTML_TEMPLATE)
+    
+    total = 0
+    skipped = 0
+    
+    # Decide primeiro o que precisa de ser reconstruído
+    jobs = []
+    pending = {}
+    for module_num, sessions in word_files.items():
+        for word_filename, session_num in sessions:
+            docx_path = f"resources/modulo{module_num}/{word_filename}"
+            output_path = f"resources/modulo{module_num}/sessao{session_num}-guia.html"
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            if not os.path.exists(docx_path):
+                continue
             
-            print(f"  ✨ {session_title}")
-            total += 1
+            # Só reconstrói se o Word, o template ou o pipeline mudaram
+            current = fingerprint('improve_guides', docx_path, template_hash, PIPELINE_VERSION)
+            needed, reason = check_output(manifest, output_path, current)
+            if not needed and not args.force:
+                if args.explain:
+                    print(f"  ⏭️  {output_path}: {reason}")
+                skipped += 1
+                continue
             
-        except Exception as e:
-            print(f"  ❌ Erro: {e}")
+            job = (module_num, word_filename, session_num)
+            jobs.append(job)
+            pending[job] = (output_path, current, reason if needed else 'forçado')
+    
+    # Converte em paralelo; os resultados chegam pela ordem dos jobs
+    current_module = None
+    for job, result, error in run_jobs(render_session, jobs, args.workers):
+        module_num = job[0]
+        output_path, current, reason = pending[job]
+        
+        if module_num != current_module:
+            print(f"\n🎨 Melhorando Módulo {module_num}...")
+            current_module = module_num
+        
+        if error is not None:
+            print(f"  ❌ Erro: {error}")
+            continue
+        
+        session_title, html = result
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        record_output(manifest, output_path, current)
+        
+        print(f"  ✨ {session_title}" + (f" ({reason})" if args.explain else ""))
+        total += 1
+    
+    save_manifest(manifest)
+    
+    print(f"\n\n🎉 {total} guias melhorados com sucesso!")
+    print(f"⏭️  {skipped} guias sem alterações")
+    print("💎 Visual aprimorado com:")
+    print("   • Índice de navegação lateral")
+    print("   • Tipografia melhorada")
+    print("   • Cards e boxes destacados")
+    print("   • Gradientes e sombras")
+    print("   • Espaçamento otimizado")
 
-print(f"\n\n🎉 {total} guias melhorados com sucesso!")
-print("💎 Visual aprimorado com:")
-print("   • Índice de navegação lateral")
-print("   • Tipografia melhorada")
-print("   • Cards e boxes destacados")
-print("   • Gradientes e sombras")
-print("   • Espaçamento otimizado")
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,15 @@ Melhora o menu de navegação de todos os guias com ícones e animações
 """
 
 import glob
+import html as html_lib
 import re
 
+from dom_transform import has_class, transform_html
+from stage_ledger import run_stage
+
+STAGE_NAME = 'improve_navigation'
+STAGE_VERSION = 2
+
 # Melhorias no CSS para navegação
 IMPROVED_NAV_CSS = """
         /* Sidebar Melhorada */
@@ -131,61 +138,8 @@ IMPROVED_NAV_CSS = """
         }
 """
 
-guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
-print(f"🎨 Melhorando navegação de {len(guides)} guias...\\n")
-
-for guide_path in guides:
-    try:
-        with open(guide_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Substitui CSS da sidebar
-        if '.sidebar {' in content:
-            # Remove CSS antigo da sidebar
-            content = re.sub(
-                r'/\* Sidebar \*/.*?\.sidebar-link\.active \{[^}]+\}',
-                IMPROVED_NAV_CSS.strip(),
-                content,
-                flags=re.DOTALL
-            )
-            
-            # Melhora o HTML da sidebar
-            # Adiciona ícones e organização
-            if '<nav class="space-y-2">' in content:
-                # Extrai os links atuais
-                nav_section = re.search(r'<nav class="space-y-2">(.*?)</nav>', content, re.DOTALL)
-                if nav_section:
-                    links_html = nav_section.group(1)
-                    
-                    # Processa cada link para adicionar ícone
-                    new_links = []
-                    link_pattern = r'<a href="(#[^"]+)" class="sidebar-link[^"]*">([^<]+)</a>'
-                    
-                    for match in re.finditer(link_pattern, links_html):
-                        href = match.group(1)
-                        text = match.group(2).strip()
-                        
-                        # Extrai emoji se existir
-                        emoji = ''
-                        clean_text = text
-                        if text and text[0] in ['🎯', '📦', '🔧', '🚀', '📊', '🎬', '📝', '💡', '🧩']:
-                            emoji = text[0]
-                            clean_text = text[1:].strip()
-                        
-                        # Cria novo link com ícone
-                        new_link = f'''<a href="{href}" class="sidebar-link flex items-center py-2.5 px-3 rounded-lg text-sm text-slate-300 hover:text-white transition-all">
-                            <span class="sidebar-link-icon">{emoji if emoji else '📄'}</span>
-                            <span class="flex-1">{clean_text[:40]}</span>
-                        </a>'''
-                        new_links.append(new_link)
-                    
-                    # Reconstrói navegação
-                    new_nav = '<nav class="space-y-2">\\n' + '\\n'.join(new_links) + '\\n</nav>'
-                    content = content.replace(nav_section.group(0), new_nav)
-            
-            # Adiciona header da sidebar melhorado
-            if '<div class="sidebar rounded-2xl p-6' in content:
-                sidebar_header = '''<div class="sidebar-header">
+# Cabeçalho da sidebar
+SIDEBAR_HEADER = '''<div class="sidebar-header">
                         <div class="flex items-center gap-2 mb-2">
                             <svg class="w-5 h-5 text-cyan-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
                                 <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"/>
@@ -194,16 +148,9 @@ for guide_path in guides:
                         </div>
                         <p class="text-xs text-slate-400">Clique para navegar</p>
                     </div>'''
-                
-                content = re.sub(
-                    r'<h3 class="text-white font-bold text-lg mb-6[^>]*>.*?</h3>',
-                    sidebar_header,
-                    content
-                )
-            
-            # Adiciona barra de progresso
-            if '</nav>' in content and 'sidebar-progress' not in content:
-                progress_html = '''
+
+# Barra de progresso da leitura
+PROGRESS_HTML = '''
                     <div class="sidebar-progress">
                         <div class="text-xs font-semibold text-slate-300 mb-1">Progresso da Leitura</div>
                         <div class="progress-bar">
@@ -211,12 +158,9 @@ for guide_path in guides:
                         </div>
                         <div class="text-xs text-slate-400 mt-2" id="progressText">0% lido</div>
                     </div>'''
-                
-                content = content.replace('</nav>', f'</nav>{progress_html}')
-            
-            # Atualiza script para progresso
-            if 'window.addEventListener' in content and 'readProgress' not in content:
-                new_script = '''
+
+# Script de progresso (substitui o listener simples do template)
+PROGRESS_SCRIPT = '''
         // Scroll Progress
         const updateProgress = () => {
             const winScroll = document.documentElement.scrollTop;
@@ -236,26 +180,96 @@ for guide_path in guides:
         };
         
         window.addEventListener('scroll', updateProgress);'''
-                
-                content = re.sub(
-                    r'window\.addEventListener\(\'scroll\', \(\) => \{[^}]+\}\);',
-                    new_script.strip(),
-                    content
-                )
+
+def improve_navigation_page(page):
+    """Melhora CSS, HTML e script da navegação lateral de um guia já analisado"""
+    if '.sidebar {' not in page.css():
+        return
+    
+    # Substitui CSS da sidebar
+    for style in page.styles():
+        if style.text:
+            style.text = re.sub(
+                r'/\* Sidebar \*/.*?\.sidebar-link\.active \{[^}]+\}',
+                IMPROVED_NAV_CSS.strip(),
+                style.text,
+                flags=re.DOTALL
+            )
+    
+    # Melhora o HTML da sidebar: ícone separado em cada link
+    nav = page.first('//nav[@class="space-y-2"]')
+    if nav is not None:
+        for link in page.select(f'./a[starts-with(@href, "#") and {has_class("sidebar-link")}]', nav):
+            # Links já com ícone (p.ex. da navegação agrupada) ficam como estão
+            if page.by_class('sidebar-link-icon', 'span', link):
+                continue
             
-            with open(guide_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            text = link.text_content().strip()
             
-            print(f"✨ {guide_path.split('/')[1]}/{guide_path.split('/')[2]}")
-        
-    except Exception as e:
-        print(f"❌ Erro em {guide_path}: {e}")
+            # Extrai emoji se existir
+            emoji = ''
+            clean_text = text
+            if text and text[0] in ['🎯', '📦', '🔧', '🚀', '📊', '🎬', '📝', '💡', '🧩']:
+                emoji = text[0]
+                clean_text = text[1:].strip()
+            
+            # Cria novo link com ícone
+            new_link = f'''<a href="{html_lib.escape(link.get('href'))}" class="sidebar-link flex items-center py-2.5 px-3 rounded-lg text-sm text-slate-300 hover:text-white transition-all">
+                            <span class="sidebar-link-icon">{emoji if emoji else '📄'}</span>
+                            <span class="flex-1">{html_lib.escape(clean_text[:40], quote=False)}</span>
+                        </a>'''
+            page.replace_with(link, new_link)
+    
+    # Adiciona header da sidebar melhorado
+    if page.by_class('sidebar', 'div'):
+        for h3 in page.select('//h3[starts-with(@class, "text-white font-bold text-lg mb-6")]'):
+            page.replace_with(h3, SIDEBAR_HEADER)
+    
+    # Adiciona barra de progresso
+    if nav is not None and not page.by_class('sidebar-progress'):
+        page.insert_after(nav, PROGRESS_HTML)
+    
+    # Atualiza script para progresso
+    for script in page.select('//script[not(@src)]'):
+        if script.text and 'updateProgress' not in script.text:
+            script.text = re.sub(
+                r"window\.addEventListener\('scroll', \(\) => \{[^}]+\}\);",
+                PROGRESS_SCRIPT.strip(),
+                script.text
+            )
+
+def improve_navigation(content):
+    """Melhora CSS, HTML e script da navegação lateral de um guia"""
+    return transform_html(content, improve_navigation_page)
+
+def main():
+    guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
+    print(f"🎨 Melhorando navegação de {len(guides)} guias...\\n")
+    
+    for guide_path in guides:
+        try:
+            with open(guide_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            new_content, _ = run_stage(content, STAGE_NAME, STAGE_VERSION, improve_navigation)
+            
+            if new_content != content:
+                with open(guide_path, 'w', encoding='utf-8') as f:
+                    f.write(new_content)
+                
+                print(f"✨ {guide_path.split('/')[1]}/{guide_path.split('/')[2]}")
+            
+        except Exception as e:
+            print(f"❌ Erro em {guide_path}: {e}")
+    
+    print(f"\\n🎉 Navegação melhorada!")
+    print("\\n💎 Melhorias aplicadas:")
+    print("   • Ícones em cada item")
+    print("   • Animação de barra lateral")
+    print("   • Destaque da seção ativa")
+    print("   • Barra de progresso de leitura")
+    print("   • Hover effects melhorados")
+    print("   • Header da sidebar estilizado")
 
-print(f"\\n🎉 Navegação melhorada!")
-print("\\n💎 Melhorias aplicadas:")
-print("   • Ícones em cada item")
-print("   • Animação de barra lateral")
-print("   • Destaque da seção ativa")
-print("   • Barra de progresso de leitura")
-print("   • Hover effects melhorados")
-print("   • Header da sidebar estilizado")
+if __name__ == '__main__':
+    main()
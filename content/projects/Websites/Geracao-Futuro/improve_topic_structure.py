@@ -10,6 +10,13 @@ Melhora visual da estrutura de tópicos:
 import glob
 import re
 
+from dom_transform import transform_html
+from session_ir import DURATION_RE
+from stage_ledger import run_stage
+
+STAGE_NAME = 'improve_topic_structure'
+STAGE_VERSION = 2
+
 IMPROVEMENTS_CSS = """
         /* Dividers entre seções */
         .section-divider {
@@ -77,94 +84,79 @@ IMPROVEMENTS_CSS = """
         }
 """
 
-guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
-print(f"✨ Melhorando estrutura visual de {len(guides)} guias...\n")
+def is_divider(el):
+    return el is not None and el.tag == 'div' and 'section-divider' in el.get('class', '').split()
 
-for guide_path in guides:
-    try:
-        with open(guide_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Adiciona CSS de melhorias
-        if '/* Activity Box Premium */' in content and 'section-divider' not in content:
-            content = content.replace(
-                '/* Activity Box Premium */',
-                IMPROVEMENTS_CSS + '\n        /* Activity Box Premium */'
-            )
-        
-        # Adiciona dividers após cada H2 (exceto a primeira)
-        h2_count = 0
-        def add_divider(match):
-            nonlocal h2_count
-            h2_count += 1
-            if h2_count > 1:
-                return f'<div class="section-divider"></div>\n{match.group(0)}'
-            return match.group(0)
-        
-        content = re.sub(r'<h2[^>]*>', add_divider, content)
-        
-        # Identifica e melhora atividades (texto que contém tempo)
-        def enhance_activity(match):
-            full_text = match.group(0)
-            # Se contém indicação de tempo, adiciona badge
-            if re.search(r'\d+\s*(min|minutos)', full_text, re.IGNORECASE):
-                time_match = re.search(r'(\d+)\s*(min|minutos)', full_text, re.IGNORECASE)
-                if time_match:
-                    time_text = f'{time_match.group(1)} min'
-                    # Adiciona badge de tempo após o h2/h3
-                    enhanced = full_text.replace(
-                        '</h2>',
-                        f'</h2>\n<div class="time-badge">⏱️ {time_text}</div>'
-                    ).replace(
-                        '</h3>',
-                        f'</h3>\n<div class="time-badge">⏱️ {time_text}</div>'
-                    )
-                    return enhanced
-            return full_text
-        
-        content = re.sub(r'<h[23][^>]*>.*?</h[23]>', enhance_activity, content)
-        
-        # Envolve conteúdos de "Atividade" em cards
-        def wrap_activity(match):
-            # Pega todo conteúdo até próximo H2 ou fim
-            return match.group(0).replace(
-                '<h2',
-                '<div class="activity-card">\n<h2'
-            )
-        
-        # Procura por seções de atividades e adiciona marcação
-        if '🚀' in content or 'Atividade' in content:
-            # Adiciona classe especial a h2 de atividades
-            content = re.sub(
-                r'<h2([^>]*)>(🚀[^<]*Atividade[^<]*)</h2>',
-                r'<h2\1><span class="category-label">Prática</span> \2</h2>',
-                content,
-                flags=re.IGNORECASE
-            )
-        
-        # Adiciona labels a objetivos
-        content = re.sub(
-            r'<h2([^>]*)>(🎯[^<]*Objetivo[^<]*)</h2>',
-            r'<h2\1><span class="category-label">Objetivos</span> \2</h2>',
-            content,
-            flags=re.IGNORECASE
-        )
-        
-        # Salva
-        with open(guide_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        parts = guide_path.split('/')
-        print(f"  ✅ {parts[1]}/{parts[2]}")
-        
-    except Exception as e:
-        print(f"  ❌ Erro: {e}")
+def improve_topic_structure_page(page):
+    """Aplica dividers, badges de tempo e labels de categoria a um guia já analisado"""
+    # Adiciona CSS de melhorias
+    if 'section-divider' not in page.css():
+        page.insert_css(IMPROVEMENTS_CSS, '/* Activity Box Premium */')
+    
+    # Adiciona dividers antes de cada H2 (exceto a primeira e as que já têm divider)
+    for h2 in page.select('//h2')[1:]:
+        if not is_divider(h2.getprevious()):
+            page.insert_before(h2, page.new('div', tail='\n', class_='section-divider'))
+    
+    # Identifica e melhora atividades (títulos que contêm tempo): badge após o h2/h3
+    for heading in page.select('//h2 | //h3'):
+        time_match = DURATION_RE.search(heading.text_content())
+        if not time_match:
+            continue
+        following = heading.getnext()
+        if following is not None and following.tag == 'div' and following.get('class') == 'time-badge':
+            continue
+        page.insert_after(heading, page.new('div', f"⏱️ {time_match.group(1)} min", class_='time-badge'))
+        heading.tail = '\n' + (heading.tail or '')
+    
+    # Adiciona labels às atividades e aos objetivos
+    labels = [
+        (re.compile(r'^🚀.*Atividade', re.IGNORECASE | re.DOTALL), 'Prática'),
+        (re.compile(r'^🎯.*Objetivo', re.IGNORECASE | re.DOTALL), 'Objetivos'),
+    ]
+    for h2 in page.select('//h2[not(*)]'):
+        for pattern, label in labels:
+            if h2.text and pattern.match(h2.text):
+                h2.insert(0, page.new('span', label, ' ' + h2.text, class_='category-label'))
+                h2.text = None
+                break
+
+def improve_topic_structure(content):
+    """Aplica dividers, badges de tempo e labels de categoria a um guia"""
+    return transform_html(content, improve_topic_structure_page)
+
+def main():
+    guides = sorted(glob.glob('resources/modulo*/sessao*-guia.html'))
+    print(f"✨ Melhorando estrutura visual de {len(guides)} guias...\n")
+    
+    for guide_path in guides:
+        try:
+            with open(guide_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            content, applied = run_stage(content, STAGE_NAME, STAGE_VERSION, improve_topic_structure)
+            if not applied:
+                print(f"  ⏭️  {guide_path}: já aplicado")
+                continue
+            
+            # Salva
+            with open(guide_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            
+            parts = guide_path.split('/')
+            print(f"  ✅ {parts[1]}/{parts[2]}")
+            
+        except Exception as e:
+            print(f"  ❌ Erro: {e}")
+    
+    print(f"\n🎉 Estrutura visual melhorada!")
+    print("\n✨ Melhorias aplicadas:")
+    print("   • Dividers entre seções principais")
+    print("   • Badges de tempo em atividades")
+    print("   • Labels de categoria (Objetivos, Prática)")
+    print("   • Cards destacados para atividades")
+    print("   • Seções visualmente separadas")
+    print("   • Hierarquia mais clara")
 
-print(f"\n🎉 Estrutura visual melhorada!")
-print("\n✨ Melhorias aplicadas:")
-print("   • Dividers entre seções principais")
-print("   • Badges de tempo em atividades")
-print("   • Labels de categoria (Objetivos, Prática)")
-print("   • Cards destacados para atividades")
-print("   • Seções visualmente separadas")
-print("   • Hierarquia mais clara")
+if __name__ == '__main__':
+    main()
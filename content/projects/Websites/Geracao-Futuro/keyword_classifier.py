@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Classificador de títulos por palavras-chave
+- Todas as heurísticas de ícone e categoria (objetivo, material, atividade,
+  teasing, ...) vivem aqui, em tabelas de regras ordenadas
+- Todas as palavras-chave de todas as tabelas são compiladas numa única
+  expressão regular: cada título é percorrido uma vez e o resultado serve
+  para todas as tabelas ao mesmo tempo
+- O texto é comparado sem maiúsculas e as palavras-chave aceitam também a
+  forma sem acentos ("Guiao" = "guião"); o texto em si não perde os acentos,
+  para "condição" não passar a conter "dica"
+- Cada título é classificado uma única vez por processo (memo)
+
+Uso:
+    python3 keyword_classifier.py "Objetivos da Sessão"   # mostra a classificação
+"""
+
+import re
+import sys
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+# Emojis usados como ícone nos títulos dos guias
+HEADING_EMOJIS = ['🎯', '📦', '🔧', '🚀', '📊', '🎬', '📝', '💡', '🧩', '🎮', '🌟', '💭', '💬', '📋', '⏱️', '📄', '⚠️']
+EMOJI_RE = re.compile('|'.join(re.escape(emoji) for emoji in HEADING_EMOJIS))
+
+# Tabelas de regras: (palavras-chave, resultado), testadas por ordem;
+# vence a primeira regra com alguma palavra-chave presente no texto
+
+# Ícone de uma secção (restructure_topics)
+SECTION_ICONS = [
+    (['objetivo', 'competência'], '🎯'),
+    (['material', 'recurso'], '📦'),
+    (['preparação', 'guião'], '🔧'),
+    (['atividade', 'exercício', 'dinâmica'], '🚀'),
+    (['jogo'], '🎮'),
+    (['desafio'], '🚀'),
+    (['avaliação'], '📊'),
+    (['slide', 'conteúdo'], '🎬'),
+    (['teasing'], '🎮'),
+    (['enriquecimento'], '🌟'),
+    (['reflexão'], '💭'),
+    (['discussão'], '💬'),
+    (['conceito'], '💡'),
+    (['estrutura'], '📋'),
+    (['temporal'], '⏱️'),
+    (['ficha'], '📄'),
+    (['exemplo', 'dica'], '💡'),
+    (['importante'], '⚠️'),
+]
+
+# Categoria de agrupamento de uma secção (restructure_topics, IR)
+CATEGORIES = [
+    (['objetivo', 'competência'], 'objetivos'),
+    (['material', 'recurso'], 'materiais'),
+    (['preparação', 'guião', 'estrutura temporal'], 'preparacao'),
+    (['atividade', 'exercício', 'jogo', 'desafio', 'dinâmica'], 'atividades'),
+    (['slide', 'conteúdo dos slides'], 'slides'),
+    (['avaliação', 'critério'], 'avaliacao'),
+    (['ficha'], 'fichas'),
+    (['teasing'], 'teasing'),
+    (['enriquecimento'], 'enriquecimento'),
+]
+
+# Grupo da barra lateral (reorganize_navigation)
+NAV_GROUPS = [
+    (['objetivo', 'competência'], '🎯 Objetivos e Competências'),
+    (['material', 'recurso'], '📦 Materiais e Recursos'),
+    (['preparação', 'guião', 'estrutura'], '🔧 Preparação'),
+    (['teasing'], '🎮 Atividade Teasing'),
+    (['atividade', 'exercício', 'jogo', 'desafio', 'dinâmica'], '🚀 Atividades Práticas'),
+    (['slide', 'conteúdo dos slide'], '🎬 Slides'),
+    (['ficha'], '📄 Fichas de Trabalho'),
+    (['avaliação', 'critério'], '📊 Avaliação'),
+    (['enriquecimento'], '🌟 Enriquecimento'),
+    (['reflexão', 'discussão'], '💭 Reflexão'),
+]
+
+# Ícone dos títulos gerados a partir do Word (generate_all_guides, IR)
+HEADING_ICONS = [
+    (['objetivo', 'competência'], '🎯'),
+    (['material', 'recurso'], '📦'),
+    (['preparação', 'antes'], '🔧'),
+    (['atividade', 'exercício', 'dinâmica'], '🚀'),
+    (['avaliação'], '📊'),
+]
+
+# Ícone das secções de improve_guides
+GUIDE_ICONS = [
+    (['objetivo'], '🎯'),
+    (['material', 'recurso'], '📦'),
+    (['preparação', 'guião'], '🔧'),
+    (['atividade', 'exercício', 'ficha'], '🚀'),
+    (['avaliação'], '📊'),
+    (['slide'], '🎬'),
+    (['teasing'], '🎮'),
+    (['enriquecimento'], '🌟'),
+]
+
+# Campo do resultado: (tabela, valor quando nenhuma regra se aplica)
+TABLES = {
+    'icon': (SECTION_ICONS, '📝'),
+    'category': (CATEGORIES, 'outros'),
+    'nav_group': (NAV_GROUPS, '📝 Outros Conteúdos'),
+    'heading_icon': (HEADING_ICONS, '📝'),
+    'guide_icon': (GUIDE_ICONS, '📝'),
+}
+
+Classification = namedtuple('Classification', list(TABLES))
+
+def fold(text):
+    """Texto sem acentos"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return unicodedata.normalize('NFC', ''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+def strip_emojis(text):
+    """Remove os emojis de ícone de um título"""
+    return EMOJI_RE.sub('', text).strip()
+
+def _compile():
+    """
+    Compila todas as palavras-chave numa única expressão e prepara as tabelas.
+    A expressão é um lookahead: encontra em cada posição a palavra-chave mais
+    longa, e as palavras-chave contidas nela contam também como presentes
+    ("conteúdo dos slides" implica "conteúdo" e "slide").
+    """
+    keywords = {kw for rules, _ in TABLES.values() for kws, _ in rules for kw in kws}
+    # Cada forma (com e sem acentos) aponta para a palavra-chave original
+    variants = {}
+    for kw in keywords:
+        variants.setdefault(kw, kw)
+        variants.setdefault(fold(kw), kw)
+    ordered = sorted(variants, key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(re.escape(form) for form in ordered) + '))')
+    implied = {form: frozenset(variants[other] for other in ordered if other in form) for form in ordered}
+    tables = [
+        ([(frozenset(kws), result) for kws, result in rules], default)
+        for rules, default in TABLES.values()
+    ]
+    return pattern, implied, tables
+
+_PATTERN, _IMPLIED, _TABLES = _compile()
+
+def keywords_in(text):
+    """Conjunto das palavras-chave presentes no texto"""
+    found = set()
+    for match in _PATTERN.finditer(unicodedata.normalize('NFC', text).lower()):
+        found |= _IMPLIED[match.group(1)]
+    return found
+
+@lru_cache(maxsize=4096)
+def classify(text):
+    """Classifica um título em todas as tabelas com uma única passagem pelo texto"""
+    found = keywords_in(text)
+    results = []
+    for rules, default in _TABLES:
+        results.append(next((result for kws, result in rules if kws & found), default))
+    return Classification(*results)
+
+def main():
+    for text in sys.argv[1:]:
+        print(f"{text}")
+        for field, value in classify(text)._asdict().items():
+            print(f"  {field:<13}{value}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Service worker e manifesto de precache para usar o site sem rede
+- Nas escolas a ligação falha muitas vezes, e o hub, os guias, os bundles
+  das apresentações e as capas vinham todos da rede
+- Grava assets/precache.<hash>.json com todos os ficheiros publicados,
+  cada um com o hash do conteúdo e o tamanho, em grupos:
+  - shell: o hub e o que está em assets/ (folhas de estilo, runtime dos
+    guias, catálogo, entrada do índice de pesquisa)
+  - m1, m2, ...: as apresentações do módulo e os seus bundles, os guias, o
+    Word de estrutura, o shard da pesquisa e a capa (com as variantes)
+- Gera sw.js, ao lado do hub: instala o shell, serve tudo o que está no
+  manifesto primeiro da cache e guarda os ficheiros dos módulos à medida
+  que são abertos; o hub pede-lhe o download de um módulo inteiro
+  ("Baixar offline") e o estado de cada grupo
+- Cada grupo tem a sua cache (gf-m1, ...) e cada ficheiro guardado leva o
+  hash do build; ao ativar um build novo, o service worker apaga o que
+  mudou ou saiu do manifesto e mantém o resto
+- Pedidos a outros domínios (Google Fonts, CDN) passam sem cache
+
+Uso:
+    python3 offline_cache.py
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+from deploy import ASSETS_DIR, in_deploy
+from hub_catalog import load_catalog, write_text
+
+SERVICE_WORKER_PATH = 'sw.js'
+SHELL_GLOBS = ['index.html', f'{ASSETS_DIR}/**/*']
+MODULE_GLOBS = [
+    'modulo{module}/sessao*/index.html',
+    'modulo{module}/sessao*/assets/*',
+    'resources/modulo{module}/*.html',
+    f'{ASSETS_DIR}/search.m{{module}}.*.json',
+]
+# Ficheiros de assets/ que pertencem a um módulo ou não vão para a cache
+MODULE_ASSET_RE = re.compile(rf'^{ASSETS_DIR}/(?:search\.m\d+\.|images/)')
+SKIPPED_SUFFIXES = ('.gz', '.br')
+PRECACHE_RE = re.compile(r'precache\.[0-9a-f]{8}\.json$')
+
+# Downloads em simultâneo quando se baixa um módulo inteiro
+PARALLEL_DOWNLOADS = 4
+
+SERVICE_WORKER_JS = """
+const CACHE_PREFIX = 'gf-';
+const META_CACHE = CACHE_PREFIX + 'meta';
+// Cada resposta guardada leva o hash do ficheiro no build que a guardou
+const HASH_HEADER = 'X-Precache-Hash';
+
+let manifestPromise = null;
+
+function loadManifest() {
+    if (!manifestPromise) {
+        manifestPromise = caches.open(META_CACHE)
+            .then(cache => cache.match(MANIFEST_URL).then(cached => cached || fetch(MANIFEST_URL).then(response => {
+                if (!response.ok) throw new Error(`${MANIFEST_URL}: ${response.status}`);
+                return cache.put(MANIFEST_URL, response.clone()).then(() => response);
+            })))
+            .then(response => response.json())
+            .then(manifest => {
+                const files = new Map();
+                for (const [group, { files: entries }] of Object.entries(manifest.groups)) {
+                    for (const [path, hash, bytes] of entries) {
+                        files.set(new URL(path, self.registration.scope).href, { group, hash, bytes });
+                    }
+                }
+                return { ...manifest, files };
+            })
+            .catch(error => {
+                manifestPromise = null;
+                throw error;
+            });
+    }
+    return manifestPromise;
+}
+
+function cacheKey(url) {
+    url = new URL(url);
+    url.search = '';
+    url.hash = '';
+    if (url.pathname.endsWith('/')) url.pathname += 'index.html';
+    return url.href;
+}
+
+function isCurrent(response, entry) {
+    return Boolean(response) && response.headers.get(HASH_HEADER) === entry.hash;
+}
+
+async function fetchAndStore(cache, key, entry) {
+    const response = await fetch(key, { cache: 'no-cache' });
+    if (!response.ok) return response;
+    // O corpo já vem descomprimido
+    const headers = new Headers(response.headers);
+    headers.delete('Content-Encoding');
+    headers.delete('Content-Length');
+    headers.set(HASH_HEADER, entry.hash);
+    const stamped = new Response(await response.blob(), { status: response.status, statusText: response.statusText, headers });
+    await cache.put(key, stamped.clone());
+    return stamped;
+}
+
+async function respond(request) {
+    const key = cacheKey(request.url);
+    const manifest = await loadManifest().catch(() => null);
+    const entry = manifest && manifest.files.get(key);
+    if (!entry) return fetch(request);
+    const cache = await caches.open(CACHE_PREFIX + entry.group);
+    const cached = await cache.match(key);
+    if (isCurrent(cached, entry)) return cached;
+    try {
+        return await fetchAndStore(cache, key, entry);
+    } catch (error) {
+        // Sem rede: a versão de um build anterior é melhor do que nada
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+async function storeGroup(manifest, group, onProgress) {
+    const cache = await caches.open(CACHE_PREFIX + group);
+    const pending = manifest.groups[group].files.map(([path]) => new URL(path, self.registration.scope).href);
+    const total = pending.length;
+    let done = 0;
+    const worker = async () => {
+        while (pending.length) {
+            const key = pending.shift();
+            const entry = manifest.files.get(key);
+            if (!isCurrent(await cache.match(key), entry)) {
+                const response = await fetchAndStore(cache, key, entry);
+                if (!response.ok) throw new Error(`${key}: ${response.status}`);
+            }
+            done++;
+            if (onProgress) onProgress(done, total);
+        }
+    };
+    await Promise.all(Array.from({ length: PARALLEL_DOWNLOADS }, worker));
+}
+
+async function groupStatus() {
+    const manifest = await loadManifest();
+    const groups = {};
+    for (const [name, group] of Object.entries(manifest.groups)) {
+        const cache = await caches.open(CACHE_PREFIX + name);
+        let cachedBytes = 0;
+        for (const [path, hash, bytes] of group.files) {
+            const cached = await cache.match(new URL(path, self.registration.scope).href);
+            if (isCurrent(cached, { hash })) cachedBytes += bytes;
+        }
+        groups[name] = { title: group.title, bytes: group.bytes, cachedBytes };
+    }
+    return groups;
+}
+
+// Apaga as caches de grupos que já não existem e, nas outras, os ficheiros
+// que mudaram ou saíram do manifesto deste build
+async function evictStale() {
+    const manifest = await loadManifest();
+    const meta = await caches.open(META_CACHE);
+    for (const request of await meta.keys()) {
+        if (request.url !== MANIFEST_URL) await meta.delete(request);
+    }
+    for (const name of await caches.keys()) {
+        if (!name.startsWith(CACHE_PREFIX) || name === META_CACHE) continue;
+        const group = name.slice(CACHE_PREFIX.length);
+        if (!manifest.groups[group]) {
+            await caches.delete(name);
+            continue;
+        }
+        const cache = await caches.open(name);
+        for (const request of await cache.keys()) {
+            const entry = manifest.files.get(request.url);
+            if (!entry || entry.group !== group || !isCurrent(await cache.match(request), entry)) {
+                await cache.delete(request);
+            }
+        }
+    }
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(loadManifest().then(manifest => storeGroup(manifest, 'shell')).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(evictStale().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET' || !event.request.url.startsWith(self.registration.scope)) return;
+    event.respondWith(respond(event.request));
+});
+
+// Pedidos do hub, com a resposta no MessagePort que vem com a mensagem
+self.addEventListener('message', event => {
+    const port = event.ports[0];
+    const { type, group } = event.data || {};
+    if (!port) return;
+    if (type === 'offline-status') {
+        event.waitUntil(groupStatus().then(groups => port.postMessage({ groups })));
+    } else if (type === 'offline-download') {
+        event.waitUntil(loadManifest()
+            .then(manifest => storeGroup(manifest, group, (done, total) => port.postMessage({ group, done, total })))
+            .then(() => port.postMessage({ group, complete: true }), error => port.postMessage({ group, error: String(error) })));
+    } else if (type === 'offline-remove' && group !== 'shell') {
+        event.waitUntil(caches.delete(CACHE_PREFIX + group).then(() => port.postMessage({ group, removed: true })));
+    }
+});
+"""
+
+def file_entry(path):
+    """[caminho, hash, bytes] de um ficheiro publicado"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [path, hashlib.sha256(data).hexdigest()[:8], len(data)]
+
+def published(patterns, module=None):
+    """Ficheiros que correspondem aos padrões, sem versões comprimidas nem repetidos"""
+    paths = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern.format(module=module) if module is not None else pattern, recursive=True)):
+            path = path.replace(os.sep, '/')
+            if os.path.isfile(path) and not path.endswith(SKIPPED_SUFFIXES) and path not in paths:
+                paths.append(path)
+    return paths
+
+def cover_files(cover):
+    """A capa e as suas variantes de responsive_images.py"""
+    stem = os.path.splitext(os.path.basename(cover))[0]
+    variants = glob.glob(os.path.join(ASSETS_DIR, 'images', f"{stem}.*"))
+    return [cover] + sorted(path.replace(os.sep, '/') for path in variants if not path.endswith(SKIPPED_SUFFIXES))
+
+def collect_groups(catalog=None):
+    """Grupos de ficheiros: {nome: {'title', 'bytes', 'files'}}, o shell primeiro"""
+    catalog = catalog or load_catalog()
+    shell = [path for path in published(SHELL_GLOBS)
+             if not MODULE_ASSET_RE.match(path) and not PRECACHE_RE.search(path)]
+    groups = {'shell': ('Hub', shell)}
+    covers = {}
+    for session in catalog['sessions']:
+        if 'cover' in session:
+            covers.setdefault(session['moduleId'], set()).add(session['cover'])
+    for module in catalog['modules']:
+        paths = published(MODULE_GLOBS, module['number'])
+        if module.get('structure'):
+            paths.append(module['structure'])
+        for cover in sorted(covers.get(module['number'], ())):
+            paths += cover_files(cover)
+        groups[f"m{module['number']}"] = (module['title'], [path for path in paths if os.path.exists(path)])
+    # Imagens de assets/images/ que não são capas de um módulo ficam no shell
+    grouped = {path for _, paths in groups.values() for path in paths}
+    shell += [path for path in published([f'{ASSETS_DIR}/images/*']) if path not in grouped]
+
+    result = {}
+    for name, (title, paths) in groups.items():
+        files = [file_entry(path) for path in paths]
+        result[name] = {'title': title, 'bytes': sum(entry[2] for entry in files), 'files': files}
+    return result
+
+def write_manifest(groups):
+    """Grava assets/precache.<hash>.json e apaga os antigos; devolve (caminho, versão)"""
+    data = json.dumps({'groups': groups}, ensure_ascii=False, separators=(',', ':'))
+    version = hashlib.sha256(data.encode('utf-8')).hexdigest()[:8]
+    path = f"{ASSETS_DIR}/precache.{version}.json"
+    if not os.path.exists(path):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+    for old in glob.glob(os.path.join(ASSETS_DIR, 'precache.*.json')):
+        if os.path.basename(old) != os.path.basename(path):
+            os.remove(old)
+    return path, version
+
+def service_worker(manifest_path, version):
+    href = os.path.relpath(manifest_path, os.path.dirname(SERVICE_WORKER_PATH) or '.').replace(os.sep, '/')
+    return (f"// Gerado por offline_cache.py; não editar\n"
+            f"// Build {version}\n"
+            f"const MANIFEST_URL = new URL({json.dumps(href)}, self.location).href;\n"
+            f"const PARALLEL_DOWNLOADS = {PARALLEL_DOWNLOADS};\n"
+            + SERVICE_WORKER_JS)
+
+def build_offline_cache(catalog=None):
+    """
+    Grava o manifesto de precache e o service worker.
+    Devolve o relatório: {'path', 'version', 'groups', 'written'}.
+    """
+    groups = collect_groups(catalog)
+    path, version = write_manifest(groups)
+    written = write_text(SERVICE_WORKER_PATH, service_worker(path, version))
+    return {'path': path, 'version': version, 'groups': groups, 'written': written}
+
+def print_report(report):
+    groups = report['groups']
+    files = sum(len(group['files']) for group in groups.values())
+    total = sum(group['bytes'] for group in groups.values())
+    print(f"\n📴 Offline: {files} ficheiros em {len(groups)} grupos ({total / 1024 / 1024:.1f}MB), "
+          f"build {report['version']} → {report['path']}")
+    for name, group in groups.items():
+        print(f"   {name:<8}{group['title']:<12}{len(group['files']):>5} ficheiros{group['bytes'] / 1024:>10.1f} KB"
+              + ("  (instalado com o hub)" if name == 'shell' else "  (a pedido ou \"Baixar offline\")"))
+    print(f"   {SERVICE_WORKER_PATH} {'atualizado' if report['written'] else 'sem alterações'}")
+
+def main():
+    with in_deploy():
+        print_report(build_offline_cache())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Execução paralela das conversões Word → HTML
+- Distribui as sessões por um pool de processos (o parsing do docx é CPU-bound)
+- Devolve os resultados pela ordem original, independentemente de quem termina primeiro
+- Um erro num ficheiro fica registado nesse ficheiro e não interrompe o lote
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def default_workers():
+    """Número de workers por omissão: um por core disponível"""
+    return os.cpu_count() or 1
+
+def add_workers_argument(parser):
+    """Acrescenta a opção --workers comum a todos os scripts de conversão"""
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Número de processos em paralelo (1 = sequencial; por omissão, um por core)")
+
+def run_jobs(func, jobs, workers=None):
+    """
+    Executa func(*job) para cada job e devolve [(job, resultado, erro)]
+    na mesma ordem de jobs. erro é None quando a conversão correu bem.
+    """
+    jobs = list(jobs)
+    workers = min(workers or default_workers(), len(jobs)) if jobs else 1
+
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append((job, func(*job), None))
+            except Exception as e:
+                results.append((job, None, e))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, *job) for job in jobs]
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append((job, future.result(), None))
+            except Exception as e:
+                results.append((job, None, e))
+        return results
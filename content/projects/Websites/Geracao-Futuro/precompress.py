@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Versões pré-comprimidas dos ficheiros publicados
+- Escreve, ao lado de cada ficheiro de texto publicado (hub, guias,
+  apresentações e os seus bundles, folhas de estilo e scripts partilhados,
+  service worker),
+  um .gz e um .br com a compressão máxima, para o servidor os enviar tal
+  como estão em vez de comprimir a cada pedido
+- O brotli é opcional (pip install brotli); sem ele só há .gz
+- Ficheiros em que a compressão não compensa (pequenos ou que quase não
+  encolhem) ficam sem versões comprimidas; as imagens (PNG, WebP) já vêm
+  comprimidas e ficam de fora
+- Comprime em paralelo (--workers) e só refaz ficheiros que mudaram
+- Grava precompressed.json com o tamanho original e comprimido de cada
+  ficheiro, para a configuração do servidor
+
+Uso:
+    python3 precompress.py
+    python3 precompress.py --workers 1
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+
+from deploy import in_deploy
+from parallel_build import add_workers_argument, run_jobs
+
+MANIFEST_PATH = 'precompressed.json'
+
+DEPLOY_GLOBS = [
+    'index.html',
+    'sw.js',
+    'assets/*',
+    'modulo*/sessao*/index.html',
+    'modulo*/sessao*/assets/*',
+    'resources/modulo*/*.html',
+]
+TEXT_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.xml', '.map')
+
+# A compressão só compensa acima de 1 KB (cabe num pacote de qualquer forma)
+# e se poupar pelo menos 10%
+MIN_BYTES = 1024
+MIN_SAVING = 0.10
+
+def brotli_module():
+    """Módulo brotli, se estiver instalado"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def compress_gzip(data):
+    # mtime=0: o mesmo ficheiro dá sempre os mesmos bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def compress_brotli(data):
+    brotli = brotli_module()
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+def encoders():
+    """Compressões disponíveis: [(extensão, função)]"""
+    available = [('gz', compress_gzip)]
+    if brotli_module() is not None:
+        available.append(('br', compress_brotli))
+    return available
+
+def find_files():
+    """Ficheiros de texto publicados"""
+    files = []
+    for pattern in DEPLOY_GLOBS:
+        for path in sorted(glob.glob(pattern)):
+            if os.path.isfile(path) and path.endswith(TEXT_EXTENSIONS):
+                files.append(path.replace(os.sep, '/'))
+    return files
+
+def is_current(entry, digest, extensions):
+    """A entrada do manifesto corresponde a este conteúdo e os ficheiros comprimidos estão no disco"""
+    if not entry or entry.get('sha256') != digest or entry.get('checked') != extensions:
+        return False
+    return all(os.path.exists(f"{entry['path']}.{ext}") for ext in extensions if ext in entry)
+
+def compress_file(path, previous):
+    """
+    Escreve as versões comprimidas de um ficheiro (corre nos workers).
+    Devolve a entrada do manifesto: tamanho original e de cada compressão
+    que compensou.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    available = encoders()
+    extensions = [ext for ext, _ in available]
+    if is_current(previous, digest, extensions):
+        return dict(previous, reused=True)
+
+    entry = {'path': path, 'bytes': len(data), 'sha256': digest, 'checked': extensions}
+    for ext, compress in available:
+        target = f"{path}.{ext}"
+        compressed = compress(data) if len(data) >= MIN_BYTES else None
+        if compressed is not None and len(compressed) <= len(data) * (1 - MIN_SAVING):
+            with open(target, 'wb') as f:
+                f.write(compressed)
+            entry[ext] = len(compressed)
+        elif os.path.exists(target):
+            os.remove(target)
+    return entry
+
+def remove_stale(kept):
+    """Apaga .gz e .br cujo original já não existe ou deixou de compensar"""
+    removed = []
+    for pattern in DEPLOY_GLOBS:
+        for ext in ('gz', 'br'):
+            for path in glob.glob(f"{pattern}.{ext}"):
+                path = path.replace(os.sep, '/')
+                if path not in kept:
+                    os.remove(path)
+                    removed.append(path)
+    return removed
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {entry['path']: entry for entry in json.load(f)['files']}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def save_manifest(entries, path=MANIFEST_PATH):
+    """Grava o manifesto, ordenado para diffs estáveis"""
+    files = [{key: value for key, value in entry.items() if key != 'reused'} for entry in entries]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'encodings': [ext for ext, _ in encoders()], 'files': sorted(files, key=lambda e: e['path'])},
+                  f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+def precompress(workers=None):
+    """
+    Comprime todos os ficheiros publicados e grava o manifesto.
+    Devolve o relatório: {'entries', 'errors', 'removed'}.
+    """
+    previous = load_manifest()
+    files = find_files()
+    entries = []
+    errors = []
+    for (path, _), entry, error in run_jobs(compress_file, [(path, previous.get(path)) for path in files], workers):
+        if error is not None:
+            errors.append((path, error))
+            continue
+        entries.append(entry)
+
+    kept = {f"{entry['path']}.{ext}" for entry in entries for ext in ('gz', 'br') if ext in entry}
+    removed = remove_stale(kept)
+    save_manifest(entries)
+    return {'entries': entries, 'errors': errors, 'removed': removed}
+
+def print_report(report):
+    entries = report['entries']
+    compressed = [entry for entry in entries if 'gz' in entry or 'br' in entry]
+    reused = sum(1 for entry in entries if entry.get('reused'))
+    print(f"\n📦 Pré-compressão: {len(compressed)} de {len(entries)} ficheiros "
+          f"({reused} sem alterações, {len(entries) - len(compressed)} não compensam)")
+
+    kinds = {}
+    for entry in compressed:
+        kind = kinds.setdefault(os.path.splitext(entry['path'])[1], {'files': 0, 'bytes': 0, 'gz': 0, 'br': 0})
+        kind['files'] += 1
+        kind['bytes'] += entry['bytes']
+        for ext in ('gz', 'br'):
+            kind[ext] += entry.get(ext, entry['bytes'])
+    has_brotli = any('br' in entry for entry in compressed)
+    print(f"   {'Tipo':<8}{'Ficheiros':>10}{'Original':>12}{'gzip':>12}" + (f"{'brotli':>12}" if has_brotli else ''))
+    totals = {'files': 0, 'bytes': 0, 'gz': 0, 'br': 0}
+    for name, kind in sorted(kinds.items()) + [('TOTAL', totals)]:
+        if name != 'TOTAL':
+            for key in totals:
+                totals[key] += kind[key]
+        line = f"   {name:<8}{kind['files']:>10}{kind['bytes'] / 1024:>10.1f}KB{kind['gz'] / 1024:>10.1f}KB"
+        print(line + (f"{kind['br'] / 1024:>10.1f}KB" if has_brotli else ''))
+
+    if brotli_module() is None:
+        print("   ⚠️  brotli não instalado (pip install brotli): só foram gerados .gz")
+    if report['removed']:
+        print(f"   🧹 {len(report['removed'])} ficheiros comprimidos antigos apagados")
+    for path, error in report['errors']:
+        print(f"   ❌ Erro em {path}: {error}")
+    print(f"   Manifesto: {MANIFEST_PATH}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera versões .gz e .br dos ficheiros publicados")
+    add_workers_argument(parser)
+    args = parser.parse_args()
+
+    with in_deploy():
+        print_report(precompress(args.workers))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Dicas de prefetch e preload pela ordem do curso
+- Os professores avançam sessão a sessão (modulo3/sessao1 → sessao2 → ...)
+  e cada apresentação carregava o seu bundle (~280 KB) do zero
+- A sequência é a do catálogo do hub (ver hub_catalog.py), que continua
+  de um módulo para o seguinte
+- Apresentações: <link rel="prefetch"> para o index.html da sessão
+  seguinte (no mesmo URL que o hub abre, a pasta) e para o seu bundle
+  assets/index-*.js, e <link rel="modulepreload"> para o bundle da própria
+  página, no início do <head>
+- Guias: prefetch do guia seguinte (o guia de estrutura aponta para o da
+  primeira sessão do módulo) e preload do runtime partilhado (ver
+  guide_runtime.py), que só aparece no fim do <body>
+- Para medir o efeito, um módulo fica sem dicas com um ficheiro
+  moduloN/.no-prefetch; as dicas levam data-hint e são sempre refeitas,
+  por isso saem ao criar o ficheiro e voltam ao apagá-lo
+
+Uso:
+    python3 prefetch_hints.py
+"""
+
+import os
+import re
+
+from deploy import in_deploy
+from hub_catalog import load_catalog
+
+NO_HINTS_FILE = '.no-prefetch'
+STRUCTURE_GUIDE = 'resources/modulo{module}/estrutura-guia.html'
+SESSION_GUIDE = 'resources/modulo{module}/sessao{session}-guia.html'
+
+HINT_RE = re.compile(r'\s*<link\b[^>]*\bdata-hint\b[^>]*>')
+MODULE_SCRIPT_RE = re.compile(r'<script\b[^>]*\btype="module"[^>]*\bsrc="([^"]+)"')
+RUNTIME_SCRIPT_RE = re.compile(r'<script\b[^>]*\bsrc="([^"]*guide-runtime\.[0-9a-f]{8}\.js)"')
+HEAD_ANCHOR_RES = [re.compile(r'<meta\b[^>]*\bname="viewport"[^>]*>'), re.compile(r'<meta\b[^>]*\bcharset=[^>]*>'),
+                   re.compile(r'<head\b[^>]*>')]
+
+def relative_href(target, page_path):
+    href = os.path.relpath(target, os.path.dirname(page_path)).replace(os.sep, '/')
+    return href if href.startswith('.') else f"./{href}"
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def bundle(page_path, html=None):
+    """Bundle do index.html de uma apresentação (caminho desde a raiz), ou None"""
+    match = MODULE_SCRIPT_RE.search(html if html is not None else read(page_path))
+    if not match or '://' in match.group(1):
+        return None
+    return os.path.normpath(os.path.join(os.path.dirname(page_path), match.group(1))).replace(os.sep, '/')
+
+def hint_disabled(module_num):
+    return os.path.exists(f"modulo{module_num}/{NO_HINTS_FILE}")
+
+def set_hints(html, links):
+    """Tira as dicas antigas e põe links no início do <head>, com o espaçamento do próprio <head>"""
+    html = HINT_RE.sub('', html)
+    if not links:
+        return html
+    for anchor_re in HEAD_ANCHOR_RES:
+        match = anchor_re.search(html)
+        if match:
+            break
+    else:
+        return html
+    following = re.match(r'\s*', html[match.end():]).group()
+    separator = following or '\n'
+    return html[:match.end()] + ''.join(separator + link for link in links) + html[match.end():]
+
+def presentation_hints(page_path, html, next_page):
+    links = []
+    own = bundle(page_path, html)
+    if own:
+        links.append(f'<link rel="modulepreload" href="{relative_href(own, page_path)}" data-hint>')
+    if next_page:
+        links.append(f'<link rel="prefetch" href="{relative_href(os.path.dirname(next_page), page_path)}/" data-hint>')
+        next_bundle = bundle(next_page)
+        if next_bundle:
+            links.append(f'<link rel="prefetch" href="{relative_href(next_bundle, page_path)}" crossorigin data-hint>')
+    return links
+
+def guide_hints(page_path, html, next_guide):
+    links = []
+    runtime = RUNTIME_SCRIPT_RE.search(html)
+    if runtime:
+        links.append(f'<link rel="preload" href="{runtime.group(1)}" as="script" data-hint>')
+    if next_guide:
+        links.append(f'<link rel="prefetch" href="{relative_href(next_guide, page_path)}" data-hint>')
+    return links
+
+def course_pages(catalog):
+    """
+    Páginas por ordem do curso: [(módulo, tipo, página, página seguinte ou
+    None)], com tipo 'presentation' ou 'guide'
+    """
+    sessions = catalog['sessions']
+    presentations = [f"{session['url']}index.html" for session in sessions]
+    pages = []
+    for index, session in enumerate(sessions):
+        following = presentations[index + 1] if index + 1 < len(presentations) else None
+        pages.append((session['moduleId'], 'presentation', presentations[index], following))
+
+    guides = [SESSION_GUIDE.format(module=session['moduleId'], session=session['number']) for session in sessions]
+    existing = [(session, guide) for session, guide in zip(sessions, guides) if os.path.exists(guide)]
+    for index, (session, guide) in enumerate(existing):
+        following = existing[index + 1][1] if index + 1 < len(existing) else None
+        pages.append((session['moduleId'], 'guide', guide, following))
+    for module in catalog['modules']:
+        structure = STRUCTURE_GUIDE.format(module=module['number'])
+        first = next((guide for session, guide in existing if session['moduleId'] == module['number']), None)
+        if os.path.exists(structure):
+            pages.append((module['number'], 'guide', structure, first))
+    return pages
+
+def add_hints(catalog=None):
+    """
+    Escreve as dicas em todas as apresentações e guias do catálogo.
+    Devolve o relatório: {'pages' (alterados), 'modules': {módulo:
+    {'pages', 'hints', 'disabled'}}}.
+    """
+    catalog = catalog or load_catalog()
+    changed = []
+    modules = {}
+    for module_num, kind, page_path, next_page in course_pages(catalog):
+        if not os.path.exists(page_path):
+            continue
+        disabled = hint_disabled(module_num)
+        html = read(page_path)
+        if disabled:
+            links = []
+        elif kind == 'presentation':
+            links = presentation_hints(page_path, html, next_page)
+        else:
+            links = guide_hints(page_path, html, next_page)
+        updated = set_hints(html, links)
+        if updated != html:
+            with open(page_path, 'w', encoding='utf-8') as f:
+                f.write(updated)
+            changed.append(page_path)
+        stats = modules.setdefault(module_num, {'pages': 0, 'hints': 0, 'disabled': disabled})
+        stats['pages'] += 1
+        stats['hints'] += len(links)
+    return {'pages': changed, 'modules': modules}
+
+def print_report(report):
+    print(f"\n🔮 Dicas de prefetch/preload pela ordem do curso ({len(report['pages'])} páginas alteradas):")
+    for module_num, stats in sorted(report['modules'].items()):
+        if stats['disabled']:
+            print(f"   Módulo {module_num}: sem dicas (modulo{module_num}/{NO_HINTS_FILE})")
+        else:
+            print(f"   Módulo {module_num}: {stats['hints']} dicas em {stats['pages']} páginas")
+
+def main():
+    with in_deploy():
+        print_report(add_hints())
+
+if __name__ == '__main__':
+    main()
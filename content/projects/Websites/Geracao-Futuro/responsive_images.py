@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Dimensões e variantes responsivas das imagens publicadas
+- Lê a largura e a altura de cada imagem referida pelas páginas diretamente
+  do cabeçalho do ficheiro (PNG, JPEG, GIF, WebP), pelo conteúdo e não pela
+  extensão: as capas em covers/ são JPEG com extensão .png
+- Escreve width/height nos <img> das páginas que ainda não os têm, para o
+  browser reservar o espaço antes de a imagem chegar (sem saltos de layout)
+- Gera em assets/images/ variantes AVIF e WebP com 320, 640 e 960 px de
+  largura (nunca maiores que o original) e acrescenta srcset/sizes, para
+  cada ecrã descarregar só o tamanho de que precisa
+- As capas do hub (ver hub_catalog.py) são desenhadas em JavaScript: as
+  dimensões e as variantes de cada capa vão numa ilha JSON (#cover-images)
+  que o template do hub lê; só o primeiro cartão visível leva
+  fetchpriority="high", os outros são lazy
+- As variantes precisam do Pillow (pip install pillow; o AVIF precisa de
+  Pillow 11.3 ou do pillow-avif-plugin); sem ele ficam só as dimensões e as
+  variantes já geradas
+- Os nomes das variantes levam um hash do original: só se refazem quando a
+  imagem muda
+
+Uso:
+    python3 responsive_images.py
+"""
+
+import glob
+import hashlib
+import html as html_lib
+import json
+import os
+import re
+import struct
+
+from deploy import ASSETS_DIR, in_deploy
+from hub_catalog import HUB_PATH, hub_covers
+from tailwind_css import find_pages
+
+IMAGE_OUTPUT_DIR = os.path.join(ASSETS_DIR, 'images')
+
+VARIANT_WIDTHS = (320, 640, 960)
+# Do mais eficiente para o menos: o browser usa o primeiro <source> que suporta
+VARIANT_FORMATS = [('avif', 'image/avif'), ('webp', 'image/webp')]
+VARIANT_QUALITY = {'avif': 50, 'webp': 75}
+
+# Os cartões do hub têm w-72 (18rem) e md:w-80 (20rem)
+COVER_SIZES = '(min-width: 768px) 20rem, 18rem'
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.I)
+ATTRIBUTE_RE = r'\s{}\s*=\s*"([^"]*)"'
+COVER_ISLAND_RE = re.compile(r'([ \t]*)<script type="application/json" id="cover-images">.*?</script>\n?', re.S)
+HUB_SCRIPT_RE = re.compile(r'([ \t]*)<script>(?=(?:(?!</script>).)*?\ballSessionsFlat\b)', re.S)
+
+def pillow():
+    """Módulo Image do Pillow, se estiver instalado"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+def image_size(path):
+    """(formato, largura, altura) lidos do cabeçalho da imagem, ou None se não for reconhecida"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', head[16:24])
+            return 'png', width, height
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', head[6:10])
+            return 'gif', width, height
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return webp_size(head)
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            return jpeg_size(f)
+    return None
+
+def webp_size(head):
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return 'webp', width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        return 'webp', (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X':
+        return 'webp', int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
+def jpeg_size(f):
+    """Percorre os segmentos do JPEG até ao SOF, que tem as dimensões"""
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xff:
+            return None
+        if marker[1] in (0xd8, 0x01) or 0xd0 <= marker[1] <= 0xd7:
+            continue
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        # SOF0..SOF15, exceto DHT (c4), JPG (c8) e DAC (cc)
+        if 0xc0 <= marker[1] <= 0xcf and marker[1] not in (0xc4, 0xc8, 0xcc):
+            height, width = struct.unpack('>xHH', f.read(5))
+            return 'jpeg', width, height
+        f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def variant_widths(width):
+    """Larguras das variantes de uma imagem: só as menores que o original"""
+    return [target for target in VARIANT_WIDTHS if target < width]
+
+def variant_path(source, digest, width, extension):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(IMAGE_OUTPUT_DIR, f"{stem}.{digest[:8]}.{width}w.{extension}").replace(os.sep, '/')
+
+def encodable_formats(Image):
+    """Formatos de VARIANT_FORMATS que o Pillow instalado sabe escrever"""
+    if Image is None:
+        return set()
+    Image.init()
+    extensions = Image.registered_extensions()
+    return {extension for extension, _ in VARIANT_FORMATS
+            if extensions.get(f'.{extension}') in Image.SAVE}
+
+def write_variant(Image, source, target, width, extension):
+    with Image.open(source) as image:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    resized.save(target, quality=VARIANT_QUALITY[extension], **({'method': 6} if extension == 'webp' else {}))
+
+def image_info(source, Image, formats, written):
+    """
+    Dimensões e variantes de uma imagem: {'width', 'height', 'sources'}.
+    Cada entrada de sources é {'type', 'srcset'} com os caminhos relativos
+    à raiz do site; as variantes já no disco são reaproveitadas.
+    """
+    size = image_size(source)
+    if size is None:
+        return None
+    _, width, height = size
+    digest = file_digest(source)
+    sources = []
+    for extension, mime in VARIANT_FORMATS:
+        candidates = []
+        for target_width in variant_widths(width):
+            target = variant_path(source, digest, target_width, extension)
+            if not os.path.exists(target):
+                if extension not in formats:
+                    continue
+                write_variant(Image, source, target, target_width, extension)
+                written.append(target)
+            candidates.append(f"{target} {target_width}w")
+        if candidates:
+            sources.append({'type': mime, 'srcset': ', '.join(candidates)})
+    return {'width': width, 'height': height, 'sources': sources}
+
+def relative_srcset(srcset, page_path):
+    """srcset com caminhos da raiz do site passado a caminhos relativos à página"""
+    base = os.path.dirname(page_path) or '.'
+    return ', '.join(f"{os.path.relpath(path, base).replace(os.sep, '/')} {descriptor}"
+                     for path, descriptor in (item.split(' ') for item in srcset.split(', ')))
+
+def attribute(tag, name):
+    match = re.search(ATTRIBUTE_RE.format(name), tag, re.I)
+    return html_lib.unescape(match.group(1)) if match else None
+
+def local_image(src, page_path):
+    """Caminho no disco de uma imagem referida pela página, se for local e existir"""
+    if not src or '${' in src or re.match(r'(?:[a-z]+:|//)', src, re.I):
+        return None
+    path = os.path.normpath(os.path.join(os.path.dirname(page_path), src.split('?')[0].split('#')[0]))
+    return path.replace(os.sep, '/') if os.path.isfile(path) else None
+
+def size_image_tag(tag, info, page_path):
+    """<img> com width/height e, se houver variantes WebP, srcset/sizes"""
+    additions = []
+    if attribute(tag, 'width') is None and attribute(tag, 'height') is None:
+        additions.append(f'width="{info["width"]}" height="{info["height"]}"')
+    webp = next((source for source in info['sources'] if source['type'] == 'image/webp'), None)
+    if webp and attribute(tag, 'srcset') is None:
+        srcset = f"{relative_srcset(webp['srcset'], page_path)}, {attribute(tag, 'src')} {info['width']}w"
+        additions.append(f'srcset="{html_lib.escape(srcset)}" '
+                         f'sizes="(min-width: {info["width"]}px) {info["width"]}px, 100vw"')
+    if attribute(tag, 'decoding') is None:
+        additions.append('decoding="async"')
+    if not additions:
+        return tag
+    end = -2 if tag.endswith('/>') else -1
+    return f"{tag[:end].rstrip()} {' '.join(additions)}{tag[end:]}"
+
+def cover_island(covers):
+    data = json.dumps({'sizes': COVER_SIZES, 'images': covers}, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return f'<script type="application/json" id="cover-images">{data}</script>'
+
+def link_covers(html, covers):
+    """Escreve (ou atualiza) a ilha JSON das capas antes do script do hub"""
+    island = cover_island(covers) if covers else None
+    if COVER_ISLAND_RE.search(html):
+        return COVER_ISLAND_RE.sub(lambda match: f"{match.group(1)}{island}\n" if island else '', html, count=1)
+    match = HUB_SCRIPT_RE.search(html)
+    if island is None or match is None:
+        return html
+    return html[:match.start()] + f"{match.group(1)}{island}\n" + html[match.start():]
+
+def responsive_images(page_paths=None):
+    """
+    Dimensões e variantes de todas as imagens das páginas e das capas do hub.
+    Devolve o relatório: {'available', 'images', 'written', 'removed',
+    'pages', 'missing'}.
+    """
+    Image = pillow()
+    formats = encodable_formats(Image)
+    images = {}
+    written = []
+    missing = []
+    pages = []
+
+    def info_for(path):
+        if path not in images:
+            images[path] = image_info(path, Image, formats, written)
+        return images[path]
+
+    for page_path in page_paths or find_pages():
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        def size_tag(match):
+            src = attribute(match.group(), 'src')
+            path = local_image(src, page_path)
+            if path is None:
+                if src and '${' not in src and not re.match(r'(?:[a-z]+:|//)', src, re.I):
+                    missing.append((page_path, src))
+                return match.group()
+            info = info_for(path)
+            return size_image_tag(match.group(), info, page_path) if info else match.group()
+
+        updated = IMG_TAG_RE.sub(size_tag, html)
+        if os.path.normpath(page_path) == os.path.normpath(HUB_PATH):
+            covers = {}
+            for cover in hub_covers(page_path):
+                path = local_image(cover, page_path)
+                info = info_for(path) if path else None
+                if info:
+                    covers[cover] = info
+                elif path is None:
+                    missing.append((page_path, cover))
+            updated = link_covers(updated, covers)
+        if updated != html:
+            with open(page_path, 'w', encoding='utf-8') as f:
+                f.write(updated)
+            pages.append(page_path)
+
+    # Variantes de versões antigas das imagens
+    current = {path.split(' ')[0] for info in images.values() if info
+               for source in info['sources'] for path in source['srcset'].split(', ')}
+    removed = []
+    for path in sorted(glob.glob(os.path.join(IMAGE_OUTPUT_DIR, '*'))):
+        if path.replace(os.sep, '/') not in current:
+            os.remove(path)
+            removed.append(path)
+
+    return {'available': sorted(formats), 'pillow': Image is not None, 'images': images,
+            'written': written, 'removed': removed, 'pages': pages, 'missing': missing}
+
+def print_report(report):
+    images = {path: info for path, info in report['images'].items() if info}
+    print(f"\n🖼️  Imagens: {len(images)} com dimensões, {len(report['pages'])} páginas atualizadas")
+    for path, info in sorted(images.items()):
+        variants = sum(len(source['srcset'].split(', ')) for source in info['sources'])
+        kb = os.path.getsize(path) / 1024
+        print(f"   {path:<42}{info['width']:>6}x{info['height']:<6}{kb:>8.1f}KB  {variants} variantes")
+    if report['written']:
+        print(f"   ✨ {len(report['written'])} variantes geradas em {IMAGE_OUTPUT_DIR}/")
+    if report['removed']:
+        print(f"   🧹 {len(report['removed'])} variantes antigas apagadas")
+    if not report['pillow']:
+        print("   ⚠️  Pillow não instalado (pip install pillow): sem variantes WebP/AVIF novas")
+    elif 'avif' not in report['available']:
+        print("   ⚠️  Este Pillow não escreve AVIF (Pillow >= 11.3 ou pillow-avif-plugin): só WebP")
+    for page_path, src in report['missing']:
+        print(f"   ❌ {page_path}: imagem não encontrada ({src})")
+
+def main():
+    with in_deploy():
+        print_report(responsive_images())
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,8 @@ import os
 import re
 from pathlib import Path
 
+from hub_catalog import HUB_PATH, load_catalog
+
 print("=" * 70)
 print("🔍 REVISÃO GERAL - TODOS OS CONTEÚDOS")
 print("=" * 70)
@@ -50,7 +52,7 @@ for guide_path in guides:
     checks = {
         'DOCTYPE': '<!DOCTYPE html>' in content,
         'Charset UTF-8': 'charset="UTF-8"' in content,
-        'Tailwind CSS': 'tailwindcss.com' in content,
+        'Tailwind CSS': 'assets/tailwind' in content or 'tailwindcss.com' in content,
         'Title': '<title>' in content,
         'Sidebar': 'sidebar' in content.lower(),
         'Navigation': '<nav' in content,
@@ -108,16 +110,16 @@ for pres_path in presentations:
 print(f"\n{BLUE}🏠 3. VERIFICANDO HUB PRINCIPAL{RESET}")
 print("-" * 70)
 
-if os.path.exists('index.html'):
-    with open('index.html', 'r', encoding='utf-8') as f:
+if os.path.exists(HUB_PATH):
+    with open(HUB_PATH, 'r', encoding='utf-8') as f:
         hub_content = f.read()
     
     hub_checks = {
-        'Módulos array': 'const modules =' in hub_content,
+        'Catálogo (hub_catalog.py)': 'id="hub-catalog"' in hub_content,
         'Glass cards': 'glass-card' in hub_content,
         'Modal': 'modal' in hub_content.lower(),
         'Links para guias': 'sessao1-guia.html' in hub_content or 'resources/modulo' in hub_content,
-        'Links para apresentações': 'modulo1/sessao1/' in hub_content,
+        'Links para apresentações': any(s['url'] == 'modulo1/sessao1/' for s in load_catalog()['sessions']),
     }
     
     hub_failed = [k for k, v in hub_checks.items() if not v]
@@ -125,9 +127,9 @@ if os.path.exists('index.html'):
     if hub_failed:
         warnings.append(f"⚠️  Hub: Faltam {', '.join(hub_failed)}")
     else:
-        successes.append(f"✅ Hub principal: OK ({os.path.getsize('index.html'):,} bytes)")
+        successes.append(f"✅ Hub principal: OK ({os.path.getsize(HUB_PATH):,} bytes)")
 else:
-    issues.append(f"❌ Hub: index.html não encontrado!")
+    issues.append(f"❌ Hub: {HUB_PATH} não encontrado!")
 
 # 4. VERIFICAR RECURSOS (WORD)
 print(f"\n{BLUE}📄 4. VERIFICANDO RECURSOS WORD{RESET}")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Verificação estática dos handlers de scroll
+- Procura, nos scripts de cada página (embutidos e locais), os listeners de
+  'scroll' e as funções que eles chamam ou agendam
+- Assinala leituras de layout feitas a cada evento (offsetTop,
+  getBoundingClientRect, scrollHeight, ...) e pesquisas no DOM
+  (querySelectorAll), que obrigam o browser a recalcular o layout durante
+  o scroll
+- Assinala também listeners de scroll que não são passivos
+- O runtime dos guias (guide_runtime.py) deve passar sem avisos: mede o
+  layout só quando o tamanho muda e usa IntersectionObserver
+
+Uso:
+    python3 scroll_check.py             # guias, hub e páginas das sessões
+    python3 scroll_check.py pagina.html
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+
+from deploy import in_deploy
+from tailwind_css import LOCAL_SCRIPT_RE
+
+PAGE_GLOBS = ['index.html', 'modulo*/sessao*/index.html', 'resources/modulo*/*.html']
+
+INLINE_SCRIPT_RE = re.compile(r'<script(?![^>]*\ssrc=)(?![^>]*type="application/json")[^>]*>(.*?)</script>', re.S)
+SCROLL_LISTENER_RE = re.compile(r'addEventListener\(\s*([\'"])scroll\1\s*,\s*')
+
+# Propriedades e métodos que forçam o cálculo do layout, e pesquisas no DOM
+LAYOUT_READS = re.compile(
+    r'\.(offset(?:Top|Left|Width|Height)|client(?:Top|Left|Width|Height)|scroll(?:Top|Left|Width|Height)'
+    r'|getBoundingClientRect|getClientRects|innerText)\b|\b(getComputedStyle|querySelectorAll|querySelector'
+    r'|getElementsByClassName|getElementsByTagName)\s*\('
+)
+
+IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+def matching_brace(source, start):
+    """Posição a seguir à chaveta que fecha a que abre em start (ignora strings e comentários)"""
+    depth = 0
+    index = start
+    while index < len(source):
+        char = source[index]
+        if source.startswith('//', index):
+            end = source.find('\n', index)
+            index = len(source) if end < 0 else end
+            continue
+        if source.startswith('/*', index):
+            end = source.find('*/', index + 2)
+            index = len(source) if end < 0 else end + 2
+            continue
+        if char in '"\'`':
+            end = index + 1
+            while end < len(source) and source[end] != char:
+                end += 2 if source[end] == '\\' else 1
+            index = end + 1
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return len(source)
+
+def function_body(source, start):
+    """Corpo de uma função cuja definição começa em start (function, arrow com ou sem chavetas)"""
+    brace = source.find('{', start)
+    arrow = source.find('=>', start)
+    if arrow >= 0 and (brace < 0 or arrow < brace):
+        rest = source[arrow + 2:].lstrip()
+        if not rest.startswith('{'):
+            # Arrow de expressão: até ao fim da instrução
+            end = re.search(r'[;\n]', rest)
+            return rest[:end.start()] if end else rest
+        brace = source.find('{', arrow)
+    if brace < 0:
+        return ''
+    return source[brace:matching_brace(source, brace)]
+
+def function_definitions(source):
+    """Funções com nome definidas no script: nome -> corpo"""
+    definitions = {}
+    patterns = [
+        r'function\s+([A-Za-z_$][\w$]*)\s*\(',
+        r'(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^()]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)',
+    ]
+    for pattern in patterns:
+        for match in re.finditer(pattern, source):
+            definitions.setdefault(match.group(1), function_body(source, match.start()))
+    return definitions
+
+def handler_bodies(source, start, definitions):
+    """
+    Código que corre a cada evento: o handler passado em start e as funções
+    que ele chama ou agenda (requestAnimationFrame(update)), recursivamente
+    """
+    rest = source[start:]
+    name = IDENTIFIER_RE.match(rest)
+    if name and name.group() not in ('function', 'async') and not rest[name.end():].lstrip().startswith('=>'):
+        pending, bodies = [name.group()], []
+    else:
+        pending, bodies = [], [function_body(source, start)]
+
+    seen = set()
+    while pending or bodies:
+        if pending:
+            current = pending.pop()
+            if current in seen or current not in definitions:
+                continue
+            seen.add(current)
+            bodies.append(definitions[current])
+        body = bodies.pop()
+        yield body
+        pending.extend(identifier for identifier in IDENTIFIER_RE.findall(body)
+                       if identifier in definitions and identifier not in seen)
+
+def listener_options(source, start):
+    """Texto depois do handler, até ao fim da chamada a addEventListener"""
+    depth = 1
+    index = start
+    while index < len(source) and depth:
+        if source[index] in '([{':
+            depth += 1
+        elif source[index] in ')]}':
+            depth -= 1
+        index += 1
+    return source[start:index]
+
+def check_script(source):
+    """Avisos de um script: lista de textos"""
+    warnings = []
+    if not SCROLL_LISTENER_RE.search(source):
+        return warnings
+    definitions = function_definitions(source)
+    for match in SCROLL_LISTENER_RE.finditer(source):
+        reads = set()
+        for body in handler_bodies(source, match.end(), definitions):
+            reads.update(found.group(1) or found.group(2) for found in LAYOUT_READS.finditer(body))
+        line = source.count('\n', 0, match.start()) + 1
+        if reads:
+            warnings.append(f"linha {line}: listener de scroll lê o layout a cada evento "
+                            f"({', '.join(sorted(reads))})")
+        if 'passive' not in listener_options(source, match.end()):
+            warnings.append(f"linha {line}: listener de scroll não é passivo")
+    return warnings
+
+def page_scripts(html, page_path):
+    """Scripts de uma página: (origem, código) dos embutidos e dos locais"""
+    scripts = [(f"{page_path} <script> #{index}", code)
+               for index, code in enumerate(INLINE_SCRIPT_RE.findall(html), 1)]
+    base = os.path.dirname(page_path)
+    for src in LOCAL_SCRIPT_RE.findall(html):
+        path = os.path.normpath(os.path.join(base, src))
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                scripts.append((path.replace(os.sep, '/'), f.read()))
+    return scripts
+
+def check_pages(page_paths):
+    """
+    Verifica as páginas indicadas. Devolve {página: [avisos]}; cada script
+    local partilhado é verificado uma única vez.
+    """
+    results = {}
+    checked = set()
+    for page_path in page_paths:
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        for origin, code in page_scripts(html, page_path):
+            if origin in checked:
+                continue
+            checked.add(origin)
+            for warning in check_script(code):
+                results.setdefault(page_path, []).append(f"{origin}, {warning}")
+    return results
+
+def find_pages():
+    return [path for pattern in PAGE_GLOBS for path in sorted(glob.glob(pattern))]
+
+def print_report(results, page_count):
+    if not results:
+        print(f"\n🧭 Scroll: nenhum handler lê o layout a cada evento ({page_count} páginas)")
+        return
+    print(f"\n🧭 Scroll: {len(results)} de {page_count} páginas com handlers que forçam layout:")
+    for page_path, warnings in results.items():
+        for warning in warnings:
+            print(f"   ⚠️  {warning}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Assinala handlers de scroll que leem o layout a cada evento")
+    parser.add_argument('pages', nargs='*', help="Páginas a verificar (por omissão, todas)")
+    args = parser.parse_args()
+
+    pages = args.pages
+    if pages:
+        results = check_pages(pages)
+    else:
+        with in_deploy():
+            pages = find_pages()
+            results = check_pages(pages)
+    print_report(results, len(pages))
+    if results:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
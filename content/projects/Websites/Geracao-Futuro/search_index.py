@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Índice de pesquisa offline dos guias e apresentações
+- Divide cada guia em secções (um título h1-h4 e o texto até ao seguinte);
+  cada secção aponta para o id do seu título ou, se não tiver, para o do
+  último título com id antes dela
+- As apresentações entram pelo título da sessão (o conteúdo está em
+  bundles JavaScript)
+- Normaliza as palavras como o hub faz na pesquisa: minúsculas, sem
+  acentos ("robôs" e "robos" são a mesma), sem palavras vazias ("de",
+  "para", ...) e com um stemming leve do português (plurais e vogal final:
+  "sensores" e "sensor" dão "sensor"); as regras vão no índice, para o
+  JavaScript do hub as aplicar da mesma forma
+- Grava um índice invertido por módulo em assets/search.m<N>.<hash>.json e
+  um ficheiro de entrada assets/search.<hash>.json com as regras, os shards
+  e uma tabela que diz, para cada prefixo de 4 letras, que shards têm
+  termos que começam por ele
+- O hub só descarrega a entrada quando se usa a caixa de pesquisa, com o
+  shard do módulo atual; os outros só quando uma pesquisa precisa deles
+- As palavras de cada shard estão ordenadas, para a pesquisa por prefixo
+  (enquanto se escreve) ser uma pesquisa binária
+
+Uso:
+    python3 search_index.py
+    python3 search_index.py "seguidor de linha"     # pesquisa de teste no índice já gerado
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+from build_manifest import text_hash
+from deploy import ASSETS_DIR, in_deploy
+from dom_transform import Page
+from guide_styles import find_guides
+from hub_catalog import load_catalog, search_entry
+
+INDEX_VERSION = 2
+# Letras dos prefixos da tabela que encaminha cada termo para os seus shards
+ROUTE_CHARS = 4
+# Título e excerto de cada resultado: o excerto só completa títulos curtos
+HEADING_CHARS = 90
+SNIPPET_CHARS = 120
+MIN_SNIPPET_CHARS = 30
+
+# Peso de uma palavra no título da secção, face a uma no texto
+HEADING_WEIGHT = 3
+
+# Palavras sem acentos, como ficam depois de fold()
+STOPWORDS = sorted({
+    'a', 'ao', 'aos', 'as', 'com', 'como', 'da', 'das', 'de', 'do', 'dos', 'e', 'ela', 'ele', 'em',
+    'entre', 'essa', 'esse', 'esta', 'este', 'eu', 'isso', 'isto', 'ja', 'lhe', 'mais', 'mas', 'me',
+    'na', 'nas', 'nao', 'no', 'nos', 'o', 'os', 'ou', 'para', 'pela', 'pelo', 'por', 'que', 'se',
+    'sem', 'ser', 'seu', 'sua', 'te', 'um', 'uma', 'umas', 'uns',
+})
+STOPWORD_SET = frozenset(STOPWORDS)
+
+# Stemming leve: em cada passo aplica-se a primeira regra cujo sufixo
+# termina a palavra, se sobrarem pelo menos STEM_MIN letras
+STEM_MIN = 3
+STEM_STEPS = [
+    # Plurais
+    [['oes', 'ao'], ['aes', 'ao'], ['ais', 'al'], ['eis', 'el'], ['ois', 'ol'], ['ns', 'm'],
+     ['res', 'r'], ['zes', 'z'], ['les', 'l'], ['ss', 'ss'], ['us', 'us'], ['s', '']],
+    # Vogal final (género)
+    [['a', ''], ['o', ''], ['e', '']],
+]
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+COMBINING_RE = re.compile('[\u0300-\u036f]')
+GUIDE_PATH_RE = re.compile(r'resources/modulo(\d+)/(?:sessao(\d+)|estrutura)-guia\.html$')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4')
+SKIPPED_TAGS = ('script', 'style', 'nav', 'aside', 'header', 'footer', 'button', 'svg')
+LEADING_SYMBOLS_RE = re.compile(r'^\W+')
+
+def fold(text):
+    """Minúsculas e sem acentos, como no hub (NFD sem as marcas U+0300–U+036F)"""
+    return COMBINING_RE.sub('', unicodedata.normalize('NFD', text.lower()))
+
+@lru_cache(maxsize=None)
+def stem(word):
+    for rules in STEM_STEPS:
+        for suffix, replacement in rules:
+            if word.endswith(suffix):
+                if len(word) - len(suffix) >= STEM_MIN:
+                    word = word[:len(word) - len(suffix)] + replacement
+                break
+    return word
+
+def terms(text):
+    """Termos do índice para um texto"""
+    return [stem(word) for word in WORD_RE.findall(fold(text)) if word not in STOPWORD_SET]
+
+def clean_text(text):
+    return ' '.join(text.split())
+
+def shorten(text, limit):
+    return text if len(text) <= limit else text[:limit - 1].rsplit(' ', 1)[0] + '…'
+
+def heading_text(heading):
+    """Texto de um título, sem a etiqueta da categoria nem os emojis iniciais"""
+    parts = [heading.text or '']
+    for child in heading:
+        if 'category-label' not in (child.get('class') or ''):
+            parts.append(child.text_content())
+        parts.append(child.tail or '')
+    return LEADING_SYMBOLS_RE.sub('', clean_text(''.join(parts)))
+
+def guide_sections(html):
+    """
+    Secções de um guia: [(âncora ou None, título, subtítulos, texto)]. Só os
+    títulos com id abrem uma secção (são os destinos dos links); os outros
+    ficam nos subtítulos da secção onde estão.
+    """
+    page = Page(html)
+    main = page.first('//main')
+    sections = [[None, '', [], []]]
+
+    def walk(el):
+        for child in el:
+            if not isinstance(child.tag, str):
+                pass
+            elif child.tag in HEADING_TAGS:
+                if child.get('id'):
+                    sections.append([child.get('id'), heading_text(child), [], []])
+                elif not sections[-1][1]:
+                    sections[-1][1] = heading_text(child)
+                else:
+                    sections[-1][2].append(heading_text(child))
+            elif child.tag not in SKIPPED_TAGS:
+                sections[-1][3].append(child.text or '')
+                walk(child)
+            sections[-1][3].append(child.tail or '')
+
+    walk(main if main is not None else page.first('//body'))
+    return [(anchor, heading, ' '.join(subheadings), clean_text(' '.join(texts)))
+            for anchor, heading, subheadings, texts in sections
+            if heading or subheadings or ''.join(texts).strip()]
+
+def session_labels(catalog):
+    """Nome de cada sessão para os resultados: {(módulo, sessão): 'Módulo N · Sessão M: título'}"""
+    return {(session['moduleId'], session['number']): f"{session['moduleTitle']} · {session['title']}"
+            for session in catalog['sessions']}
+
+def collect_documents(guide_paths, catalog, modules=None):
+    """
+    Documentos por módulo, só dos módulos indicados (todos, sem modules):
+    {módulo: [(url, nome da página, título, subtítulos, texto)]}
+    """
+    labels = session_labels(catalog)
+    documents = {}
+    for session in catalog['sessions']:
+        if modules is not None and session['moduleId'] not in modules:
+            continue
+        label = labels[(session['moduleId'], session['number'])]
+        documents.setdefault(session['moduleId'], []).append(
+            (session['url'], label, f"Apresentação · {session['title']}", '', ''))
+    for path in guide_paths:
+        match = GUIDE_PATH_RE.search(path.replace(os.sep, '/'))
+        if not match:
+            continue
+        module_num = int(match.group(1))
+        if modules is not None and module_num not in modules:
+            continue
+        if match.group(2):
+            label = labels.get((module_num, int(match.group(2))), f"Módulo {module_num} · Sessão {match.group(2)}")
+        else:
+            label = f"Módulo {module_num} · Estrutura"
+        with open(path, 'r', encoding='utf-8') as f:
+            sections = guide_sections(f.read())
+        url = path.replace(os.sep, '/')
+        for anchor, heading, subheadings, text in sections:
+            documents.setdefault(module_num, []).append(
+                (f"{url}#{anchor}" if anchor else url, label, heading or label, subheadings, text))
+    return documents
+
+def shard_inputs(guide_paths, catalog):
+    """Hash do que entra no shard de cada módulo (as sessões do catálogo e os guias): {módulo: hash}"""
+    texts = {}
+    for session in catalog['sessions']:
+        texts.setdefault(session['moduleId'], []).append(json.dumps(session, ensure_ascii=False, sort_keys=True))
+    for path in guide_paths:
+        match = GUIDE_PATH_RE.search(path.replace(os.sep, '/'))
+        if not match:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.setdefault(int(match.group(1)), []).extend([path.replace(os.sep, '/'), f.read()])
+    return {module_num: text_hash(*module_texts) for module_num, module_texts in texts.items()}
+
+def build_shard(documents):
+    """
+    Shard de um módulo: {'pages': [[url da página, nome]], 'docs': [[página,
+    âncora, título, excerto]], 'terms': [termos ordenados], 'postings':
+    [[doc, peso, doc, peso, ...] por termo]}
+    """
+    pages = []
+    page_index = {}
+    docs = []
+    postings = {}
+    for url, label, heading, subheadings, text in documents:
+        page_url, _, anchor = url.partition('#')
+        if page_url not in page_index:
+            page_index[page_url] = len(pages)
+            pages.append([page_url, label])
+        doc = len(docs)
+        heading = shorten(heading, HEADING_CHARS)
+        room = SNIPPET_CHARS - len(heading)
+        docs.append([page_index[page_url], anchor, heading, shorten(text, room) if room >= MIN_SNIPPET_CHARS else ''])
+        weights = {}
+        for term in terms(f"{heading} {subheadings}"):
+            weights[term] = weights.get(term, 0) + HEADING_WEIGHT
+        for term in terms(text):
+            weights[term] = weights.get(term, 0) + 1
+        for term, weight in weights.items():
+            postings.setdefault(term, []).extend([doc, weight])
+    ordered = sorted(postings)
+    return {'pages': pages, 'docs': docs, 'terms': ordered, 'postings': [postings[term] for term in ordered]}
+
+def write_json(prefix, data):
+    """Grava data em assets/<prefix>.<hash>.json; devolve o nome do ficheiro"""
+    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    name = f"{prefix}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]}.json"
+    path = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return name
+
+def route_table(routes):
+    """Prefixos agrupados pelos shards onde aparecem: [[máscara de shards, 'pre pre ...']]"""
+    groups = {}
+    for prefix, mask in routes.items():
+        groups.setdefault(mask, []).append(prefix)
+    return [[mask, ' '.join(sorted(prefixes))] for mask, prefixes in sorted(groups.items())]
+
+def load_routes(entry):
+    return {prefix: mask for mask, prefixes in entry['routes'] for prefix in prefixes.split()}
+
+def query_shards(entry, routes, words):
+    """Posições dos shards que têm todas as palavras (a última como prefixo)"""
+    if not words:
+        return []
+    mask = (1 << len(entry['shards'])) - 1
+    for position, word in enumerate(words):
+        last = position == len(words) - 1
+        if len(word) >= entry['route']:
+            mask &= routes.get(word[:entry['route']], 0)
+            continue
+        found = 0
+        for prefix, shards in routes.items():
+            if prefix == word or (last and prefix.startswith(word)):
+                found |= shards
+        mask &= found
+    return [position for position in range(len(entry['shards'])) if mask >> position & 1]
+
+def build_search_index(guide_paths=None, catalog=None, memo=None):
+    """
+    Escreve os shards e o ficheiro de entrada do índice e apaga os antigos.
+    Devolve o relatório: {'path', 'shards': {módulo: (ficheiro, documentos,
+    termos, bytes)}}. memo ({módulo: [hash, shard]}, ver build_guides.py)
+    guarda o shard de cada módulo e o hash de shard_inputs de que saiu; os
+    módulos que não mudaram ficam com o mesmo shard.
+    """
+    catalog = catalog or load_catalog()
+    guide_paths = guide_paths if guide_paths is not None else find_guides()
+    memo = {} if memo is None else memo
+    inputs = shard_inputs(guide_paths, catalog)
+    reused = {}
+    for module_num, digest in inputs.items():
+        known = memo.get(str(module_num))
+        if known and known[0] == digest and os.path.exists(os.path.join(ASSETS_DIR, known[1][0])):
+            reused[module_num] = tuple(known[1])
+    documents = collect_documents(guide_paths, catalog, set(inputs) - set(reused))
+    shards = {}
+    routes = {}
+    memo.clear()
+    for position, module_num in enumerate(sorted(set(documents) | set(reused))):
+        if module_num in reused:
+            shards[module_num] = reused[module_num]
+            with open(os.path.join(ASSETS_DIR, reused[module_num][0]), 'r', encoding='utf-8') as f:
+                shard_terms = json.load(f)['terms']
+        else:
+            shard = build_shard(documents[module_num])
+            name = write_json(f"search.m{module_num}", shard)
+            shards[module_num] = (name, len(shard['docs']), len(shard['terms']),
+                                  os.path.getsize(os.path.join(ASSETS_DIR, name)))
+            shard_terms = shard['terms']
+        memo[str(module_num)] = [inputs[module_num], shards[module_num]]
+        for term in shard_terms:
+            routes[term[:ROUTE_CHARS]] = routes.get(term[:ROUTE_CHARS], 0) | 1 << position
+
+    entry = {
+        'version': INDEX_VERSION,
+        'stopwords': STOPWORDS,
+        'stem': {'min': STEM_MIN, 'steps': STEM_STEPS},
+        'shards': [[module_num, name] for module_num, (name, *_) in shards.items()],
+        'route': ROUTE_CHARS,
+        'routes': route_table(routes),
+    }
+    name = write_json('search', entry)
+    keep = {name} | {shard[0] for shard in shards.values()}
+    for old in glob.glob(os.path.join(ASSETS_DIR, 'search.*.json')):
+        if os.path.basename(old) not in keep:
+            os.remove(old)
+    return {'path': os.path.join(ASSETS_DIR, name).replace(os.sep, '/'), 'shards': shards}
+
+def search(query, index_path, limit=8):
+    """
+    A mesma pesquisa que o hub: todos os termos, o último como prefixo, só
+    nos shards que a tabela de prefixos indica
+    """
+    with open(index_path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    words = terms(query)
+    results = []
+    for index in query_shards(entry, load_routes(entry), words):
+        _, name = entry['shards'][index]
+        with open(os.path.join(os.path.dirname(index_path), name), 'r', encoding='utf-8') as f:
+            shard = json.load(f)
+        scores = None
+        for position, word in enumerate(words):
+            last = position == len(words) - 1
+            found = {}
+            for term, posting in zip(shard['terms'], shard['postings']):
+                if term == word or (last and term.startswith(word)):
+                    for doc, weight in zip(posting[::2], posting[1::2]):
+                        found[doc] = found.get(doc, 0) + weight
+            scores = found if scores is None else {doc: score + found[doc] for doc, score in scores.items() if doc in found}
+        for doc, score in (scores or {}).items():
+            page, anchor, heading, _ = shard['docs'][doc]
+            url, label = shard['pages'][page]
+            results.append((score, f"{url}#{anchor}" if anchor else url, label, heading))
+    return sorted(results, key=lambda result: -result[0])[:limit]
+
+def print_report(report):
+    shards = report['shards']
+    total = sum(size for *_, size in shards.values())
+    print(f"\n🔎 Índice de pesquisa: {sum(docs for _, docs, _, _ in shards.values())} secções em "
+          f"{len(shards)} shards ({total / 1024:.1f} KB) → {report['path']}")
+    for module_num, (name, docs, term_count, size) in shards.items():
+        print(f"   {name:<32}{docs:>6} secções{term_count:>7} termos{size / 1024:>8.1f} KB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o índice de pesquisa dos guias para o hub")
+    parser.add_argument('query', nargs='?', help="Pesquisa de teste no índice já gerado (não o refaz)")
+    args = parser.parse_args()
+
+    with in_deploy():
+        if not args.query:
+            print_report(build_search_index())
+            return
+
+        path = search_entry()
+        if path is None:
+            print("❌ Sem índice de pesquisa: gere-o primeiro com python3 search_index.py")
+            sys.exit(1)
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        read = query_shards(entry, load_routes(entry), terms(args.query))
+        print(f"🔎 Resultados para “{args.query}” em {path} ({len(read)} de {len(entry['shards'])} shards lidos):")
+        for score, url, label, heading in search(args.query, path):
+            print(f"   {score:>4}  {label} — {heading}\n         {url}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Representação intermédia (IR) das sessões
+- Uma sessão é uma lista de secções categorizadas; cada secção guarda os seus
+  blocos (parágrafos, itens de lista, subtítulos) em dois arrays paralelos:
+  os tipos num bytearray e os textos numa lista
+- Construída uma única vez a partir do docx (via docx_cache) e guardada em
+  cache no disco (.cache/ir/<hash>.json), num formato compacto
+- É a origem comum de todos os geradores: nenhum precisa de voltar ao docx
+  nem de inventar a sua própria estrutura
+
+Uso:
+    python3 session_ir.py   # resumo de todas as sessões, lido apenas da IR
+"""
+
+import re
+
+from build_manifest import file_hash
+from docx_cache import cache_path, load_document, read_cache, write_cache
+from keyword_classifier import NAV_GROUPS, TABLES, classify
+
+IR_DIR = '.cache/ir'
+
+# Versão do formato da IR; incrementar sempre que build_session mudar
+IR_VERSION = 2
+
+# Tipos de bloco (um byte cada no array de tipos)
+PARAGRAPH = ord('p')
+LIST_ITEM = ord('u')
+ORDERED_ITEM = ord('o')
+SUBHEADING = ord('h')
+
+LIST_KINDS = (LIST_ITEM, ORDERED_ITEM)
+
+ORDERED_RE = re.compile(r'^\d+[\.)]\s')
+# Duração de uma atividade num título: "Teasing (30 min)", "90 minutos"
+DURATION_RE = re.compile(r'(\d+)\s*(min|minutos)', re.IGNORECASE)
+# Início de um intervalo do plano da sessão: "Aquecimento (10–25 min)"
+SLOT_START_RE = re.compile(r'(\d+)\s*[–-]\s*$')
+# Títulos sobre um vídeo: a duração é a do vídeo, não a de uma atividade
+VIDEO_RE = re.compile(r'\bv[íi]deo', re.IGNORECASE)
+# Título do Word que é o da própria sessão: "🤖 Sessão 2 – Programar um Robô"
+SESSION_TITLE_RE = re.compile(r'^\W*Sessão\s*\d+\s*[–—:-]')
+WORD_RE = re.compile(r'\w+')
+LABEL_START_RE = re.compile(r'^\W+')
+LABEL_END_RE = re.compile(r'[\s:–—-]+$')
+LIST_MARKER_RE = re.compile(r'^[•\-\d+\.)]\s*')
+
+def list_item_text(text):
+    """Texto de um item de lista, sem o marcador (•, -, 1.)"""
+    return LIST_MARKER_RE.sub('', text)
+
+class Section:
+    """Secção de uma sessão: título (None no preâmbulo), categoria e blocos"""
+
+    __slots__ = ('title', 'icon', 'category', 'kinds', 'texts')
+
+    def __init__(self, title, kinds=None, texts=None):
+        self.title = title
+        if title is not None:
+            classification = classify(title)
+            self.icon = classification.heading_icon
+            self.category = classification.category
+        else:
+            self.icon = self.category = None
+        self.kinds = bytearray(kinds or b'')
+        self.texts = texts if texts is not None else []
+
+    def add(self, kind, text):
+        self.kinds.append(kind)
+        self.texts.append(text)
+
+    def blocks(self):
+        """Percorre os blocos como pares (tipo, texto)"""
+        return zip(self.kinds, self.texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+class Session:
+    """
+    Sessão: título e secções, pela ordem do documento. word_headings são os
+    títulos com estilo de título no Word (Heading N), a estrutura real do
+    documento: as secções abrem também em parágrafos a negrito, que são
+    texto, e os títulos com "Sessão" ficam como subtítulos.
+    """
+
+    __slots__ = ('title', 'sections', 'word_headings')
+
+    def __init__(self, title, sections, word_headings=None):
+        self.title = title
+        self.sections = sections
+        self.word_headings = word_headings if word_headings is not None else []
+
+    def texts(self):
+        """Todos os textos (títulos e blocos) pela ordem do documento"""
+        for section in self.sections:
+            if section.title is not None:
+                yield section.title
+            yield from section.texts
+
+    def headings(self):
+        """Títulos das secções e subtítulos, pela ordem do documento"""
+        for section in self.sections:
+            if section.title is not None:
+                yield section.title
+            yield from (text for kind, text in section.blocks() if kind == SUBHEADING)
+
+    def word_count(self):
+        return sum(len(WORD_RE.findall(text)) for text in self.texts())
+
+    def durations(self):
+        """
+        Atividades com duração nos títulos das secções, sem repetidos:
+        [(nome, minutos)]. Só conta a primeira linha de cada título, com a
+        duração entre parênteses ("Teasing (30 min)"): as outras linhas de
+        um parágrafo a negrito são texto, como a duração de um vídeo
+        sugerido, e "Duração: 90 minutos" não nomeia uma atividade. Um
+        intervalo do plano ("(10–25 min)") conta como a diferença; fora de
+        um intervalo, a duração de um vídeo ("vídeo curto (máx. 1 min)")
+        não é a de uma atividade.
+        """
+        found = []
+        for section in self.sections:
+            if section.title is None or not section.title.strip():
+                continue
+            line = section.title.strip().splitlines()[0]
+            match = DURATION_RE.search(line)
+            if not match:
+                continue
+            # A duração tem de estar dentro de um parêntese ainda aberto
+            if line.rfind('(', 0, match.start()) <= line.rfind(')', 0, match.start()):
+                continue
+            label = line[:match.start()].partition('(')[0]
+            label = LABEL_END_RE.sub('', LABEL_START_RE.sub('', ' '.join(label.split())))
+            start = SLOT_START_RE.search(line, 0, match.start())
+            if not label or (VIDEO_RE.search(label) and not start):
+                continue
+            minutes = int(match.group(1)) - (int(start.group(1)) if start else 0)
+            if minutes > 0 and (label, minutes) not in found:
+                found.append((label, minutes))
+        return found
+
+    def outline(self):
+        """
+        Grupos da barra lateral dos guias com o número de títulos do Word em
+        cada um (sem o título da sessão): [(grupo, títulos)]. Só sem nenhum
+        título com estilo no Word contam os títulos de todas as secções.
+        """
+        titles = [heading for heading in self.word_headings
+                  if WORD_RE.search(heading) and not SESSION_TITLE_RE.match(heading)]
+        if not titles:
+            titles = [section.title for section in self.sections if section.title is not None]
+        counts = {}
+        for title in titles:
+            group = classify(title).nav_group
+            counts[group] = counts.get(group, 0) + 1
+        order = [group for _, group in NAV_GROUPS] + [TABLES['nav_group'][1]]
+        return [(group, counts[group]) for group in order if group in counts]
+
+    def to_data(self):
+        """Forma compacta para a cache: cada secção é [título, tipos, textos]"""
+        return {
+            'version': IR_VERSION,
+            'title': self.title,
+            'sections': [
+                [section.title, section.kinds.decode('ascii'), section.texts]
+                for section in self.sections
+            ],
+            'word_headings': self.word_headings,
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        sections = [
+            Section(title, kinds.encode('ascii'), texts)
+            for title, kinds, texts in data['sections']
+        ]
+        return cls(data['title'], sections, data['word_headings'])
+
+def is_heading(para):
+    """Parágrafo com estilo de título ou com uma run a negrito com texto"""
+    return para['style'].startswith('Heading') or bool(
+        para['runs'] and any(bold and len(run_text.strip()) > 5 for run_text, bold in para['runs'])
+    )
+
+def build_session(document):
+    """Constrói a IR de uma sessão a partir do documento analisado (docx_cache)"""
+    preamble = Section(None)
+    sections = [preamble]
+    current = preamble
+    word_headings = []
+
+    for para in document['paragraphs']:
+        text = para['text'].strip()
+        if not text:
+            continue
+
+        if is_heading(para):
+            if para['style'].startswith('Heading'):
+                word_headings.append(text)
+            # Títulos com "Sessão" ficam como subtítulo da secção atual
+            if 'Sessão' in text:
+                current.add(SUBHEADING, text)
+            else:
+                current = Section(text)
+                sections.append(current)
+        elif text.startswith('•') or text.startswith('-') or ORDERED_RE.match(text):
+            current.add(ORDERED_ITEM if ORDERED_RE.match(text) else LIST_ITEM, text)
+        else:
+            current.add(PARAGRAPH, text)
+
+    if not preamble.texts:
+        sections.pop(0)
+    return Session(document['title'], sections, word_headings)
+
+def load_session(docx_path):
+    """Devolve a IR de um docx, a partir da cache sempre que possível"""
+    digest = file_hash(docx_path)
+    path = cache_path(digest, IR_DIR)
+    data = read_cache(path, IR_VERSION)
+    if data is not None:
+        return Session.from_data(data)
+
+    session = build_session(load_document(docx_path, digest))
+    write_cache(path, session.to_data())
+    return session
+
+def main():
+    from generate_all_guides import word_files
+
+    for module_num, sessions in word_files.items():
+        print(f"📚 Módulo {module_num}")
+        for word_filename, session_num in sessions:
+            session = load_session(f"resources/modulo{module_num}/{word_filename}")
+            blocks = sum(len(section) for section in session.sections)
+            categories = sorted({section.category for section in session.sections if section.category})
+            print(f"  • Sessão {session_num}: {len(session.sections)} secções, {blocks} blocos"
+                  f" ({', '.join(categories)})")
+
+if __name__ == '__main__':
+    main()
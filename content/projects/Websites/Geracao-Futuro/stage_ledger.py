@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Registo das etapas aplicadas a cada guia
+- Cada etapa do pipeline deixa no HTML uma marca com o seu nome e versão:
+  <!-- build-stages: premium_design=1 restructure_topics=1 ... -->
+- Uma etapa já aplicada nessa versão não volta a ser aplicada, por isso
+  correr os scripts (ou o build) duas vezes não faz crescer as páginas
+- Cada script de etapa define STAGE_NAME e STAGE_VERSION; a versão deve ser
+  incrementada sempre que a transformação mudar, para ser reaplicada
+"""
+
+import re
+
+LEDGER_RE = re.compile(r'<!-- build-stages: ([^>]*?) -->\n?')
+DOCTYPE_RE = re.compile(r'<!DOCTYPE html>\n?', re.IGNORECASE)
+
+def applied_stages(html):
+    """Etapas registadas no HTML, como {nome: versão}"""
+    match = LEDGER_RE.search(html)
+    if not match:
+        return {}
+    stages = {}
+    for entry in match.group(1).split():
+        name, _, version = entry.partition('=')
+        if version.isdigit():
+            stages[name] = int(version)
+    return stages
+
+def stamp(html, stages):
+    """Grava o registo de etapas no HTML, logo após o DOCTYPE"""
+    html = LEDGER_RE.sub('', html, count=1)
+    ledger = '<!-- build-stages: ' + ' '.join(f"{name}={version}" for name, version in stages.items()) + ' -->\n'
+    match = DOCTYPE_RE.match(html)
+    if match:
+        return html[:match.end()] + ('' if match.group(0).endswith('\n') else '\n') + ledger + html[match.end():]
+    return ledger + html
+
+def run_stage(html, name, version, transform):
+    """
+    Aplica uma etapa se ainda não estiver registada nesta versão e regista-a.
+    Devolve (html, aplicada).
+    """
+    stages = applied_stages(html)
+    if stages.get(name) == version:
+        return html, False
+
+    # Algumas etapas regeneram a página inteira: o registo é reposto no fim
+    html = transform(html)
+    stages.update(applied_stages(html))
+    stages[name] = version
+    return stamp(html, stages), True
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Gerador de cursos sintéticos para benchmark
+- Cria módulos e sessões em Word com a forma dos documentos reais
+  (M3 - Sessão N.docx): título da sessão, resumo com runs a negrito,
+  secções com estilo de título ou a negrito, parágrafos, listas com
+  marcador e numeradas, tabelas e imagens
+- O documento de estrutura de cada módulo segue "Módulo N - Estrutura.docx"
+- O conteúdo é pseudo-aleatório mas determinístico (--seed): o mesmo
+  pedido gera sempre o mesmo curso
+- Escreve course.json com a lista de documentos, lido por bench.py
+
+Uso:
+    python3 synthetic_course.py --modules 50 --sessions 6 --root .bench/curso-50x6
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import zlib
+
+from docx import Document
+from docx.shared import Cm
+
+COURSE_FILE = 'course.json'
+
+WORDS = (
+    "algoritmo sequência condição ciclo variável evento sensor robô jogo desafio "
+    "formando formador grupo equipa projeto ideia ecrã bloco código programa dados "
+    "imagem som música vídeo história personagem cenário regra pontuação tempo "
+    "criar testar explicar partilhar desenhar observar comparar melhorar decidir "
+    "simples criativo digital interativo colaborativo rápido claro novo final "
+    "inteligência artificial máquina computador internet aplicação ferramenta "
+    "passo ação resultado exemplo pergunta resposta erro solução reflexão"
+).split()
+
+EMOJIS = ['🎯', '💡', '🧩', '🧠', '🧰', '🚀', '🎬', '📄', '📊', '🌟', '🗨️', '⚙️', '🎮']
+
+# Secções de uma sessão: (título, usa estilo de título)
+SESSION_SECTIONS = [
+    ("🧠 Guião do Formador (90 min)", True),
+    ("🎯 Objetivos da Sessão", False),
+    ("💡 Competências a Desenvolver", False),
+    ("🧩 Estrutura da Sessão (90 minutos)", False),
+    ("🧰 Materiais e Recursos", False),
+    ("🎮 Atividade Teasing (30 min)", True),
+    ("🚀 Atividade Principal (40 min)", True),
+    ("🎬 Conteúdo dos Slides", True),
+    ("📄 Ficha de Atividade", True),
+    ("📊 Avaliação e Critérios", False),
+    ("🌟 Atividade de Enriquecimento", True),
+    ("🗨️ Perguntas de Reflexão", False),
+]
+
+# Tipos de bloco e o seu peso relativo (aproximado dos documentos reais)
+BLOCK_WEIGHTS = [
+    ('paragraph', 40),
+    ('bullet', 20),
+    ('numbered', 10),
+    ('term', 12),
+    ('empty', 12),
+    ('table', 3),
+    ('image', 1),
+]
+
+def sentence(rng, min_words=6, max_words=18):
+    """Frase pseudo-aleatória em português"""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return words[0].capitalize() + ' ' + ' '.join(words[1:]) + rng.choice(['.', '.', '.', '?', '!'])
+
+def title_words(rng, count=4):
+    return ' '.join(rng.choice(WORDS) for _ in range(count)).title()
+
+def png_bytes(width, height, seed):
+    """PNG RGB simples (gradiente), sem dependências externas"""
+    rows = []
+    for y in range(height):
+        row = bytearray([0])
+        for x in range(width):
+            row += bytes(((x * 255 // width + seed) % 256, (y * 255 // height) % 256, (seed * 37) % 256))
+        rows.append(bytes(row))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(b''.join(rows))) + chunk(b'IEND', b''))
+
+def add_bold_lead(doc, lead, rest, style=None):
+    """Parágrafo com uma introdução a negrito ("Teasing (30 min):") e texto normal"""
+    para = doc.add_paragraph(style=style)
+    para.add_run(lead).bold = True
+    para.add_run(' ' + rest)
+    return para
+
+def add_block(doc, rng, kind, image_path, counters):
+    if kind == 'paragraph':
+        doc.add_paragraph(' '.join(sentence(rng) for _ in range(rng.randint(1, 3))))
+    elif kind == 'bullet':
+        doc.add_paragraph('• ' + sentence(rng, 4, 12), style='List Paragraph')
+    elif kind == 'numbered':
+        counters['numbered'] += 1
+        doc.add_paragraph(f"{counters['numbered']}. " + sentence(rng, 4, 12))
+    elif kind == 'term':
+        add_bold_lead(doc, rng.choice(WORDS).capitalize() + ':', sentence(rng, 5, 14))
+    elif kind == 'empty':
+        doc.add_paragraph('')
+    elif kind == 'table':
+        rows, cols = rng.randint(3, 6), 3
+        table = doc.add_table(rows=rows, cols=cols)
+        for c, header in enumerate(['Área', 'Competência', 'Descrição']):
+            table.cell(0, c).text = header
+        for r in range(1, rows):
+            for c in range(cols):
+                table.cell(r, c).text = sentence(rng, 2, 8)
+    elif kind == 'image':
+        doc.add_picture(image_path, width=Cm(rng.choice([6, 8, 12])))
+
+def session_document(module_num, session_num, topic, rng, scale, image_path):
+    """Documento de uma sessão, com a estrutura de M3 - Sessão N.docx"""
+    doc = Document()
+    title = f"{rng.choice(EMOJIS)} Sessão {session_num} – {topic}"
+    doc.add_paragraph(title, style='TOC Heading').runs[0].bold = True
+    doc.add_paragraph('')
+    doc.add_paragraph(title)
+
+    # Resumo da sessão, como nos documentos reais
+    add_bold_lead(doc, 'Teasing (30 min):', sentence(rng), style='List Paragraph')
+    add_bold_lead(doc, 'Sessão síncrona (90 min):', sentence(rng), style='List Paragraph')
+    add_bold_lead(doc, 'Pós-sessão (90 min):', sentence(rng), style='List Paragraph')
+    add_bold_lead(doc, 'Competências:', sentence(rng), style='List Paragraph')
+    doc.add_paragraph('')
+
+    kinds = [kind for kind, _ in BLOCK_WEIGHTS]
+    weights = [weight for _, weight in BLOCK_WEIGHTS]
+    for section_title, is_heading in SESSION_SECTIONS:
+        if is_heading:
+            doc.add_heading(section_title, level=2)
+        else:
+            doc.add_paragraph().add_run(section_title).bold = True
+        counters = {'numbered': 0}
+        for kind in rng.choices(kinds, weights, k=max(1, round(rng.randint(20, 40) * scale))):
+            add_block(doc, rng, kind, image_path, counters)
+    return doc
+
+def structure_document(module_num, topics, rng):
+    """Documento de estrutura de um módulo (Módulo N - Estrutura.docx)"""
+    doc = Document()
+    para = doc.add_paragraph()
+    para.add_run('📘').bold = True
+    para.add_run(f" Módulo {module_num} – {title_words(rng)}").bold = True
+    add_bold_lead(doc, 'Total:', f"{len(topics)} sessões (cada com 30min + 90min + 90min)")
+    doc.add_paragraph('')
+    for session_num, topic in enumerate(topics, 1):
+        para = doc.add_paragraph()
+        para.add_run(rng.choice(EMOJIS)).bold = True
+        para.add_run(f" Sessão {session_num} – {topic}").bold = True
+        add_bold_lead(doc, 'Teasing (30 min):', sentence(rng))
+        add_bold_lead(doc, 'Sessão síncrona (90 min):', sentence(rng))
+        add_bold_lead(doc, 'Pós-sessão (90 min):', sentence(rng))
+        add_bold_lead(doc, 'Competências:', sentence(rng))
+        doc.add_paragraph('')
+    return doc
+
+def generate_course(root, modules, sessions, scale=1.0, seed=0):
+    """
+    Gera o curso em root/resources/moduloN/ e devolve a sua descrição
+    (também gravada em root/course.json)
+    """
+    rng = random.Random(seed)
+    image_path = os.path.join(root, 'imagem.png')
+    os.makedirs(root, exist_ok=True)
+    with open(image_path, 'wb') as f:
+        f.write(png_bytes(64, 48, seed))
+
+    course = {
+        'params': {'modules': modules, 'sessions': sessions, 'scale': scale, 'seed': seed},
+        'sessions': [],
+        'structures': [],
+    }
+    for module_num in range(1, modules + 1):
+        module_dir = os.path.join(root, 'resources', f'modulo{module_num}')
+        os.makedirs(module_dir, exist_ok=True)
+
+        topics = [title_words(rng) for _ in range(sessions)]
+        for session_num, topic in enumerate(topics, 1):
+            word_filename = f"M{module_num} - Sessão {session_num}.docx"
+            session_document(module_num, session_num, topic, rng, scale, image_path).save(
+                os.path.join(module_dir, word_filename))
+            course['sessions'].append([module_num, word_filename, session_num])
+
+        word_filename = f"Módulo {module_num} - Estrutura.docx"
+        structure_document(module_num, topics, rng).save(os.path.join(module_dir, word_filename))
+        course['structures'].append([module_num, word_filename])
+
+    with open(os.path.join(root, COURSE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(course, f, ensure_ascii=False, indent=2)
+    return course
+
+def load_course(root):
+    """Descrição de um curso já gerado (None se não existir)"""
+    path = os.path.join(root, COURSE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def add_course_arguments(parser):
+    """Opções comuns a este gerador e a bench.py"""
+    parser.add_argument('--modules', type=int, default=5, help="Número de módulos (por omissão, 5)")
+    parser.add_argument('--sessions', type=int, default=6, help="Sessões por módulo (por omissão, 6)")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Fator de tamanho de cada sessão (1.0 ≈ uma sessão real do Módulo 3)")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do conteúdo pseudo-aleatório")
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um curso sintético em Word para benchmark")
+    add_course_arguments(parser)
+    parser.add_argument('--root', required=True, help="Pasta onde criar o curso")
+    args = parser.parse_args()
+
+    course = generate_course(args.root, args.modules, args.sessions, args.scale, args.seed)
+    print(f"📚 Curso sintético em {args.root}: {args.modules} módulos, "
+          f"{len(course['sessions'])} sessões, {len(course['structures'])} estruturas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+CSS estático em vez do compilador Tailwind do CDN
+- As páginas carregavam https://cdn.tailwindcss.com, que descarrega o
+  compilador inteiro e gera o CSS no browser a cada visita
+- As folhas são geradas pelo Tailwind do projeto (tailwindcss e
+  @tailwindcss/postcss do package.json da raiz; npm install na raiz), com
+  um CSS de entrada por folha que diz que ficheiros ler (@source): as
+  páginas da origem e os scripts locais que elas carregam. Lê sempre a
+  origem, nunca a cópia publicada: o CSS crítico e a minificação não mudam
+  as classes encontradas, corra a etapa sozinha ou no build
+- Cada grupo de páginas (hub, apresentações, guias) tem as suas folhas, só
+  com as classes das suas páginas: os bundles Vite das apresentações não
+  engordam a folha dos guias. Dentro de um grupo, as páginas sem
+  tailwind.config partilham uma folha e cada configuração diferente tem a
+  sua (@config). A configuração fica na página como JSON inerte
+  (script#tailwind-config), para a folha poder ser refeita a partir das
+  páginas
+- Todas as folhas têm o hash do conteúdo no nome
+  (assets/tailwind-<grupo>[-<config>].<hash>.css), como os outros ficheiros
+  de assets/: podem ficar em cache para sempre
+- As classes do tailwindcss-animate que as apresentações usam (animate-in,
+  fade-in, zoom-in, slide-in-from-*, ...) são definidas no CSS de entrada
+- Só chama o Tailwind para as folhas cujas entradas (CSS de entrada,
+  configuração, páginas e scripts lidos, versão do Tailwind) mudaram; o
+  registo fica em tailwind.json
+- O build converte, na cópia publicada (ver deploy.py), as páginas que
+  ainda usam o CDN e liga-as às folhas; a origem continua a usar o CDN.
+  Sem o Tailwind instalado (ou sem node), as páginas publicadas ficam com
+  o CDN
+- Mostra o tamanho do CSS gerado face ao runtime do CDN e as classes sem regra
+
+Uso:
+    python3 tailwind_css.py             # gera as folhas e converte as páginas
+    python3 tailwind_css.py --unknown   # lista as classes sem regra
+"""
+
+import argparse
+import fnmatch
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+
+from deploy import ASSETS_DIR, in_deploy, source_path
+
+# Páginas que podem usar Tailwind, por grupo; cada grupo tem as suas folhas
+PAGE_GROUPS = [('hub', 'index.html'), ('presentations', 'modulo*/sessao*/index.html'),
+               ('guides', 'resources/modulo*/*.html')]
+PAGE_GLOBS = [pattern for _, pattern in PAGE_GROUPS]
+DEFAULT_GROUP = 'guides'
+
+# Registo das folhas geradas: entradas de cada uma e o ficheiro que saiu
+MANIFEST_PATH = 'tailwind.json'
+# CSS de entrada e configurações das folhas (na cópia publicada, não é publicado)
+WORK_DIR = '.tailwind'
+
+CDN_SCRIPT_RE = re.compile(r'[ \t]*<script src="https://cdn\.tailwindcss\.com[^"]*"></script>\n?')
+CONFIG_SCRIPT_RE = re.compile(r'<script>\s*tailwind\.config\s*=\s*(\{.*?\})\s*;?\s*</script>', re.S)
+CONFIG_ISLAND_RE = re.compile(r'<script type="application/json" id="tailwind-config">(.*?)</script>', re.S)
+STYLESHEET_LINK_RE = re.compile(
+    r'<link rel="stylesheet" href="([^"]*assets/tailwind-[a-z]+(?:-[0-9a-f]{8})?\.[0-9a-f]{8}\.css)"[^>]*>')
+LOCAL_STYLESHEET_RE = re.compile(r'<link rel="stylesheet" href="(?!https?:|//)([^"]+\.css)"')
+LOCAL_SCRIPT_RE = re.compile(r'<script[^>]*\ssrc="(?!https?:|//)([^"]+\.js)"')
+CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+STYLE_BLOCK_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.S)
+CSS_CLASS_RE = re.compile(r'\.(-?(?:\\.|[_a-zA-Z])(?:\\.|[\w-])*)')
+CSS_ESCAPE_RE = re.compile(r'\\(.)')
+# group, group/card, peer: marcadores das variantes group-*/peer-*, sem CSS próprio
+GROUP_MARKER_RE = re.compile(r'(group|peer)(/[\w-]+)?')
+
+# Classes montadas em tempo de execução (text-${colors.accent}-400 no hub),
+# que nenhum varrimento encontra, por grupo (@source inline)
+SAFELIST = {
+    'hub': ['{group-hover:,}text-{purple,cyan,pink,amber,emerald}-{100,400}'],
+}
+
+# As páginas foram escritas para o Tailwind v3 do CDN: bordas cinzentas por
+# omissão, como no v3 (guia de migração do v4)
+V3_COMPAT_CSS = """@layer base {
+  *, ::after, ::before, ::backdrop, ::file-selector-button {
+    border-color: var(--color-gray-200, currentColor);
+  }
+}
+"""
+
+# Subconjunto do tailwindcss-animate usado nas apresentações: animate-in com
+# fade-in, zoom-in, spin-in e slide-in-from-*, duration-*, delay-* e fill-mode-*
+ANIMATE_CSS = """@keyframes enter {
+  from {
+    opacity: var(--tw-enter-opacity, 1);
+    transform: translate3d(var(--tw-enter-translate-x, 0), var(--tw-enter-translate-y, 0), 0)
+      scale3d(var(--tw-enter-scale, 1), var(--tw-enter-scale, 1), var(--tw-enter-scale, 1))
+      rotate(var(--tw-enter-rotate, 0));
+  }
+}
+@utility animate-in {
+  animation: enter var(--tw-duration, 150ms) var(--tw-ease, ease) var(--tw-animation-delay, 0s);
+}
+@utility fade-in { --tw-enter-opacity: 0; }
+@utility fade-in-* { --tw-enter-opacity: calc(--value(integer) * 1%); }
+@utility zoom-in { --tw-enter-scale: 0; }
+@utility zoom-in-* { --tw-enter-scale: calc(--value(integer) * 1%); }
+@utility spin-in { --tw-enter-rotate: 30deg; }
+@utility spin-in-* { --tw-enter-rotate: calc(--value(integer) * 1deg); }
+@utility slide-in-from-top { --tw-enter-translate-y: -100%; }
+@utility slide-in-from-top-* { --tw-enter-translate-y: calc(--spacing(--value(integer)) * -1); }
+@utility slide-in-from-bottom { --tw-enter-translate-y: 100%; }
+@utility slide-in-from-bottom-* { --tw-enter-translate-y: --spacing(--value(integer)); }
+@utility slide-in-from-left { --tw-enter-translate-x: -100%; }
+@utility slide-in-from-left-* { --tw-enter-translate-x: calc(--spacing(--value(integer)) * -1); }
+@utility slide-in-from-right { --tw-enter-translate-x: 100%; }
+@utility slide-in-from-right-* { --tw-enter-translate-x: --spacing(--value(integer)); }
+@utility delay-* { --tw-animation-delay: calc(--value(integer) * 1ms); }
+@utility fill-mode-* { animation-fill-mode: --value('none', 'forwards', 'backwards', 'both'); }
+"""
+
+# Corre o @tailwindcss/postcss sobre cada CSS de entrada: lê [{css, from}]
+# do stdin e escreve a lista das folhas geradas, já minificadas, no stdout
+NODE_SCRIPT = """
+import { readFileSync } from 'node:fs';
+import postcss from 'postcss';
+import tailwindcss from '@tailwindcss/postcss';
+
+const jobs = JSON.parse(readFileSync(0, 'utf8'));
+const sheets = [];
+for (const job of jobs) {
+  const result = await postcss([tailwindcss({ optimize: { minify: true } })]).process(job.css, { from: job.from });
+  sheets.push(result.css);
+}
+process.stdout.write(JSON.stringify(sheets));
+"""
+
+# Tamanho aproximado do script do CDN (Tailwind Play CDN v3.4, minificado,
+# sem compressão); só serve de termo de comparação no relatório
+CDN_RUNTIME_KB = 400
+
+# --- Configuração das páginas (tailwind.config) ---
+
+JS_TOKEN_RE = re.compile(r"""\s+|//[^\n]*|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[{}\[\],:]|[A-Za-z_$][\w$-]*|-?\d+(?:\.\d+)?""")
+
+def parse_js_object(source):
+    """
+    Converte o literal de tailwind.config (JavaScript: chaves sem aspas,
+    strings com plicas, vírgulas finais) num dicionário
+    """
+    tokens = []
+    position = 0
+    while position < len(source):
+        match = JS_TOKEN_RE.match(source, position)
+        if not match:
+            raise ValueError(f"tailwind.config inválido perto de: {source[position:position + 30]!r}")
+        position = match.end()
+        token = match.group()
+        if token.isspace() or token.startswith('//'):
+            continue
+        tokens.append(token)
+
+    parts = []
+    for index, token in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else ''
+        if token == ',' and following in ('}', ']'):
+            continue
+        if token[0] in '\'"':
+            parts.append(json.dumps(token[1:-1].replace("\\'", "'")))
+        elif following == ':' and token not in '{}[],:':
+            parts.append(json.dumps(token))
+        elif token in ('true', 'false', 'null') or token in '{}[],:' or token[0] in '-0123456789':
+            parts.append(token)
+        else:
+            raise ValueError(f"tailwind.config com expressões não suportadas: {token}")
+    return json.loads(''.join(parts))
+
+# --- Tailwind instalado ---
+
+def tailwind_version():
+    """Versão do tailwindcss instalado (procura node_modules daqui para cima), ou None"""
+    directory = os.path.abspath(os.curdir)
+    while True:
+        path = os.path.join(directory, 'node_modules', 'tailwindcss', 'package.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('version')
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def run_tailwind(jobs):
+    """Gera as folhas de [{css, from}] numa só chamada ao node; devolve o CSS de cada uma"""
+    result = subprocess.run(['node', '--input-type=module', '-e', NODE_SCRIPT], input=json.dumps(jobs),
+                            capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise RuntimeError(f"o Tailwind falhou: {result.stderr.strip()}")
+    return json.loads(result.stdout)
+
+# --- Páginas ---
+
+def page_config(html):
+    """tailwind.config da página (script original ou JSON já convertido), ou None"""
+    match = CONFIG_ISLAND_RE.search(html)
+    if match:
+        return json.loads(match.group(1))
+    match = CONFIG_SCRIPT_RE.search(html)
+    if match:
+        return parse_js_object(match.group(1))
+    return None
+
+def page_group(page_path):
+    """Grupo de uma página (caminho desde a raiz): 'hub', 'presentations' ou 'guides'"""
+    for group, pattern in PAGE_GROUPS:
+        if fnmatch.fnmatchcase(page_path, pattern):
+            return group
+    return DEFAULT_GROUP
+
+def stylesheet_key(config, group=DEFAULT_GROUP):
+    """
+    Folha de um grupo e configuração: tailwind-<grupo> sem configuração e,
+    com ela, o hash dela no fim
+    """
+    if not config:
+        return f"tailwind-{group}"
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"tailwind-{group}-{digest[:8]}"
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(sheets, path=MANIFEST_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(sheets, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+def stylesheet_path(group=DEFAULT_GROUP, config=None):
+    """Folha gerada de um grupo e configuração (assets/...), ou None se ainda não existir"""
+    entry = load_manifest().get(stylesheet_key(config, group))
+    return entry['stylesheet'] if entry and os.path.exists(entry['stylesheet']) else None
+
+def link_stylesheet(html, page_path, stylesheet, root='.'):
+    """
+    Troca o script do CDN pela folha de estilos estática (caminho desde a
+    raiz) e o tailwind.config por JSON inerte. Em páginas já convertidas, só
+    acerta o caminho da folha (se o conteúdo, o grupo ou a configuração
+    mudaram).
+    """
+    href = os.path.relpath(os.path.join(root, stylesheet),
+                           os.path.dirname(os.path.join(root, page_path))).replace(os.sep, '/')
+    if not CDN_SCRIPT_RE.search(html):
+        return STYLESHEET_LINK_RE.sub(lambda match: match.group().replace(match.group(1), href), html)
+    config = page_config(html)
+    indent = re.search(r'([ \t]*)<script src="https://cdn\.tailwindcss\.com', html).group(1)
+    link = f'{indent}<link rel="stylesheet" href="{href}">\n'
+    html = CDN_SCRIPT_RE.sub(lambda _: link, html, count=1)
+    if config is not None:
+        island = (f'<script type="application/json" id="tailwind-config">'
+                  f'{json.dumps(config, ensure_ascii=False, separators=(",", ":"))}</script>')
+        html = CONFIG_SCRIPT_RE.sub(lambda _: island, html, count=1)
+    return html
+
+def local_scripts(html, page_path, root='.'):
+    """Scripts locais que a página carrega (caminhos desde root)"""
+    base = os.path.dirname(os.path.join(root, page_path))
+    paths = (os.path.normpath(os.path.join(base, src)) for src in LOCAL_SCRIPT_RE.findall(html))
+    return [path for path in paths if os.path.exists(path)]
+
+def page_sources(html, page_path, root='.'):
+    """Texto onde procurar classes: a página e os seus scripts locais"""
+    sources = [html]
+    for path in local_scripts(html, page_path, root):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            sources.append(f.read())
+    return sources
+
+def page_stylesheets(html, page_path, root='.'):
+    """CSS das folhas locais que a página carrega, além das do Tailwind (ver guide_styles.py)"""
+    sheets = []
+    base = os.path.dirname(os.path.join(root, page_path))
+    for href in LOCAL_STYLESHEET_RE.findall(html):
+        path = os.path.normpath(os.path.join(base, href))
+        if not STYLESHEET_LINK_RE.search(f'<link rel="stylesheet" href="{href}">') and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                sheets.append(f.read())
+    return sheets
+
+def css_classes(css):
+    """Classes com regra numa folha (sem os escapes do CSS)"""
+    return {CSS_ESCAPE_RE.sub(r'\1', name) for name in CSS_CLASS_RE.findall(css)}
+
+def find_pages(root='.'):
+    pages = []
+    for pattern in PAGE_GLOBS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            pages.append(os.path.relpath(path, root).replace(os.sep, '/'))
+    return pages
+
+def convert_pages(report):
+    """
+    Converte para a folha estática todas as páginas que ainda usam o CDN e
+    acerta a folha das que já foram convertidas; report é o de
+    build_stylesheets(). Devolve as páginas alteradas.
+    """
+    stylesheets = {page_path: entry['stylesheet'] for entry in report for page_path in entry['pages']}
+    converted = []
+    for page_path in find_pages():
+        if page_path not in stylesheets:
+            continue
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        new_html = link_stylesheet(html, page_path, stylesheets[page_path])
+        if new_html != html:
+            with open(page_path, 'w', encoding='utf-8') as f:
+                f.write(new_html)
+            converted.append(page_path)
+    return converted
+
+def sheet_input(key, group, config, files):
+    """
+    CSS de entrada de uma folha: o Tailwind só com as fontes indicadas
+    (caminhos relativos a WORK_DIR), a configuração da página e as extensões
+    """
+    lines = [f"/* Gerado por tailwind_css.py para {ASSETS_DIR}/{key}.*.css; não editar */",
+             '@import "tailwindcss" source(none);']
+    if config:
+        lines.append(f'@config "./{key}.config.mjs";')
+    lines += [f'@source "{os.path.relpath(path, WORK_DIR)}";'.replace(os.sep, '/') for path in files]
+    lines += [f'@source inline("{pattern}");' for pattern in SAFELIST.get(group, ())]
+    return '\n'.join(lines) + '\n' + V3_COMPAT_CSS + ANIMATE_CSS
+
+def build_stylesheets(force=False):
+    """
+    Gera uma folha de estilos por grupo e configuração, a partir das
+    páginas da origem que a usam, e apaga as que já nenhuma página usa.
+    Devolve o relatório: uma entrada por folha (vazio sem o Tailwind).
+    """
+    version = tailwind_version()
+    if version is None or shutil.which('node') is None:
+        return []
+
+    groups = {}
+    for page_path in find_pages():
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if not CDN_SCRIPT_RE.search(html) and not STYLESHEET_LINK_RE.search(html):
+            continue
+        config = page_config(html)
+        kind = page_group(page_path)
+        group = groups.setdefault(stylesheet_key(config, kind), {'group': kind, 'config': config, 'pages': [],
+                                                                 'files': [], 'classes': set(), 'defined': set()})
+        group['pages'].append(page_path)
+        # O Tailwind lê a origem; a cópia publicada já pode ter o CSS crítico
+        source = source_path(page_path)
+        with open(source, 'r', encoding='utf-8') as f:
+            source_html = f.read()
+        group['files'] += [source] + local_scripts(source_html, source_path(page_path), '.')
+        for value in CLASS_ATTR_RE.findall(source_html):
+            group['classes'].update(token for token in value.split() if '${' not in token)
+        for style in STYLE_BLOCK_RE.findall(source_html) + page_stylesheets(html, page_path):
+            group['defined'].update(css_classes(style))
+
+    os.makedirs(WORK_DIR, exist_ok=True)
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    previous = load_manifest()
+    sheets = {}
+    jobs = []
+    for key, group in sorted(groups.items()):
+        css = sheet_input(key, group['group'], group['config'], group['files'])
+        digest = hashlib.sha256('\n'.join([version, NODE_SCRIPT, css, json.dumps(group['config'], sort_keys=True)])
+                                .encode('utf-8'))
+        for path in group['files']:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        entry = previous.get(key)
+        if not force and entry and entry['inputs'] == digest.hexdigest() and os.path.exists(entry['stylesheet']):
+            sheets[key] = dict(entry, reused=True)
+            continue
+        if group['config']:
+            with open(os.path.join(WORK_DIR, f"{key}.config.mjs"), 'w', encoding='utf-8') as f:
+                f.write(f"export default {json.dumps(group['config'], ensure_ascii=False, indent=2)};\n")
+        sheets[key] = {'inputs': digest.hexdigest()}
+        jobs.append((key, {'css': css, 'from': os.path.abspath(os.path.join(WORK_DIR, f"{key}.css"))}))
+
+    for (key, _), css in zip(jobs, run_tailwind([job for _, job in jobs]) if jobs else []):
+        name = f"{key}.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]}.css"
+        path = f"{ASSETS_DIR}/{name}"
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(css)
+        sheets[key]['stylesheet'] = path
+
+    current = {entry['stylesheet'] for entry in sheets.values()}
+    for path in glob.glob(os.path.join(ASSETS_DIR, 'tailwind-*.css')):
+        if path.replace(os.sep, '/') not in current:
+            os.remove(path)
+    save_manifest({key: {'inputs': entry['inputs'], 'stylesheet': entry['stylesheet']}
+                   for key, entry in sheets.items()})
+
+    report = []
+    for key, group in sorted(groups.items()):
+        entry = sheets[key]
+        with open(entry['stylesheet'], 'r', encoding='utf-8') as f:
+            css = f.read()
+        used = css_classes(css)
+        data = css.encode('utf-8')
+        report.append({
+            'stylesheet': entry['stylesheet'],
+            'group': group['group'],
+            'pages': group['pages'],
+            'classes': len(group['classes'] & used),
+            'bytes': len(data),
+            'gzip_bytes': len(gzip.compress(data, mtime=0)),
+            'reused': entry.get('reused', False),
+            'unknown': sorted(token for token in group['classes'] - used - group['defined']
+                              if not GROUP_MARKER_RE.fullmatch(token)),
+        })
+    return report
+
+def print_report(report, show_unknown=False, converted=()):
+    if not report:
+        print("\n🎨 CSS estático: Tailwind não instalado (npm install na raiz do projeto, precisa do node); "
+              "as páginas publicadas ficam com o CDN")
+        return
+    pages = sum(len(entry['pages']) for entry in report)
+    total = sum(entry['bytes'] for entry in report)
+    total_gzip = sum(entry['gzip_bytes'] for entry in report)
+    reused = sum(1 for entry in report if entry['reused'])
+    print(f"\n🎨 CSS estático para {pages} páginas ({reused} de {len(report)} folhas sem alterações):")
+    if converted:
+        print(f"   🔄 {len(converted)} páginas deixaram de usar o CDN do Tailwind")
+    for entry in report:
+        print(f"   {entry['stylesheet']:<56}{entry['group']:<15}{len(entry['pages']):>4} páginas"
+              f"{entry['classes']:>6} classes{entry['bytes'] / 1024:>8.1f} KB (gzip {entry['gzip_bytes'] / 1024:.1f} KB)")
+    print(f"   Total: {total / 1024:.1f} KB (gzip {total_gzip / 1024:.1f} KB), em vez de "
+          f"≈ {CDN_RUNTIME_KB} KB de JavaScript do CDN por página, que ainda gerava o CSS no browser")
+
+    unknown = sorted({token for entry in report for token in entry['unknown']})
+    if unknown and show_unknown:
+        print(f"\n   ⚠️  {len(unknown)} classes sem regra nem definição no CSS das páginas:")
+        for token in unknown:
+            print(f"      • {token}")
+    elif unknown:
+        print(f"   ⚠️  {len(unknown)} classes sem regra (ver --unknown)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Substitui o Tailwind do CDN por CSS estático")
+    parser.add_argument('--unknown', action='store_true', help="Lista as classes sem regra")
+    parser.add_argument('--force', action='store_true', help="Gera todas as folhas, mesmo sem alterações")
+    args = parser.parse_args()
+
+    with in_deploy():
+        report = build_stylesheets(args.force)
+        converted = convert_pages(report)
+        print_report(report, args.unknown, converted)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""build_guides: repetir o build, incremental ou forçado, não muda nenhum ficheiro"""
+
+from conftest import snapshot
+
+def test_build_is_idempotent(project, build):
+    build(project)
+    first = snapshot(project)
+
+    output = build(project)
+    assert "🎉 0 guias construídos, 33 sem alterações, 0 erros" in output
+    assert snapshot(project) == first
+
+    build(project, '--force')
+    assert snapshot(project) == first
+
+    build(project, '--source', 'html')
+    build(project)
+    assert snapshot(project) == first
+
+def test_stages_are_idempotent(built_project, build):
+    output = build(built_project, '--verify-idempotent')
+    assert "🎉 Todas as etapas são idempotentes nos 33 guias" in output
@@ -0,0 +1,127 @@
+"""build_manifest e GlobalSteps: quando um guia ou uma etapa global se salta ou se refaz"""
+
+import os
+import re
+import zipfile
+
+import build_guides
+from build_guides import GlobalSteps
+from build_manifest import cached_hash, check_output, file_hash, fingerprint, record_output
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def recorded_guide(tmp_path):
+    """Um Word, um guia gerado e o manifesto que os regista"""
+    source = tmp_path / 'sessao.docx'
+    output = tmp_path / 'sessao-guia.html'
+    write(source, 'word')
+    write(output, '<html></html>')
+    manifest = {}
+    current = fingerprint('build_guides', str(source), 'template', 1, stages=['a=1'])
+    record_output(manifest, str(output), current)
+    return manifest, source, output, current
+
+def test_guide_without_record_is_built(tmp_path):
+    _, _, output, current = recorded_guide(tmp_path)
+    assert check_output({}, str(output), current) == (True, "sem registo no manifesto")
+
+def test_unchanged_guide_is_skipped(tmp_path):
+    manifest, _, output, current = recorded_guide(tmp_path)
+    assert check_output(manifest, str(output), current) == (False, "sem alterações")
+
+def test_rebuild_reasons(tmp_path):
+    manifest, source, output, current = recorded_guide(tmp_path)
+    assert check_output(manifest, str(output), dict(current, template='outro')) == (True, "template alterado")
+    assert check_output(manifest, str(output), dict(current, pipeline=2)) == (True, "versão do pipeline alterada")
+    assert check_output(manifest, str(output), dict(current, stages=['a=2'])) == (True, "stages alterado")
+
+    write(source, 'word editado')
+    changed = fingerprint('build_guides', str(source), 'template', 1, stages=['a=1'])
+    assert check_output(manifest, str(output), changed) == (True, "Word de origem alterado")
+
+    write(output, '<html>editado à mão</html>')
+    assert check_output(manifest, str(output), current) == (True, "ficheiro de saída modificado fora do build")
+
+    os.remove(output)
+    assert check_output(manifest, str(output), current) == (True, "ficheiro de saída em falta")
+
+def test_cached_hash_reuses_only_settled_files(tmp_path):
+    path = tmp_path / 'capa.png'
+    write(path, 'imagem')
+    cache = {}
+    # Acabado de escrever: o mtime ainda pode repetir-se, não fica em cache
+    assert cached_hash(str(path), cache) == file_hash(str(path))
+    assert cache == {}
+
+    old = os.stat(path).st_mtime_ns - 10 ** 10
+    os.utime(path, ns=(old, old))
+    cached_hash(str(path), cache)
+    key = os.path.abspath(path)
+    assert cache[key][:2] == [old, os.path.getsize(path)]
+
+    # Mesmo mtime e tamanho: o hash vem da cache, sem ler o ficheiro
+    cache[key][2] = 'da-cache'
+    assert cached_hash(str(path), cache) == 'da-cache'
+
+    write(path, 'outra imagem')
+    assert cached_hash(str(path), cache) == file_hash(str(path))
+
+def test_global_step_skips_until_an_input_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(build_guides.STEP_INPUTS, 'demo', ['inputs/*.txt'])
+    os.mkdir('inputs')
+    write('inputs/a.txt', 'a')
+    calls = []
+
+    def step(value):
+        calls.append(value)
+        return {'value': value, 'run': len(calls)}
+
+    def build(force=False, value=1):
+        steps = GlobalSteps(manifest, force)
+        report = steps.run('demo', step, value)
+        steps.record()
+        return report, steps.skipped
+
+    manifest = {}
+    assert build() == ({'value': 1, 'run': 1}, [])
+    # Sem alterações: o relatório é o do último build
+    assert build() == ({'value': 1, 'run': 1}, ['demo'])
+    assert build(value=2) == ({'value': 2, 'run': 2}, [])
+    write('inputs/a.txt', 'b')
+    assert build(value=2) == ({'value': 2, 'run': 3}, [])
+    write('inputs/c.txt', 'c')
+    assert build(value=2) == ({'value': 2, 'run': 4}, [])
+    assert build(force=True, value=2) == ({'value': 2, 'run': 5}, [])
+    assert build(value=2)[1] == ['demo']
+
+def test_memo_resets_when_shared_inputs_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write('template.css', 'a')
+    manifest = {}
+    GlobalSteps(manifest).memo('demo', ['template.css'])['page.html'] = 'hash'
+    assert GlobalSteps(manifest).memo('demo', ['template.css']) == {'page.html': 'hash'}
+    assert GlobalSteps(manifest, force=True).memo('demo', ['template.css']) == {}
+
+    GlobalSteps(manifest).memo('demo', ['template.css'])['page.html'] = 'hash'
+    write('template.css', 'b')
+    assert GlobalSteps(manifest).memo('demo', ['template.css']) == {}
+
+def test_build_rebuilds_only_the_edited_word(project, build):
+    build(project)
+    output = build(project, '--explain')
+    assert "🎉 0 guias construídos, 33 sem alterações, 0 erros" in output
+
+    # O mesmo conteúdo num zip diferente: muda o hash do Word
+    with zipfile.ZipFile(os.path.join(project, 'resources', 'modulo1', 'Sessão 2.docx'), 'a') as docx:
+        docx.comment = b'editado'
+    output = build(project, '--explain')
+    assert re.findall(r'✅ (\S+)', output) == ['modulo1/sessao2-guia.html']
+    assert "(Word de origem alterado)" in output
+    assert "🎉 1 guias construídos, 32 sem alterações, 0 erros" in output
+
+    output = build(project)
+    assert "🎉 0 guias construídos, 33 sem alterações, 0 erros" in output
+    assert "⏭️  14 etapas globais sem alterações" in output
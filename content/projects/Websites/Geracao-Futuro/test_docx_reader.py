@@ -0,0 +1,20 @@
+"""docx_reader: os mesmos registos que o python-docx, em todos os Word de resources/"""
+
+import glob
+import os
+
+import pytest
+
+from conftest import HERE
+from docx_reader import read_paragraphs, read_paragraphs_python_docx
+
+pytest.importorskip('docx')
+
+DOCX_PATHS = sorted(glob.glob(os.path.join(HERE, 'resources', '**', '*.docx'), recursive=True))
+
+def test_finds_the_documents():
+    assert DOCX_PATHS
+
+@pytest.mark.parametrize('path', DOCX_PATHS, ids=lambda path: os.path.relpath(path, HERE))
+def test_same_records_as_python_docx(path):
+    assert read_paragraphs(path) == read_paragraphs_python_docx(path)
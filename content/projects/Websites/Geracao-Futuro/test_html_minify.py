@@ -0,0 +1,56 @@
+"""html_minify: o que muda e o que tem de chegar ao browser tal e qual"""
+
+from html_minify import minify_css, minify_html
+
+SCRIPT = """<script>
+    const template = `
+        <li>  dois espaços  </li>
+    `;
+    if (a < b && c > d) console.log('<!-- não é um comentário -->');
+</script>"""
+
+PRE = """<pre class="code">
+def f():
+    return   1
+</pre>"""
+
+TEXTAREA = """<TEXTAREA name="notas">
+  linha 1
+
+  linha 3
+</TEXTAREA>"""
+
+def test_keeps_script_pre_and_textarea():
+    html = f"<body>\n    <p>Texto   com\n\n   espaços</p>\n    {SCRIPT}\n    {PRE}\n    {TEXTAREA}\n</body>"
+    minified = minify_html(html)
+    for block in (SCRIPT, PRE, TEXTAREA):
+        assert block in minified
+    assert "<p>Texto com\nespaços</p>" in minified
+
+def test_removes_comments_but_keeps_the_stage_ledger():
+    html = "<p>a</p> <!-- nota --> <p>b</p>\n<!-- build-stages: premium_design=1 -->\n<!--[if IE]><p>IE</p><![endif]-->"
+    minified = minify_html(html)
+    assert "nota" not in minified
+    assert "<p>a</p> <p>b</p>" in minified
+    assert "<!-- build-stages: premium_design=1 -->" in minified
+    assert "<!--[if IE]>" in minified
+
+def test_minifies_css_without_touching_strings():
+    css = """
+        .a::before { content: "  a ; b  /* c */ "; }
+        /* Comentário */
+        .b:hover > .c { margin: 0 auto ; width: calc(100% - 2rem); }
+        .d { --tw-pan-x: ; }
+    """
+    assert minify_css(css) == ('.a::before{content:"  a ; b  /* c */ "}'
+                               '.b:hover > .c{margin:0 auto;width:calc(100% - 2rem)}'
+                               '.d{--tw-pan-x: }')
+
+def test_keeps_the_insert_css_markers():
+    html = "<style>\n  .a { color: red; }\n  /*! Activity Box Premium */\n  .b { color: blue; }\n</style>"
+    assert "/*! Activity Box Premium */" in minify_html(html)
+
+def test_is_idempotent():
+    html = f"<html>\n<head><style> .a {{ color : red ; }} </style></head>\n<body>  <p> a  b </p> {PRE} </body></html>"
+    once = minify_html(html)
+    assert minify_html(once) == once
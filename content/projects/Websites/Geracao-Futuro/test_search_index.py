@@ -0,0 +1,83 @@
+"""search_index: a pesquisa do hub (JavaScript) e search() dão os mesmos resultados"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from search_index import search, terms
+
+QUERIES = [
+    'inteligência artificial',
+    'Algoritmos',
+    'robô',
+    'prog',
+    'ética da IA',
+    'jogo educativo',
+    'ação',
+    'sessão 2',
+    'loops condicionais',
+    'a',
+    'xyzzy',
+]
+
+# Funções de pesquisa do hub, copiadas do index.html
+HUB_FUNCTIONS = ['queryShards', 'searchTerms', 'firstTerm', 'searchShard']
+
+RUNNER = """
+const fs = require('fs');
+const path = require('path');
+const { entryPath, queries } = JSON.parse(fs.readFileSync(0, 'utf8'));
+const entry = JSON.parse(fs.readFileSync(entryPath, 'utf8'));
+const routes = new Map();
+entry.routes.forEach(([shards, prefixes]) => prefixes.split(' ').forEach(prefix => routes.set(prefix, shards)));
+const shards = entry.shards.map(([module, name]) => ({
+    module, data: JSON.parse(fs.readFileSync(path.join(path.dirname(entryPath), name), 'utf8')),
+}));
+const index = { ...entry, stopwords: new Set(entry.stopwords), routes, shards };
+console.log(JSON.stringify(queries.map(query => {
+    const words = searchTerms(index, query);
+    const found = words.length ? queryShards(index, words) : [];
+    const results = found.flatMap(shard => searchShard(shard.data, words))
+        .map(result => [result.score, result.url, result.label, result.heading]);
+    return { words, results };
+})));
+"""
+
+def hub_functions(html):
+    functions = []
+    for name in HUB_FUNCTIONS:
+        match = re.search(rf'\n( *)function {name}\(.*?\n\1\}}\n', html, re.S)
+        assert match, f"{name} não encontrada no index.html"
+        functions.append(match.group())
+    return ''.join(functions)
+
+def ranked(results):
+    return sorted((list(result) for result in results), key=lambda result: (-result[0], result[1], result[3]))
+
+@pytest.fixture(scope='module')
+def hub_search(built_project):
+    if shutil.which('node') is None:
+        pytest.skip("node não instalado")
+    entry_path, = [path for path in glob.glob(os.path.join(built_project, 'dist', 'assets', 'search.*.json'))
+                   if re.search(r'search\.[0-9a-f]{8}\.json$', path)]
+    with open(os.path.join(built_project, 'index.html'), 'r', encoding='utf-8') as f:
+        script = hub_functions(f.read()) + RUNNER
+    result = subprocess.run(['node', '-e', script], input=json.dumps({'entryPath': entry_path, 'queries': QUERIES}),
+                            capture_output=True, text=True, encoding='utf-8', check=True)
+    return entry_path, dict(zip(QUERIES, json.loads(result.stdout)))
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_same_results_as_the_hub(hub_search, query):
+    entry_path, hub = hub_search
+    assert terms(query) == hub[query]['words']
+    assert ranked(search(query, entry_path, limit=None)) == ranked(hub[query]['results'])
+
+def test_queries_find_sections(hub_search):
+    _, hub = hub_search
+    assert all(hub[query]['results'] for query in ['inteligência artificial', 'Algoritmos', 'robô', 'prog'])
+    assert not hub['xyzzy']['results']
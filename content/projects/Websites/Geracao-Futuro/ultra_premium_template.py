@@ -536,5 +536,6 @@ ULTRA_PREMIUM_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>"""
 
-print("🎨 Este template será aplicado em breve...")
-print("Criando versão ultra-premium dos guias...")
+if __name__ == '__main__':
+    print("🎨 Este template será aplicado em breve...")
+    print("Criando versão ultra-premium dos guias...")
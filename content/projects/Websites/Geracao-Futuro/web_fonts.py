@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Fontes web alojadas no próprio site
+- As páginas (guias, hub e apresentações) carregavam Outfit, Inter, Space
+  Grotesk, Rajdhani, ... do fonts.googleapis.com: mais duas ligações a
+  outros domínios e ficheiros com todos os caracteres em cada visita
+- Lê as fontes locais em fonts/ (TTF, OTF ou WOFF2; estáticas ou variáveis,
+  por exemplo as do zip do Google Fonts), reduz cada uma aos caracteres
+  usados nas páginas e nos seus scripts, mais o latim básico e o Latin-1
+  (acentos do português), e grava-as em WOFF2 em assets/fonts/
+- Emojis e outros caracteres que as fontes não têm ficam de fora e o browser
+  desenha-os com a fonte seguinte da lista (emoji do sistema)
+- Escreve assets/fonts.<hash>.css com os @font-face (font-display: swap) e
+  troca, em cada página, o <link> do Google Fonts pela folha local e por
+  <link rel="preload"> do peso normal de cada família; os preconnect aos
+  servidores do Google saem quando já não são precisos
+- Famílias sem ficheiros em fonts/ continuam a vir do Google Fonts
+- Precisa do fontTools e do brotli (pip install fonttools brotli); sem eles
+  as páginas ficam como estão
+
+Uso:
+    python3 web_fonts.py
+"""
+
+import glob
+import hashlib
+import html as html_lib
+import io
+import os
+import re
+from urllib.parse import parse_qsl, quote
+
+from deploy import ASSETS_DIR, in_deploy, source_path
+from tailwind_css import find_pages, page_sources
+
+# Fontes de origem: não são publicadas, ficam fora de dist/
+FONT_DIR = source_path('fonts')
+FONT_OUTPUT_DIR = os.path.join(ASSETS_DIR, 'fonts')
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff2')
+
+GOOGLE_CSS_URL = 'https://fonts.googleapis.com/css2'
+GOOGLE_LINK_RE = re.compile(r'[ \t]*<link\b[^>]*\bhref="https://fonts\.googleapis\.com/css2\?([^"]*)"[^>]*>\n?')
+PRECONNECT_RE = re.compile(r'[ \t]*<link\b[^>]*rel="preconnect"[^>]*href="https://fonts\.(?:googleapis|gstatic)\.com"[^>]*>\n?')
+FONTS_LINK_RE = re.compile(r'[ \t]*<link rel="stylesheet" href="[^"]*fonts\.[0-9a-f]{8}\.css" data-fonts="([^"]*)">\n?')
+PRELOAD_RE = re.compile(r'[ \t]*<link rel="preload" href="[^"]*assets/fonts/[^"]*" as="font"[^>]*>\n?')
+
+# Caracteres sempre incluídos, para o texto que as páginas ganham sem
+# mudar a fonte: ASCII, Latin-1 (acentos) e a pontuação tipográfica
+BASE_CHARACTERS = (
+    ''.join(chr(code) for code in range(0x20, 0x7f))
+    + ''.join(chr(code) for code in range(0xa0, 0x100))
+    + '‘’“”–—…•€™'
+)
+
+WEIGHT_NAMES = {100: 'thin', 200: 'extralight', 300: 'light', 400: 'regular', 500: 'medium',
+                600: 'semibold', 700: 'bold', 800: 'extrabold', 900: 'black'}
+
+def font_tools():
+    """Módulos do fontTools, se estiverem instalados (o WOFF2 precisa também do brotli)"""
+    try:
+        import brotli  # noqa: F401
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return None
+    return subset, TTFont
+
+def parse_google_query(query):
+    """Famílias de um URL do Google Fonts: [(família, especificação)], ex. ('Inter', 'wght@400;700')"""
+    families = []
+    for key, value in parse_qsl(html_lib.unescape(query)):
+        if key == 'family':
+            name, _, spec = value.partition(':')
+            families.append((name, spec))
+    return families
+
+def requested_weights(spec):
+    """Pesos pedidos numa especificação do Google Fonts ('wght@300;400' ou 'wght@300..700')"""
+    axes, _, values = spec.partition('@')
+    if 'wght' not in axes.split(','):
+        return {400}
+    index = axes.split(',').index('wght')
+    weights = set()
+    for value in values.split(';'):
+        weight = value.split(',')[index]
+        if '..' in weight:
+            low, high = (int(part) for part in weight.split('..'))
+            weights.update(range(low, high + 1, 100))
+        else:
+            weights.add(int(weight))
+    return weights
+
+def google_url(families):
+    query = '&'.join(f"family={quote(name).replace('%20', '+')}" + (f":{spec}" if spec else '')
+                     for name, spec in families)
+    return f"{GOOGLE_CSS_URL}?{query}&display=swap"
+
+def page_families(html):
+    """Famílias que a página pede, ao Google Fonts ou (já convertidas) à folha local"""
+    families = []
+    for query in GOOGLE_LINK_RE.findall(html):
+        families.extend(parse_google_query(query))
+    for value in FONTS_LINK_RE.findall(html):
+        families.extend(parse_google_query(html_lib.unescape(value)))
+    return families
+
+def local_fonts(tools):
+    """
+    Fontes em fonts/: {família: [{'path', 'weights': (mín, máx)}]}, só as
+    de estilo normal (os guias não usam itálicos)
+    """
+    _, TTFont = tools
+    fonts = {}
+    for path in sorted(glob.glob(os.path.join(FONT_DIR, '**', '*'), recursive=True)):
+        if not path.lower().endswith(FONT_EXTENSIONS):
+            continue
+        font = TTFont(path, lazy=True)
+        names = font['name']
+        family = str(names.getName(16, 3, 1, 0x409) or names.getName(1, 3, 1, 0x409))
+        if font['head'].macStyle & 0b10:
+            continue
+        if 'fvar' in font:
+            axis = next((axis for axis in font['fvar'].axes if axis.axisTag == 'wght'), None)
+            weights = (int(axis.minValue), int(axis.maxValue)) if axis else (400, 400)
+        else:
+            weight = font['OS/2'].usWeightClass
+            weights = (weight, weight)
+        fonts.setdefault(family, []).append({'path': path, 'weights': weights})
+        font.close()
+    return fonts
+
+def pick_files(files, weights):
+    """Ficheiro de uma família para cada peso pedido (o mais próximo, se nenhum o tiver)"""
+    def distance(font, weight):
+        low, high = font['weights']
+        return 0 if low <= weight <= high else min(abs(weight - low), abs(weight - high))
+    return {weight: min(files, key=lambda font: distance(font, weight)) for weight in weights}
+
+def used_characters(page_paths):
+    """Caracteres das páginas e dos seus scripts locais, mais BASE_CHARACTERS"""
+    characters = set(BASE_CHARACTERS)
+    for page_path in page_paths:
+        with open(page_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        for source in page_sources(html, page_path):
+            characters.update(html_lib.unescape(source))
+    return characters
+
+def subset_font(tools, path, characters):
+    """Bytes WOFF2 de uma fonte reduzida aos caracteres indicados"""
+    subset, _ = tools
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes={ord(char) for char in characters})
+    subsetter.subset(font)
+    output = io.BytesIO()
+    subset.save_font(font, output, options)
+    return output.getvalue()
+
+def font_face(family, file_href, weights):
+    weight = f"{weights[0]}" if weights[0] == weights[1] else f"{weights[0]} {weights[1]}"
+    return (f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+            f"font-display:swap;src:url({file_href}) format('woff2')}}")
+
+def write_fonts(tools, requests, characters):
+    """
+    Grava as fontes reduzidas e a folha com os @font-face. requests é
+    {família: pesos pedidos}. Devolve (nome da folha, {família: {peso:
+    ficheiro}}, relatório por ficheiro); a folha é None se nenhuma família
+    tiver ficheiros locais.
+    """
+    available = local_fonts(tools)
+    os.makedirs(FONT_OUTPUT_DIR, exist_ok=True)
+    faces = []
+    hosted = {}
+    report = []
+    for family, weights in sorted(requests.items()):
+        if family not in available:
+            continue
+        picked = pick_files(available[family], weights)
+        names = {}
+        for source in {id(font): font for font in picked.values()}.values():
+            data = subset_font(tools, source['path'], characters)
+            low, high = source['weights']
+            label = WEIGHT_NAMES.get(low, str(low)) if low == high else 'variable'
+            name = f"{family.lower().replace(' ', '-')}-{label}.{hashlib.sha256(data).hexdigest()[:8]}.woff2"
+            path = os.path.join(FONT_OUTPUT_DIR, name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            names[source['path']] = name
+            faces.append(font_face(family, f"fonts/{name}", source['weights']))
+            report.append({'family': family, 'file': f"{FONT_OUTPUT_DIR}/{name}".replace(os.sep, '/'),
+                           'source_bytes': os.path.getsize(source['path']), 'bytes': len(data)})
+        hosted[family] = {weight: names[font['path']] for weight, font in picked.items()}
+
+    written = {entry['file'].rsplit('/', 1)[1] for entry in report}
+    for old in glob.glob(os.path.join(FONT_OUTPUT_DIR, '*.woff2')):
+        if os.path.basename(old) not in written:
+            os.remove(old)
+    if not faces:
+        return None, {}, report
+
+    css = '\n'.join(faces) + '\n'
+    name = f"fonts.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]}.css"
+    path = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(css)
+    for old in glob.glob(os.path.join(ASSETS_DIR, 'fonts.*.css')):
+        if os.path.basename(old) != name:
+            os.remove(old)
+    return name, hosted, report
+
+def relative_href(target, page_path):
+    return os.path.relpath(target, os.path.dirname(page_path)).replace(os.sep, '/')
+
+def link_fonts(html, page_path, stylesheet, hosted):
+    """
+    Troca o Google Fonts pela folha local nas famílias alojadas no site; as
+    restantes continuam (ou voltam) a um <link> ao Google Fonts. A página
+    guarda em data-fonts as famílias que pedia, para poder ser convertida
+    de novo.
+    """
+    families = page_families(html)
+    local = [(name, spec) for name, spec in families if name in hosted]
+    if not local and not FONTS_LINK_RE.search(html):
+        return html
+    remote = [(name, spec) for name, spec in families if name not in hosted]
+
+    match = min(filter(None, [GOOGLE_LINK_RE.search(html), FONTS_LINK_RE.search(html)]),
+                key=lambda found: found.start())
+    indent = re.match(r'[ \t]*', match.group()).group()
+    newline = '\n' if match.group().endswith('\n') else ''
+
+    links = []
+    for name, spec in local:
+        weights = requested_weights(spec)
+        weight = min(sorted(weights), key=lambda weight: abs(weight - 400))
+        href = relative_href(os.path.join(FONT_OUTPUT_DIR, hosted[name][weight]), page_path)
+        link = f'{indent}<link rel="preload" href="{href}" as="font" type="font/woff2" crossorigin>{newline}'
+        if link not in links:
+            links.append(link)
+    if local:
+        stylesheet_href = relative_href(os.path.join(ASSETS_DIR, stylesheet), page_path)
+        data = html_lib.escape(google_url(local).split('?', 1)[1])
+        links.append(f'{indent}<link rel="stylesheet" href="{stylesheet_href}" data-fonts="{data}">{newline}')
+    if remote:
+        links.append(f'{indent}<link href="{html_lib.escape(google_url(remote))}" rel="stylesheet">{newline}')
+
+    # Os <link> de fontes antigos saem todos; os novos ficam no lugar do primeiro
+    def strip(text):
+        for pattern in (PRELOAD_RE, FONTS_LINK_RE, GOOGLE_LINK_RE):
+            text = pattern.sub('', text)
+        return text
+    html = strip(html[:match.start()]) + ''.join(links) + strip(html[match.end():])
+    if not remote:
+        html = PRECONNECT_RE.sub('', html)
+    return html
+
+def self_host_fonts(page_paths=None):
+    """
+    Aloja no site as fontes das páginas indicadas (por omissão, todas).
+    Devolve o relatório: {'available', 'stylesheet', 'fonts', 'pages'}.
+    """
+    page_paths = find_pages() if page_paths is None else page_paths
+    tools = font_tools()
+    if tools is None:
+        return {'available': False, 'stylesheet': None, 'fonts': [], 'pages': []}
+
+    pages = {}
+    requests = {}
+    for page_path in page_paths:
+        with open(page_path, 'r', encoding='utf-8') as f:
+            pages[page_path] = f.read()
+        for name, spec in page_families(pages[page_path]):
+            requests.setdefault(name, set()).update(requested_weights(spec))
+
+    stylesheet, hosted, fonts = write_fonts(tools, requests, used_characters(page_paths))
+    converted = []
+    for page_path, html in pages.items():
+        new_html = link_fonts(html, page_path, stylesheet, hosted)
+        if new_html != html:
+            with open(page_path, 'w', encoding='utf-8') as f:
+                f.write(new_html)
+            converted.append(page_path)
+    return {'available': True, 'stylesheet': stylesheet, 'fonts': fonts, 'pages': converted}
+
+def print_report(report):
+    if not report['available']:
+        print("\n🔤 Fontes: fontTools/brotli não instalados (pip install fonttools brotli); "
+              "as páginas continuam a usar o Google Fonts")
+        return
+    if not report['stylesheet']:
+        print("\n🔤 Fontes: nenhuma fonte em fonts/; as páginas continuam a usar o Google Fonts")
+        return
+    print(f"\n🔤 Fontes alojadas no site: {ASSETS_DIR}/{report['stylesheet']}")
+    for entry in report['fonts']:
+        print(f"   {entry['file']:<50}{entry['source_bytes'] / 1024:>8.1f} KB →{entry['bytes'] / 1024:>7.1f} KB")
+    print(f"   {len(report['pages'])} páginas alteradas")
+
+def main():
+    with in_deploy():
+        print_report(self_host_fonts())
+
+if __name__ == '__main__':
+    main()